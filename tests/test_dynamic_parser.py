@@ -1,16 +1,23 @@
 import unittest
+from typing import Dict, List, Tuple
 
 from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from twinsqla._dynamic_parser import DynamicParser, DynamicQuery
+from twinsqla._dynamic_parser import (
+    QueryCompiler, _load_grammar, _open_grammar_cache
+)
+from twinsqla.exceptions import QueryParseFailedException
+from twinsqla._bundle import TemplateBundle
+from twinsqla._directive_scanner import DirectiveScanner
 
 
 class DynamicParserTest(unittest.TestCase):
 
     def setUp(self):
-        self.parser = DynamicParser()
+        self.parser = DynamicParser.shared()
 
     def test_select_normal(self):
         test_query: str = """
@@ -399,6 +406,380 @@ class DynamicParserTest(unittest.TestCase):
                         **input_values),
                     expected_values["pydynamic_param0"])
 
+    def test_render_dynamic_if_evaluated_once(self):
+        test_query: str = r"""
+            SELECT
+                some_column
+            FROM some_table
+            WHERE
+                /*%if counter.count() > 0 */
+                    some_column1 > /* value */0
+                    AND some_column2 < /* value * 2 */0
+                /*%else*/
+                    OR some_column1 IS NULL
+                /*%end*/
+        """
+
+        expected_query: str = r"""
+            SELECT
+                some_column
+            FROM some_table
+            WHERE
+                some_column1 > :pydynamic_param0
+                    AND some_column2 < :pydynamic_param1
+        """
+
+        class Counter:
+            def __init__(self):
+                self.called: int = 0
+
+            def count(self) -> int:
+                self.called += 1
+                return self.called
+
+        counter: Counter = Counter()
+        result: DynamicQuery = self.parser.parse(
+            test_query, tuple(["counter", "value"]))
+        query, dynamic_params = result.render(counter=counter, value=3)
+
+        self.assertEqual(query, expected_query.strip())
+        self.assertEqual(dynamic_params,
+                         {"pydynamic_param0": 3, "pydynamic_param1": 6})
+        self.assertEqual(counter.called, 1)
+
+    def test_render_without_optional_arguments(self):
+        test_query: str = r"""
+            SELECT
+                some_column
+            FROM some_table
+            WHERE
+                /*%if min_value is not None */
+                    some_column1 > /* min_value */0
+                /*%elif names */
+                    OR some_column2 = /* names[-1] */0
+                /*%end*/
+        """
+
+        test_cases = [
+            {
+                "input_values": {"min_value": 10},
+                "expected_query": "some_column1 > :pydynamic_param0",
+                "expected_values": {
+                    "pydynamic_param0": 10, "pydynamic_param1": None
+                }
+            },
+            {
+                "input_values": {"names": ["a", "b"], "unused": 0},
+                "expected_query": "some_column2 = :pydynamic_param1",
+                "expected_values": {
+                    "pydynamic_param0": None, "pydynamic_param1": "b"
+                }
+            },
+            {
+                "input_values": {},
+                "expected_query": "FALSE",
+                "expected_values": {
+                    "pydynamic_param0": None, "pydynamic_param1": None
+                }
+            }
+        ]
+
+        result: DynamicQuery = self.parser.parse(test_query)
+
+        for test_case in test_cases:
+            with self.subTest("render_without_optional_arguments",
+                              test_input=test_case["input_values"]):
+
+                query, dynamic_params = result.render(
+                    **test_case["input_values"])
+
+                self.assertTrue(
+                    query.endswith(test_case["expected_query"]))
+                self.assertEqual(
+                    dynamic_params, test_case["expected_values"])
+
+    def test_render_arguments_named_as_builtins(self):
+        test_query: str = r"""
+            SELECT * FROM staff WHERE age > 0 AND
+                /*%if id */ staff_id = /* id */0
+                /*%else*/ OR age < 100 /*%end*/
+        """
+
+        result: DynamicQuery = self.parser.parse(test_query, ("id", ))
+        for input_values in ({}, {"id": None}):
+            with self.subTest("render_arguments_named_as_builtins",
+                              test_input=input_values):
+                query, dynamic_params = result.render(**input_values)
+                self.assertTrue(query.rstrip().endswith("age < 100"))
+                self.assertEqual(dynamic_params, {"pydynamic_param0": None})
+
+        query, dynamic_params = result.render(id=3)
+        self.assertTrue(query.rstrip().endswith(
+            "staff_id = :pydynamic_param0"))
+        self.assertEqual(dynamic_params, {"pydynamic_param0": 3})
+
+    def test_render_shapes(self):
+        test_query: str = r"""
+            SELECT some_column FROM some_table
+            WHERE
+                /*%if value1 is not None */
+                    some_column1 = /* value1 */0
+                    AND /*%if value2 */
+                        some_column2 = /* value2 */0
+                    /*%else*/
+                        OR TRUE
+                    /*%end*/
+                /*%end*/
+        """
+
+        result: DynamicQuery = self.parser.parse(test_query)
+        shapes: Dict[Tuple[int, ...], str] = result.shapes()
+
+        self.assertEqual(
+            sorted(shapes), [(0, 0), (0, 1), (1, )])
+        self.assertEqual(len(set(shapes.values())), 3)
+
+        for input_values in ({"value1": 1, "value2": 2}, {"value1": 1},
+                             {"value2": 2}):
+            with self.subTest("render_shapes", test_input=input_values):
+                branch_key, dynamic_params = result.decide(**input_values)
+                query, rendered_params = result.render(**input_values)
+
+                self.assertIs(query, shapes[branch_key])
+                self.assertEqual(rendered_params, dynamic_params)
+
+    def test_template_bundle_roundtrip(self):
+        test_query: str = r"""
+            SELECT
+                some_column
+            FROM some_table
+            WHERE some_column1 = /* :value1 */'target' AND
+                /*%if value1 == 'aaa' */
+                    some_column2 > /* value2 * 10 */0
+                /*%else*/
+                    OR some_column3 IS NULL
+                /*%end*/
+        """
+
+        import tempfile
+        bundle: TemplateBundle = TemplateBundle()
+        bundle.add(test_query, self.parser.analyze(test_query))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bundle_path: Path = Path(temp_dir) / "bundle.json"
+            bundle.save(bundle_path)
+            loaded: TemplateBundle = TemplateBundle.load(bundle_path)
+
+        expected: DynamicQuery = self.parser.parse(test_query)
+        result: DynamicQuery = QueryCompiler(
+            loaded.find(test_query)).compile()
+
+        for input_values in ({"value1": "aaa", "value2": 3},
+                             {"value1": "bbb", "value2": 3}):
+            with self.subTest("template_bundle_roundtrip",
+                              test_input=input_values):
+                self.assertEqual(result.render(**input_values),
+                                 expected.render(**input_values))
+
+    def test_template_bundle_by_parser(self):
+        test_query: str = "SELECT * FROM staff WHERE age > /* :age */0"
+
+        bundle: TemplateBundle = TemplateBundle()
+        bundle.add(test_query, self.parser.analyze(test_query), "scanner")
+
+        self.assertIsNone(bundle.find(test_query))
+        self.assertIsNotNone(bundle.find(test_query, "scanner"))
+
+
+class DirectiveScannerTest(DynamicParserTest):
+    """
+    DirectiveScanner must analyze templates as same as DynamicParser.
+    So all tests of DynamicParser are executed with DirectiveScanner.
+    """
+
+    def setUp(self):
+        self.parser = DirectiveScanner()
+
+    def test_analyze_as_same_as_grammar(self):
+        test_query: str = r"""
+            SELECT some_column FROM some_table
+            WHERE some_column1 = /* :value1 */'target'
+                AND /*%if value1 == 'aaa' */
+                    some_column2 > /* value2 * 10 */0
+                    AND /*%if value2 > 0 */
+                        some_column3 = /* :value2 */1
+                    /*%elseif value2 < 0 */
+                        OR some_column3 IS NULL
+                    /*%end*/
+                /*%else*/
+                    OR some_column4 IN ('/* :dummy */', '/*%if */')
+                /*%end*/
+        """
+
+        expected: DynamicQuery = DynamicParser.shared().parse(test_query)
+        result: DynamicQuery = self.parser.parse(test_query)
+
+        for input_values in ({"value1": "aaa", "value2": 3},
+                             {"value1": "aaa", "value2": -3},
+                             {"value1": "aaa", "value2": 0},
+                             {"value1": "bbb", "value2": 3}):
+            with self.subTest("analyze_as_same_as_grammar",
+                              test_input=input_values):
+                self.assertEqual(result.render(**input_values),
+                                 expected.render(**input_values))
+
+    def test_select_not_supported_by_grammar(self):
+        test_query: str = r"""
+            SELECT /*+ INDEX(some_table some_index) */ count(*) AS cnt
+            FROM some_table
+            WHERE some_column1 = ANY(/* :values */ARRAY[1, 2])
+                AND some_column2 = $$-- /* :dummy */$$
+                AND /*%if value is not None */
+                    some_column3 = /* value */'aaa'
+                /*%else*/
+                    OR TRUE
+                /*%end*/
+            -- comment /*%if */
+        """
+
+        expected_query: str = r"""
+            SELECT /*+ INDEX(some_table some_index) */ count(*) AS cnt
+            FROM some_table
+            WHERE some_column1 = ANY(:valuesARRAY[1, 2])
+                AND some_column2 = $$-- /* :dummy */$$
+                AND some_column3 = :pydynamic_param0
+            -- comment /*%if */
+        """
+
+        result: DynamicQuery = self.parser.parse(test_query)
+        query, dynamic_params = result.render(value="x")
+
+        self.assertEqual(query, expected_query.strip())
+        self.assertEqual(dynamic_params, {"pydynamic_param0": "x"})
+
+    def test_unclosed_if_block(self):
+        test_query: str = r"""
+            SELECT * FROM some_table
+            WHERE /*%if value */ some_column = /* value */1
+        """
+
+        with self.assertRaises(QueryParseFailedException):
+            self.parser.parse(test_query)
+
+    def test_parity_with_grammar(self):
+        test_queries: List[str] = [
+            r"""
+            SELECT * FROM some_table WHERE 1=1
+                /*%if a */ AND x = /* :a */1
+                /*%elif b */ AND y = /* :b */2 /*%end*/
+            ORDER BY id
+            """,
+            r"""
+            SELECT * FROM some_table
+            WHERE id IN /* :ids */(1, 2) AND name NOT IN /* names */('a')
+            """
+        ]
+
+        for test_query in test_queries:
+            with self.subTest("parity_with_grammar", test_query=test_query):
+                try:
+                    expected: DynamicQuery = \
+                        DynamicParser.shared().parse(test_query)
+                except QueryParseFailedException:
+                    with self.assertRaises(QueryParseFailedException):
+                        self.parser.parse(test_query)
+                    continue
+
+                result: DynamicQuery = self.parser.parse(test_query)
+                for input_values in ({}, {"a": 1}, {"b": 2}):
+                    self.assertEqual(result.render(**input_values),
+                                     expected.render(**input_values))
+
+    def test_if_block_not_at_operand(self):
+        test_query: str = r"""
+            SELECT * FROM some_table WHERE 1=1
+                /*%if a */ AND x = /* :a */1 /*%end*/
+            ORDER BY id /*%if desc */ DESC /*%else*/ ASC /*%end*/
+        """
+
+        result: DynamicQuery = self.parser.parse(test_query)
+
+        self.assertEqual(
+            result.render(a=None, desc=True)[0].split(),
+            "SELECT * FROM some_table WHERE 1=1 ORDER BY id DESC".split())
+        self.assertEqual(
+            result.render(a=1, desc=False)[0].split(),
+            "SELECT * FROM some_table WHERE 1=1 AND x = :a ORDER BY id ASC"
+            .split())
+
+
+class SharedParserTest(unittest.TestCase):
+
+    def test_shared_parser_from_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        test_query: str = r"""
+            SELECT some_column FROM some_table
+            WHERE some_column1 = /* :value1 */'target'
+                AND /*%if value2 > 0 */
+                    some_column2 > /* value2 * 10 */0
+                /*%else*/
+                    OR some_column3 IS NULL
+                /*%end*/
+        """
+
+        expected: Tuple[str, dict] = DynamicParser.shared().parse(
+            test_query).render(value1="a", value2=1)
+
+        def _parse(index: int) -> Tuple[str, dict]:
+            return DynamicParser.shared().parse(
+                test_query).render(value1="a", value2=1)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results: List[Tuple[str, dict]] = list(
+                executor.map(_parse, range(8)))
+
+        self.assertIs(DynamicParser.shared(), DynamicParser.shared())
+        self.assertEqual(results, [expected] * 8)
+
+    def test_grammar_cache_roundtrip(self):
+        test_query: str = r"""
+            SELECT some_column FROM some_table
+            WHERE /*%if value is not None */
+                    some_column1 = /* value */0
+                /*%end*/
+        """
+
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path: Path = Path(temp_dir) / "grammar.cache"
+            DynamicParser.shared().save_grammar(cache_path)
+            loaded: DynamicParser = DynamicParser(_load_grammar(cache_path))
+
+        for input_values in ({"value": 3}, {"value": None}):
+            with self.subTest("grammar_cache_roundtrip",
+                              test_input=input_values):
+                self.assertEqual(
+                    loaded.parse(test_query).render(**input_values),
+                    DynamicParser.shared().parse(test_query).render(
+                        **input_values))
+
+    def test_broken_grammar_cache(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path: Path = Path(temp_dir) / "grammar.cache"
+            cache_path.write_bytes(b"broken")
+            with self.assertLogs("twinsqla._dynamic_parser", "WARNING"):
+                parser: DynamicParser = DynamicParser(
+                    _open_grammar_cache(cache_path))
+
+            # The broken cache is replaced by the compiled grammar.
+            _load_grammar(cache_path)
+
+        self.assertEqual(
+            parser.parse("SELECT * FROM t WHERE a = /* a */0").render(a=1),
+            DynamicParser.shared().parse(
+                "SELECT * FROM t WHERE a = /* a */0").render(a=1))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,617 @@
+"""
+Tests without docker, mostly with in-memory SQLite database.
+
+$ python -m pytest tests/test_sqlite.py
+"""
+
+import unittest
+from typing import Any, List, Optional
+import datetime
+import decimal
+import io
+
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from dataclasses import dataclass, field
+except ImportError:
+    dataclass = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+import sqlalchemy
+from sqlalchemy.engine.base import Engine
+
+import twinsqla
+from twinsqla import TWinSQLA
+from twinsqla._querybindbuilder import PreparedCopy, CopyResult
+from twinsqla._querybindbuilder import _render_update_rows
+from twinsqla._querybindbuilder import group_by_columns
+from twinsqla._resultbuilder import resolve_result_type
+
+
+def _create_engine() -> Engine:
+    engine: Engine = sqlalchemy.create_engine(
+        "sqlite://", connect_args={"check_same_thread": False},
+        poolclass=sqlalchemy.pool.StaticPool)
+    engine.execute(
+        "CREATE TABLE staff ("
+        " staff_id INTEGER PRIMARY KEY, username TEXT, age INTEGER)")
+    engine.execute(
+        "INSERT INTO staff VALUES (1, 'Alice', 20), (2, 'Bob', 30)")
+    return engine
+
+
+class DaoBindingTest(unittest.TestCase):
+
+    @unittest.skipIf(dataclass is None, "dataclasses is not available")
+    def test_bind_dataclass_dao(self):
+        """
+        Unhashable dao instances compared as equal have each binding.
+        """
+
+        @twinsqla.dao
+        @dataclass
+        class StaffDao:
+            sqla: Any
+
+            @twinsqla.select(
+                "SELECT count(*) AS staff_count FROM staff",
+                result_type=List[tuple])
+            def count(self):
+                pass
+
+        first: TWinSQLA = TWinSQLA(_create_engine())
+        second: TWinSQLA = TWinSQLA(_create_engine())
+        second._execution_engine.execute("DELETE FROM staff")
+
+        first_dao = StaffDao(first)
+        second_dao = StaffDao(second)
+        second_dao.sqla = first
+        self.assertEqual(first_dao, second_dao)
+
+        self.assertEqual(first_dao.count()[0][0], 2)
+        # Reassigning is not reflected after the binding.
+        self.assertEqual(second_dao.count()[0][0], 0)
+        self.assertIs(getattr(first_dao, "__twinsqla_bound_sqla"), first)
+
+    def test_bind_slots_dao(self):
+        """
+        Dao instances with `__slots__` are bound by `id()`.
+        """
+
+        @twinsqla.dao
+        class StaffDao:
+            __slots__ = ("sqla", "__weakref__")
+
+            def __init__(self, sqla: TWinSQLA):
+                self.sqla: TWinSQLA = sqla
+
+            @twinsqla.select("SELECT username FROM staff"
+                             " WHERE staff_id = /* :staff_id */0",
+                             result_type=List[tuple])
+            def find(self, staff_id: int):
+                pass
+
+        dao = StaffDao(TWinSQLA(_create_engine()))
+        self.assertEqual(dao.find(2), (("Bob", ), ))
+        self.assertIn(id(dao), twinsqla.twinsqla._dao_bindings)
+
+        key: int = id(dao)
+        del dao
+        self.assertNotIn(key, twinsqla.twinsqla._dao_bindings)
+
+    def test_dao_without_twinsqla(self):
+        """
+        TWinSQLA object is searched in arguments without the binding.
+        """
+
+        @twinsqla.dao
+        class StaffDao:
+            @twinsqla.select("SELECT username FROM staff"
+                             " WHERE staff_id = /* :staff_id */0",
+                             result_type=List[tuple])
+            def find(self, sqla: TWinSQLA, staff_id: int):
+                pass
+
+        self.assertEqual(
+            StaffDao().find(TWinSQLA(_create_engine()), 1),
+            (("Alice", ), ))
+
+
+class ArgumentTest(unittest.TestCase):
+
+    def test_omitted_argument_named_as_builtin(self):
+        """
+        Omitted or None arguments are None in templates even if the names
+        are same as builtins.
+        """
+
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+        @sqla.select("SELECT staff_id FROM staff WHERE staff_id > 0 AND"
+                     " /*%if id */ staff_id = /* id */0"
+                     " /*%else*/ OR staff_id < 100 /*%end*/"
+                     " ORDER BY staff_id",
+                     result_type=List[tuple])
+        def find(id: int = None):
+            pass
+
+        self.assertEqual(find(), ((1, ), (2, )))
+        self.assertEqual(find(None), ((1, ), (2, )))
+        self.assertEqual(find(2), ((2, ), ))
+
+
+class CacheTest(unittest.TestCase):
+
+    def test_result_type_cache_info(self):
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+        @sqla.select("SELECT staff_id FROM staff ORDER BY staff_id",
+                     result_type=List[tuple])
+        def find_all():
+            pass
+
+        self.assertEqual(find_all(), ((1, ), (2, )))
+        self.assertEqual(find_all(), ((1, ), (2, )))
+
+        result_type_info = sqla.cache_info()["result_type"]
+        self.assertEqual(result_type_info.hits, 1)
+        self.assertEqual(result_type_info.misses, 1)
+        self.assertEqual(sqla.cache_info()["mapper"].currsize, 1)
+
+        sqla.clear_caches()
+        self.assertEqual(sqla.cache_info()["mapper"].currsize, 0)
+
+    def test_cache_bytes_with_built_statements(self):
+        """
+        Sql statements built for each branch are added to the cache bytes.
+        """
+
+        sqla: TWinSQLA = TWinSQLA(_create_engine(),
+                                  cache_bytes=1024 * 1024)
+
+        @sqla.select("SELECT staff_id FROM staff WHERE staff_id > 0 AND"
+                     " /*%if staff_id */ staff_id = /* staff_id */0"
+                     " /*%else*/ OR staff_id < 100 /*%end*/",
+                     result_type=List[tuple])
+        def find(staff_id: int = None):
+            pass
+
+        self.assertEqual(find(1), ((1, ), ))
+        first_bytes: int = sqla.cache_info()["query"].currbytes
+        self.assertEqual(find(2), ((2, ), ))
+        self.assertEqual(sqla.cache_info()["query"].currbytes, first_bytes)
+
+        self.assertEqual(len(find()), 2)
+        self.assertGreater(sqla.cache_info()["query"].currbytes, first_bytes)
+
+
+class CopyTest(unittest.TestCase):
+
+    def test_copy_values(self):
+        """
+        Values are written as the text input of PostgreSQL in CSV.
+        """
+
+        prepared: PreparedCopy = PreparedCopy(
+            "staff", ("a", "b", "c", "d", "e", "f", "g", "h"), [
+                [None, "", b"\x00\xff", {"key": "value"},
+                 [1, None, 'a"b'], decimal.Decimal("1.10"),
+                 datetime.date(2021, 2, 3), True],
+                ["text", "x,y", bytearray(b"a"), {}, [], 1.5,
+                 datetime.datetime(2021, 2, 3, 4, 5, 6), 7]
+            ])
+
+        self.assertEqual(prepared.buffer().getvalue().splitlines(), [
+            ',"","\\x00ff","{""key"": ""value""}",'
+            '"{""1"",NULL,""a\\""b""}",1.10,"2021-02-03",True',
+            '"text","x,y","\\x61","{}","{}",1.5,'
+            '"2021-02-03T04:05:06",7'
+        ])
+
+    def test_copy_result(self):
+        """
+        Result of COPY is converted as the result without rows.
+        """
+
+        self.assertEqual(
+            resolve_result_type(List[dict]).to_values(CopyResult(2)), ())
+        self.assertIsNone(resolve_result_type(dict).to_values(CopyResult(2)))
+
+
+class BulkUpdateTest(unittest.TestCase):
+
+    def test_postgresql_values_typed_by_table(self):
+        """
+        VALUES of PostgreSQL has the first row typed by the table columns.
+        """
+
+        self.assertEqual(
+            _render_update_rows(("staff", ("staff_id", ), ("age", ), 2,
+                                 "values")),
+            "UPDATE staff AS t SET age = v.age FROM (VALUES"
+            " ((SELECT staff_id FROM staff WHERE false),"
+            " (SELECT age FROM staff WHERE false)),"
+            " (:p0_0, :p0_1), (:p1_0, :p1_1)) AS v(staff_id, age)"
+            " WHERE t.staff_id = v.staff_id")
+
+    def test_bulk_update_duplicated_keys(self):
+        """
+        Entities of the same key are updated as same as updating them
+        one by one.
+        """
+
+        @twinsqla.table("staff", pk="staff_id")
+        class Staff:
+            def __init__(self, staff_id: int, username: Optional[str] = None,
+                         age: Optional[int] = None):
+                self.staff_id: int = staff_id
+                self.username: Optional[str] = username
+                self.age: Optional[int] = age
+
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+        @sqla.update(bulk=True)
+        def update(entities: List[Staff]):
+            pass
+
+        update([Staff(1, age=21), Staff(2, "Carol", 31), Staff(1, age=25),
+                Staff(2, age=35)])
+
+        self.assertEqual(
+            sqla._execution_engine.execute(
+                "SELECT staff_id, username, age FROM staff"
+                " ORDER BY staff_id").fetchall(),
+            [(1, "Alice", 25), (2, "Carol", 35)])
+
+
+class UpsertTest(unittest.TestCase):
+
+    def test_bulk_upsert_duplicated_keys(self):
+        """
+        Only the last entity is upserted for each key in bulk operation.
+        """
+
+        @twinsqla.table("staff", pk="staff_id")
+        class Staff:
+            def __init__(self, staff_id: int, username: str, age: int):
+                self.staff_id: int = staff_id
+                self.username: str = username
+                self.age: int = age
+
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+        @sqla.upsert(bulk=True)
+        def upsert(entities: List[Staff]):
+            pass
+
+        upsert([Staff(1, "Carol", 40), Staff(3, "Dave", 50),
+                Staff(1, "Ellen", 60), Staff(3, "Frank", 70)])
+
+        self.assertEqual(
+            sqla._execution_engine.execute(
+                "SELECT staff_id, username, age FROM staff"
+                " ORDER BY staff_id").fetchall(),
+            [(1, "Ellen", 60), (2, "Bob", 30), (3, "Frank", 70)])
+
+    def test_bulk_upsert_duplicated_keys_of_other_columns(self):
+        """
+        Entities of the same key with other columns are upserted as same as
+        upserting them one by one.
+        """
+
+        @twinsqla.table("staff", pk="staff_id")
+        class Staff:
+            def __init__(self, staff_id: int, username: Optional[str] = None,
+                         age: Optional[int] = None):
+                self.staff_id: int = staff_id
+                self.username: Optional[str] = username
+                self.age: Optional[int] = age
+
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+        @sqla.upsert(bulk=True)
+        def upsert(entities: List[Staff]):
+            pass
+
+        upsert([Staff(2, age=31), Staff(1, "Carol", 40), Staff(3, "Dave"),
+                Staff(1, age=50), Staff(3, age=60)])
+
+        self.assertEqual(
+            sqla._execution_engine.execute(
+                "SELECT staff_id, username, age FROM staff"
+                " ORDER BY staff_id").fetchall(),
+            [(1, "Carol", 50), (2, "Bob", 31), (3, "Dave", 60)])
+
+
+class GroupByColumnsTest(unittest.TestCase):
+
+    def test_group_consecutive_rows(self):
+        self.assertEqual(
+            group_by_columns([{"id": 1, "a": 1}, {"id": 2, "a": 2},
+                              {"id": 1, "a": 1, "b": 2}, {"id": 1, "a": 5}],
+                             ("id", )),
+            [(("a", ), [{"id": 1, "a": 1}, {"id": 2, "a": 2}]),
+             (("a", "b"), [{"id": 1, "a": 1, "b": 2}]),
+             (("a", ), [{"id": 1, "a": 5}])])
+
+    def test_write_in_order(self):
+        """
+        Entities of the same key in other groups are written in order.
+        """
+
+        @twinsqla.table("staff", pk="staff_id")
+        class Staff:
+            def __init__(self, staff_id: int, username: Optional[str] = None,
+                         age: Optional[int] = None):
+                self.staff_id: int = staff_id
+                self.username: Optional[str] = username
+                self.age: Optional[int] = age
+
+        entities: List[Staff] = [
+            Staff(2, age=31), Staff(1, "Carol", 40), Staff(1, age=50)]
+
+        for operation in ("upsert", "update"):
+            with self.subTest("write in order", operation=operation):
+                sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+                @getattr(sqla, operation)()
+                def write(entities: List[Staff]):
+                    pass
+
+                write(entities)
+                self.assertEqual(
+                    sqla._execution_engine.execute(
+                        "SELECT staff_id, username, age FROM staff"
+                        " ORDER BY staff_id").fetchall(),
+                    [(1, "Carol", 50), (2, "Bob", 31)])
+
+
+class EntityValuesTest(unittest.TestCase):
+
+    def _insert_and_select(self, entity: Any) -> list:
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+        @sqla.insert()
+        def insert(entity: Any):
+            pass
+
+        insert(entity)
+        return sqla._execution_engine.execute(
+            "SELECT staff_id, username, age FROM staff"
+            " WHERE staff_id = 3").fetchall()
+
+    def test_subclass_with_slots(self):
+        """
+        Slots of base classes are also read from instances of subclasses.
+        """
+
+        @twinsqla.table("staff", pk="staff_id")
+        class Staff:
+            __slots__ = ("staff_id", "username")
+
+            def __init__(self, staff_id: int, username: str):
+                self.staff_id: int = staff_id
+                self.username: str = username
+
+        class AgedStaff(Staff):
+            __slots__ = ("age", )
+
+            def __init__(self, staff_id: int, username: str, age: int):
+                super().__init__(staff_id, username)
+                self.age: int = age
+
+        class NamedStaff(Staff):
+            pass
+
+        self.assertEqual(self._insert_and_select(AgedStaff(3, "Carol", 40)),
+                         [(3, "Carol", 40)])
+
+        named: NamedStaff = NamedStaff(3, "Dave")
+        named.age = 50
+        self.assertEqual(self._insert_and_select(named), [(3, "Dave", 50)])
+
+    @unittest.skipIf(dataclass is None, "dataclasses is not available")
+    def test_dataclass_attributes(self):
+        """
+        Fields not set are skipped, and attributes set in `__post_init__`
+        are also read.
+        """
+
+        @twinsqla.table("staff", pk="staff_id")
+        @dataclass
+        class Staff:
+            staff_id: int
+            age: int = field(init=False)
+
+            def __post_init__(self):
+                self.username: str = "Carol"
+
+        self.assertEqual(self._insert_and_select(Staff(3)),
+                         [(3, "Carol", None)])
+
+
+class _Rows:
+    """
+    Result of sqlalchemy with the rows.
+    """
+
+    returns_rows: bool = True
+
+    def __init__(self, keys: List[str], rows: List[tuple]):
+        self._keys: List[str] = keys
+        self._rows: List[tuple] = rows
+
+    def keys(self) -> List[str]:
+        return self._keys
+
+    def fetchmany(self, size: int) -> List[tuple]:
+        rows: List[tuple] = self._rows[:size]
+        self._rows = self._rows[size:]
+        return rows
+
+    def close(self) -> None:
+        pass
+
+
+@unittest.skipIf(numpy is None, "numpy is not available")
+class ColumnarTest(unittest.TestCase):
+
+    def test_iteratable_rejected_in_decorating(self):
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+
+        with self.assertRaises(twinsqla.exceptions.TWinSQLAException):
+            @sqla.select("SELECT * FROM staff",
+                         result_type=twinsqla.columnar(), iteratable=True)
+            def fetch_staff():
+                pass
+
+    def test_promote_dtype_of_later_batches(self):
+        """
+        Integer column is promoted to float by floats of later batches.
+        """
+
+        sqla: TWinSQLA = TWinSQLA(_create_engine())
+        sqla._execution_engine.execute(
+            "CREATE TABLE price (price NUMERIC)")
+        sqla._execution_engine.execute(
+            "INSERT INTO price VALUES (1), (2), (2.75)")
+
+        @sqla.select("SELECT price FROM price ORDER BY price",
+                     result_type=twinsqla.columnar(batch_size=2))
+        def fetch_prices():
+            pass
+
+        prices = fetch_prices()["price"]
+        self.assertEqual(prices.dtype, numpy.dtype("float64"))
+        self.assertEqual(prices.tolist(), [1.0, 2.0, 2.75])
+
+    def test_large_integers_of_later_batches(self):
+        """
+        Integers out of 64 bits in later batches are kept as objects.
+        """
+
+        result_type = twinsqla.columnar(batch_size=2)
+        columns = result_type.to_values(_Rows(
+            ["value", "small"], [(1, 1), (2, 2), (2 ** 70, 3)]))
+
+        self.assertEqual(columns["value"].dtype, numpy.dtype(object))
+        self.assertEqual(columns["value"].tolist(), [1, 2, 2 ** 70])
+        self.assertEqual(columns["small"].dtype.kind, "i")
+        self.assertEqual(columns["small"].tolist(), [1, 2, 3])
+
+    def test_described_dtype_overflowed(self):
+        """
+        Described dtype is promoted by values out of the range.
+        """
+
+        from twinsqla._columnar import _ColumnBuffers
+
+        buffers = _ColumnBuffers(("value", ), ["int16"], set())
+        buffers.append([(1, ), (2, )])
+        buffers.append([(70000, ), (3, )])
+
+        values = buffers.to_dict()["value"]
+        self.assertEqual(values.dtype, numpy.dtype("int64"))
+        self.assertEqual(values.tolist(), [1, 2, 70000, 3])
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sqla: TWinSQLA = TWinSQLA(_create_engine())
+        self.sqla._execution_engine.execute(
+            "CREATE TABLE score (score_id INTEGER, score NUMERIC)")
+        self.sqla._execution_engine.execute(
+            "INSERT INTO score VALUES (1, NULL), (2, NULL), (3, 4),"
+            " (4, 5.5), (5, 6), (6, 7.25)")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not available")
+    def test_to_arrow_unified_types(self):
+        """
+        NULL columns and integers with floats are unified in batches.
+        """
+
+        @self.sqla.select("SELECT * FROM score ORDER BY score_id",
+                          iteratable=True)
+        def fetch():
+            pass
+
+        stream: io.BytesIO = io.BytesIO()
+        self.assertEqual(fetch().to_arrow(stream, batch_size=2), 6)
+
+        table = pyarrow.ipc.open_stream(stream.getvalue()).read_all()
+        self.assertEqual(table.schema.field("score").type, pyarrow.float64())
+        self.assertEqual(table.column("score").to_pylist(),
+                         [None, None, 4.0, 5.5, 6.0, 7.25])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not available")
+    def test_to_arrow_not_converted(self):
+        """
+        Values of later batches not converted to the schema are errors.
+        """
+
+        @self.sqla.select("SELECT * FROM score WHERE score_id > 4"
+                          " ORDER BY score_id", iteratable=True)
+        def fetch():
+            pass
+
+        with self.assertRaises(twinsqla.exceptions.TWinSQLAException):
+            fetch().to_arrow(io.BytesIO(), batch_size=1)
+
+        stream: io.BytesIO = io.BytesIO()
+        fetch().to_arrow(stream, batch_size=1, schema=pyarrow.schema([
+            ("score_id", pyarrow.int64()), ("score", pyarrow.float64())]))
+        table = pyarrow.ipc.open_stream(stream.getvalue()).read_all()
+        self.assertEqual(table.column("score").to_pylist(), [6.0, 7.25])
+
+    def test_export_after_iteration(self):
+        """
+        Rows buffered by iteration are not skipped silently.
+        """
+
+        @self.sqla.select("SELECT score_id FROM score ORDER BY score_id",
+                          result_type=List[tuple], iteratable=True,
+                          fetch_size=4)
+        def fetch():
+            pass
+
+        with fetch() as results:
+            self.assertEqual(next(results), (1, ))
+            with self.assertRaises(twinsqla.exceptions.TWinSQLAException):
+                results.to_csv(io.StringIO())
+
+        with fetch() as results:
+            self.assertEqual([next(results) for _ in range(4)],
+                             [(1, ), (2, ), (3, ), (4, )])
+            buffer: io.StringIO = io.StringIO()
+            self.assertEqual(results.to_csv(buffer, header=False), 2)
+            self.assertEqual(buffer.getvalue().splitlines(), ["5", "6"])
+
+
+class KeysetTest(unittest.TestCase):
+
+    def test_qualified_key(self):
+        with self.assertRaises(twinsqla.exceptions.TWinSQLAException):
+            twinsqla.keyset("staff.staff_id")
+        with self.assertRaises(twinsqla.exceptions.TWinSQLAException):
+            twinsqla.keyset("staff_id", '"staff".name')
+
+        self.assertEqual(twinsqla.keyset('"staff.id"').columns,
+                         ('"staff.id"', ))
+
+
+if __name__ == "__main__":
+    unittest.main()
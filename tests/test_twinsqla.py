@@ -11,11 +11,18 @@ $ docker-compose down
 """
 
 import unittest
-from typing import List, Tuple, Optional
+import io
+import json
+from typing import Any, List, NamedTuple, Tuple, Optional
 
 import sqlalchemy
 from sqlalchemy.engine.base import Engine
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # import docker
 
 from pathlib import Path
@@ -58,6 +65,17 @@ class StaffWithTableAutoPk(Staff):
     pass
 
 
+@twinsqla.table("staff", pk="staff_id")
+class StaffWithSlots:
+    __slots__ = ("staff_id", "username", "age")
+
+    def __init__(self, staff_id: int, username: str,
+                 age: Optional[int] = None):
+        self.staff_id: int = staff_id
+        self.username: str = username
+        self.age: Optional[int] = age
+
+
 class TWinSQLATest(unittest.TestCase):
 
     @classmethod
@@ -183,6 +201,217 @@ class TWinSQLATest(unittest.TestCase):
                 self.assertEqual(result.username, "Alice")
                 self.assertEqual(result.age, 20)
 
+    def test_select_function_returned_not_identifier_columns(self):
+        """
+        Column names which are not python identifiers.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest(
+                "select columns not available as keyword arguments",
+                db_type=db_type
+            ):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.select(
+                    "SELECT staff_id AS \"from\", count(*) AS \"count(*)\""
+                    " FROM staff WHERE staff_id = :id GROUP BY staff_id",
+                    result_type=dict)
+                def count_for_function(id: int) -> dict:
+                    pass
+
+                result: dict = count_for_function(1)
+                self.assertEqual(result, {"from": 1, "count(*)": 1})
+
+    def test_select_function_returned_lightweight_types(self):
+        """
+        Results converted to lightweight types.
+        """
+
+        class StaffTuple(NamedTuple):
+            staff_id: int
+            username: str
+            age: int
+
+        for db_type in self.db_types:
+            with self.subTest("select lightweight types", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+                query: str = \
+                    "SELECT staff_id, username, age FROM staff" \
+                    " WHERE staff_id = :id"
+
+                for result_type, expected in (
+                    (List[tuple], (1, "Alice", 20)),
+                    (List[dict],
+                     {"staff_id": 1, "username": "Alice", "age": 20}),
+                    (List[StaffTuple], StaffTuple(1, "Alice", 20))
+                ):
+                    @sqla.select(query, result_type=result_type)
+                    def find_for_function(id: int):
+                        pass
+
+                    results = find_for_function(1)
+                    self.assertEqual(results, (expected, ))
+                    self.assertIs(type(results[0]), type(expected))
+
+                @sqla.select(query, result_type=List[Any])
+                def find_rows(id: int):
+                    pass
+
+                self.assertEqual(tuple(find_rows(1)[0]), (1, "Alice", 20))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_select_function_returned_columnar(self):
+        """
+        Results converted to NumPy arrays for each column.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest("select columnar", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.select(
+                    "SELECT staff_id, username, age FROM staff"
+                    " WHERE staff_id <= 3 ORDER BY staff_id",
+                    result_type=twinsqla.columnar(
+                        {"age": "int16"}, batch_size=2))
+                def find_columns():
+                    pass
+
+                results = find_columns()
+                self.assertEqual(
+                    tuple(results.keys()), ("staff_id", "username", "age"))
+                self.assertEqual(results["staff_id"].tolist(), [1, 2, 3])
+                self.assertEqual(results["age"].dtype, numpy.dtype("int16"))
+                self.assertEqual(results["username"].dtype,
+                                 numpy.dtype(object))
+                self.assertEqual(results["username"][0], "Alice")
+
+    def test_select_function_streamed(self):
+        """
+        Results fetched from server side cursor for each fetch size.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest("select streamed", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.select(
+                    "SELECT staff_id, username, age FROM staff"
+                    " WHERE staff_id <= 5 ORDER BY staff_id",
+                    result_type=List[Staff], iteratable=True,
+                    stream=True, fetch_size=2)
+                def find_all():
+                    pass
+
+                results = find_all()
+                first: Staff = next(results)
+                self.assertEqual(first.staff_id, 1)
+
+                batches: List[List[Staff]] = list(results.iter_batches())
+                self.assertEqual(
+                    [len(batch) for batch in batches], [1, 2, 2])
+                self.assertEqual(
+                    [staff.staff_id for batch in batches for staff in batch],
+                    [2, 3, 4, 5])
+
+                self.assertEqual(
+                    [staff.staff_id for staff in find_all()],
+                    [1, 2, 3, 4, 5])
+
+    def test_select_function_prefetched(self):
+        """
+        Results fetched ahead by the background thread.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest("select prefetched", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.select(
+                    "SELECT staff_id, username, age FROM staff"
+                    " WHERE staff_id <= 5 ORDER BY staff_id",
+                    result_type=List[Staff], iteratable=True,
+                    stream=True, fetch_size=2, prefetch=1)
+                def find_all():
+                    pass
+
+                self.assertEqual(
+                    [staff.staff_id for staff in find_all()],
+                    [1, 2, 3, 4, 5])
+
+                with find_all() as results:
+                    self.assertEqual(next(results).staff_id, 1)
+                self.assertTrue(results.result.closed)
+
+    def test_select_function_paginated(self):
+        """
+        Results of all pages by keyset pagination.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest("select paginated", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.select(
+                    "SELECT staff_id, username, age FROM staff"
+                    " WHERE staff_id <= /* :max_id */5",
+                    result_type=List[Staff], iteratable=True,
+                    paginate=twinsqla.keyset("staff_id", page_size=2))
+                def find_pages(max_id: int):
+                    pass
+
+                self.assertEqual(
+                    [staff.staff_id for staff in find_pages(5)],
+                    [1, 2, 3, 4, 5])
+                self.assertEqual(
+                    [staff.staff_id for staff in find_pages(4)],
+                    [1, 2, 3, 4])
+
+                @sqla.select(
+                    "SELECT staff_id, username FROM staff"
+                    " WHERE staff_id <= 5",
+                    result_type=List[tuple],
+                    paginate=twinsqla.keyset(
+                        "staff_id", "username", page_size=2,
+                        new_connection=False))
+                def find_composite_pages():
+                    pass
+
+                results: Tuple[tuple, ...] = find_composite_pages()
+                self.assertEqual(
+                    [result[0] for result in results], [1, 2, 3, 4, 5])
+
+    def test_select_function_exported(self):
+        """
+        Results of ResultIterator exported to CSV and NDJSON.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest("select exported", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.select(
+                    "SELECT staff_id, username, age FROM staff"
+                    " WHERE staff_id <= 3 ORDER BY staff_id",
+                    iteratable=True)
+                def find_all():
+                    pass
+
+                output: io.StringIO = io.StringIO()
+                self.assertEqual(find_all().to_csv(output, batch_size=2), 3)
+                lines: List[str] = output.getvalue().splitlines()
+                self.assertEqual(len(lines), 4)
+                self.assertEqual(lines[0], "staff_id,username,age")
+                self.assertEqual(lines[1], "1,Alice,20")
+
+                output = io.StringIO()
+                self.assertEqual(
+                    find_all().to_ndjson(output, batch_size=2), 3)
+                self.assertEqual(
+                    json.loads(output.getvalue().splitlines()[0]),
+                    {"staff_id": 1, "username": "Alice", "age": 20})
+
     def test_select_method_returned_one_with_named_sqla(self):
         """
         A dao's method returns only one value.
@@ -291,6 +520,102 @@ class TWinSQLATest(unittest.TestCase):
                 self.assertEqual(result.username, "Alice")
                 self.assertEqual(result.age, 20)
 
+    def test_select_method_returned_one_with_dao_decorator(self):
+        """
+        A dao's method returns only one value.
+        A dao decorated by '@twinsqla.dao' binds TWinSQLA object
+        in constructing.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest(
+                "select one function with dao decorator.", db_type=db_type
+            ):
+                sqla: TWinSQLA = db_type.sqla
+
+                @twinsqla.dao
+                class StaffDao:
+                    def __init__(self, sqla: TWinSQLA):
+                        self.database = sqla
+
+                    @twinsqla.select(self.query_select_one, result_type=Staff)
+                    def find_for_method(self, id: int) -> Staff:
+                        pass
+
+                dao: StaffDao = StaffDao(sqla)
+                for staff_id in (1, 2):
+                    result: Staff = dao.find_for_method(staff_id)
+                    self.assertIsInstance(result, Staff)
+                    self.assertEqual(result.staff_id, staff_id)
+
+    def test_warmup_templates(self):
+        """
+        All templates of decorators are compiled by warming up,
+        and all failures are reported at once.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+        from twinsqla.exceptions import TemplateWarmupException
+
+        query_broken: str = "SELECT * FROM staff WHERE /*%if */"
+
+        for db_type in self.db_types:
+            with self.subTest("warmup templates.", db_type=db_type):
+                sqla: TWinSQLA = TWinSQLA(db_type.engine)
+
+                @sqla.select(self.query_select_one, result_type=Staff)
+                def find_for_function(id: int) -> Staff:
+                    pass
+
+                @sqla.select(query_broken, result_type=Staff)
+                def find_broken() -> Staff:
+                    pass
+
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    with self.assertRaises(TemplateWarmupException) as cm:
+                        sqla.warmup(executor=executor)
+
+                failed_queries: List[str] = [
+                    source.query for source, _ in cm.exception.failures]
+                self.assertIn(query_broken, failed_queries)
+                self.assertNotIn(self.query_select_one, failed_queries)
+
+                result: Staff = find_for_function(1)
+                self.assertEqual(result.staff_id, 1)
+
+    def test_cache_info(self):
+        """
+        Compiled queries are cached, and statistics of caches are available.
+        """
+
+        for db_type in self.db_types:
+            with self.subTest("cache info.", db_type=db_type):
+                sqla: TWinSQLA = TWinSQLA(db_type.engine, cache_size=1)
+
+                @sqla.select(self.query_select_one, result_type=Staff)
+                def find_for_function(id: int) -> Staff:
+                    pass
+
+                @sqla.select(self.query_select_many, result_type=List[Staff])
+                def filter_for_function(id: int) -> List[Staff]:
+                    pass
+
+                for staff_id in (1, 2):
+                    find_for_function(staff_id)
+                filter_for_function(2)
+
+                query_cache_info = sqla.cache_info()["query"]
+                self.assertEqual(query_cache_info.hits, 1)
+                self.assertEqual(query_cache_info.misses, 2)
+                self.assertEqual(query_cache_info.evictions, 1)
+                self.assertEqual(query_cache_info.currsize, 1)
+                self.assertGreater(query_cache_info.currbytes, 0)
+
+                sqla.clear_caches()
+                query_cache_info = sqla.cache_info()["query"]
+                self.assertEqual(query_cache_info.currsize, 0)
+                self.assertEqual(query_cache_info.currbytes, 0)
+
     def test_no_twinsqla_object(self):
         """
         A dao's method finds no TWinSQLA object.
@@ -592,6 +917,140 @@ class TWinSQLATest(unittest.TestCase):
                 )]
                 self.assertEqual(len(results), 3)
 
+    def test_insert_many__bulk(self):
+        for db_type in self.db_types:
+            with self.subTest("insert values by bulk", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.insert(table_name="staff", bulk=2)
+                def insert(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    Staff(staff_id=100 + index, username=f'BULK{index}',
+                          age=index)
+                    for index in range(5)
+                ]
+                with sqla.transaction():
+                    insert(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id >= 100"
+                    " ORDER BY staff_id"
+                )]
+                self.assertEqual(len(results), 5)
+                self.assertEqual(results[4]["username"], "BULK4")
+
+    def test_insert_many__bulk_copy(self):
+        for db_type in self.db_types:
+            with self.subTest("insert values by copy", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.insert(bulk="copy")
+                def insert(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    StaffWithTableAutoPk(
+                        staff_id=9999999, username=f'COPY, "{index}"',
+                        age=index)
+                    for index in range(3)
+                ] + [StaffWithTableAutoPk(username='', age=3)]
+                with sqla.transaction():
+                    insert(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    """
+                    SELECT * FROM auto_staff
+                    WHERE username LIKE 'COPY%' OR username = ''
+                    ORDER BY age
+                    """
+                )]
+                self.assertEqual(len(results), 4)
+                self.assertNotEqual(results[0]["staff_id"], 9999999)
+                self.assertEqual(results[2]["username"], 'COPY, "2"')
+                self.assertEqual(results[3]["username"], '')
+
+    def test_insert_many__different_columns(self):
+        for db_type in self.db_types:
+            with self.subTest(
+                "insert values with None attributes", db_type=db_type
+            ):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.insert(table_name="staff", bulk=True)
+                def insert(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    Staff(staff_id=100, username='Zoo', age=88),
+                    Staff(staff_id=101, username='Xaming'),
+                    Staff(staff_id=102, username='Yorga', age=45),
+                ]
+                with sqla.transaction():
+                    insert(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id >= 100"
+                    " ORDER BY staff_id"
+                )]
+                self.assertEqual(len(results), 3)
+                self.assertIsNone(results[1]["age"])
+                self.assertEqual(results[2]["age"], 45)
+
+    def test_insert_many__slots_entity(self):
+        for db_type in self.db_types:
+            with self.subTest("insert values with slots", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.insert()
+                def insert(entities: List[StaffWithSlots]):
+                    pass
+
+                entities: List[StaffWithSlots] = [
+                    StaffWithSlots(staff_id=100, username='Zoo', age=88),
+                    StaffWithSlots(staff_id=101, username='Xaming'),
+                ]
+                with sqla.transaction():
+                    insert(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id >= 100"
+                    " ORDER BY staff_id"
+                )]
+                self.assertEqual(len(results), 2)
+                self.assertEqual(results[0]["age"], 88)
+                self.assertIsNone(results[1]["age"])
+
+    def test_insert_many__bulk_rollback(self):
+        for db_type in self.db_types:
+            with self.subTest(
+                "rollback all chunks of bulk insert", db_type=db_type
+            ):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.insert(table_name="staff", bulk=2)
+                def insert(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    Staff(staff_id=100, username='Zoo', age=88),
+                    Staff(staff_id=101, username='Xaming', age=17),
+                    Staff(staff_id=100, username='DUPLICATED', age=45),
+                ]
+                with self.assertRaises(Exception):
+                    insert(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id >= 100"
+                )]
+                self.assertEqual(len(results), 0)
+
     def test_insert_many__function_without_query_table(self):
         for db_type in self.db_types:
             with self.subTest("insert values", db_type=db_type):
@@ -840,6 +1299,170 @@ class TWinSQLATest(unittest.TestCase):
                 )]
                 self.assertEqual(len(results), 3)
 
+    def test_update_many_function__bulk(self):
+        for db_type in self.db_types:
+            with self.subTest("update values by bulk", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.update(bulk=2)
+                def update(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    StaffWithTablePk(
+                        staff_id=staff_id, username=f'BULK {staff_id}',
+                        age=staff_id * 10)
+                    for staff_id in (6, 7, 8)
+                ]
+                with sqla.transaction():
+                    update(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE username LIKE 'BULK %'"
+                    " ORDER BY staff_id"
+                )]
+                self.assertEqual(len(results), 3)
+                self.assertEqual(results[2]["username"], "BULK 8")
+                self.assertEqual(results[2]["age"], 80)
+
+    def test_upsert_many_function__bulk(self):
+        for db_type in self.db_types:
+            with self.subTest("upsert values", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+                # "staff" is created by "CREATE TABLE AS" without keys.
+                db_type.engine.execute(
+                    "ALTER TABLE staff ADD PRIMARY KEY (staff_id)")
+
+                @sqla.upsert(bulk=True)
+                def upsert(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    StaffWithTablePk(
+                        staff_id=8, username='UPSERTED', age=8),
+                    StaffWithTablePk(
+                        staff_id=100, username='UPSERTED', age=100)
+                ]
+                with sqla.transaction():
+                    upsert(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE username = 'UPSERTED'"
+                    " ORDER BY staff_id"
+                )]
+                self.assertEqual(len(results), 2)
+                self.assertEqual(results[0]["staff_id"], 8)
+                self.assertEqual(results[1]["age"], 100)
+
+    def test_upsert_many_function__bulk_duplicated_keys(self):
+        for db_type in self.db_types:
+            with self.subTest("upsert values of same keys",
+                              db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+                # "staff" is created by "CREATE TABLE AS" without keys.
+                db_type.engine.execute(
+                    "ALTER TABLE staff ADD PRIMARY KEY (staff_id)")
+
+                @sqla.upsert(bulk=True)
+                def upsert(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    StaffWithTablePk(
+                        staff_id=100, username='UPSERTED', age=100),
+                    StaffWithTablePk(
+                        staff_id=100, username='UPSERTED TWICE', age=101)
+                ]
+                with sqla.transaction():
+                    upsert(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id = 100"
+                )]
+                self.assertEqual(len(results), 1)
+                self.assertEqual(results[0]["username"], "UPSERTED TWICE")
+                self.assertEqual(results[0]["age"], 101)
+
+    def test_upsert_function__without_query(self):
+        for db_type in self.db_types:
+            with self.subTest("upsert a value", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+                # "staff" is created by "CREATE TABLE AS" without keys.
+                db_type.engine.execute(
+                    "ALTER TABLE staff ADD PRIMARY KEY (staff_id)")
+
+                @sqla.upsert()
+                def upsert(entity: Staff):
+                    pass
+
+                with sqla.transaction():
+                    upsert(StaffWithTablePk(
+                        staff_id=6, username='UPSERTED', age=6))
+                    upsert(StaffWithTablePk(
+                        staff_id=6, username='UPSERTED TWICE', age=7))
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id = 6"
+                )]
+                self.assertEqual(len(results), 1)
+                self.assertEqual(results[0]["username"], "UPSERTED TWICE")
+                self.assertEqual(results[0]["age"], 7)
+
+    def test_delete_many_with_table_pk_function__without_query(self):
+        for db_type in self.db_types:
+            with self.subTest("delete values", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.delete()
+                def delete(entities: List[Staff]):
+                    pass
+
+                entities: List[Staff] = [
+                    StaffWithTablePk(staff_id=staff_id)
+                    for staff_id in (6, 7, 8)
+                ]
+                with sqla.transaction():
+                    delete(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id IN (6, 7, 8)"
+                )]
+                self.assertEqual(len(results), 0)
+
+    def test_delete_many_function__composite_condition(self):
+        for db_type in self.db_types:
+            with self.subTest("delete values", db_type=db_type):
+                sqla: TWinSQLA = db_type.sqla
+
+                @sqla.delete(condition_columns=("staff_id", "username"))
+                def delete(entities: List[Staff]):
+                    pass
+
+                before: List[dict] = [dict(value) for value
+                                      in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id IN (6, 7)"
+                    " ORDER BY staff_id"
+                )]
+                entities: List[Staff] = [
+                    StaffWithTablePk(
+                        staff_id=6, username=before[0]["username"]),
+                    StaffWithTablePk(staff_id=7, username='NOT MATCHED')
+                ]
+                with sqla.transaction():
+                    delete(entities)
+
+                results = [dict(value) for value
+                           in db_type.engine.execute(
+                    "SELECT * FROM staff WHERE staff_id IN (6, 7)"
+                )]
+                self.assertEqual(len(results), 1)
+                self.assertEqual(results[0]["staff_id"], 7)
+
 
 if __name__ == "__main__":
     unittest.main()
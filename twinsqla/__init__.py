@@ -1,14 +1,17 @@
 import logging
 
 from .twinsqla import TWinSQLA, ResultIterator
-from .twinsqla import table, autopk
-from .twinsqla import select, insert, update, delete
+from .twinsqla import table, autopk, dao
+from .twinsqla import select, insert, update, delete, upsert
+from ._columnar import columnar
+from ._pagination import keyset
 from .exceptions import TWinSQLAException
 
 __all__ = [
     "TWinSQLA", "ResultIterator",
-    "table", "autopk",
-    "select", "insert", "update", "delete",
+    "table", "autopk", "dao",
+    "select", "insert", "update", "delete", "upsert",
+    "columnar", "keyset",
     "TWinSQLAException"
 ]
 
@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pathlib import Path
+import json
+import logging
+
+from ._support import description
+from ._dynamic_parser import (
+    TwinQuery, StaticQuery, PythonExprQuery, AlternativeQuery, grammar_digest
+)
+from .exceptions import InvalidTemplateBundleException
+
+
+BUNDLE_FORMAT: str = "twinsqla-template-bundle"
+BUNDLE_VERSION: int = 2
+
+# Name of the parser of templates without the parser specified.
+DEFAULT_PARSER: str = "grammar"
+
+
+@description(("version", "grammar"))
+class TemplateBundle:
+    """
+    Pre-analyzed two-way sql templates.
+
+    The bundle is created by `twinsqla-compile` command, and is loaded
+    by `TWinSQLA(template_bundle=...)`. Templates found in the bundle are
+    compiled without parsing by the grammar.
+
+    Parsers can analyze the same template differently, so the templates
+    are found only by the same parser as analyzed them.
+
+    Args:
+        templates (Optional[Dict[Tuple[str, str], List[TwinQuery]]],
+            optional): analyzed templates keyed by the template text and
+            the parser name. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        templates: Optional[Dict[Tuple[str, str], List[TwinQuery]]] = None,
+        *, version: int = BUNDLE_VERSION, grammar: Optional[str] = None
+    ):
+
+        self.templates: Dict[Tuple[str, str], List[TwinQuery]] = \
+            dict(templates or {})
+        self.version: int = version
+        self.grammar: str = grammar if grammar else grammar_digest()
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def add(self, template: str, parsed_queries: List[TwinQuery],
+            parser: str = DEFAULT_PARSER) -> None:
+        self.templates[(template, parser)] = parsed_queries
+
+    def find(self, template: str, parser: str = DEFAULT_PARSER
+             ) -> Optional[List[TwinQuery]]:
+        return self.templates.get((template, parser))
+
+    def save(self, file_path: Union[Path, str]) -> None:
+        bundle: Dict[str, Any] = {
+            "format": BUNDLE_FORMAT,
+            "version": self.version,
+            "grammar": self.grammar,
+            "templates": [
+                {"template": template, "parser": parser,
+                 "parsed": _encode(parsed_queries)}
+                for (template, parser), parsed_queries
+                in self.templates.items()
+            ]
+        }
+        with open(file_path, "w", encoding="utf-8") as bundle_file:
+            json.dump(bundle, bundle_file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, file_path: Union[Path, str]) -> "TemplateBundle":
+        try:
+            with open(file_path, "r", encoding="utf-8") as bundle_file:
+                bundle: Dict[str, Any] = json.load(bundle_file)
+        except (OSError, ValueError) as exc:
+            raise InvalidTemplateBundleException(
+                f"Failed to load template bundle '{file_path}'."
+                f" Detail : {exc}"
+            ) from exc
+
+        if not isinstance(bundle, dict) \
+                or bundle.get("format") != BUNDLE_FORMAT \
+                or bundle.get("version") != BUNDLE_VERSION:
+            raise InvalidTemplateBundleException(
+                f"The file '{file_path}' is not template bundle"
+                f" of version {BUNDLE_VERSION}."
+                " Recreate it by 'twinsqla-compile' command."
+            )
+
+        if bundle.get("grammar") != grammar_digest():
+            logging.getLogger(__name__).warning(
+                "Ignored template bundle '%s' created with other version"
+                " of TWinSQLA. Recreate it by 'twinsqla-compile' command.",
+                file_path
+            )
+            return cls()
+
+        try:
+            return cls({
+                (entry["template"], entry["parser"]): _decode(entry["parsed"])
+                for entry in bundle["templates"]
+            }, version=bundle["version"], grammar=bundle["grammar"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidTemplateBundleException(
+                f"Broken template bundle '{file_path}'. Detail : {exc}"
+            ) from exc
+
+
+def _encode(parsed_queries: List[TwinQuery]) -> List[list]:
+    encoded: List[list] = []
+    for parsed_query in parsed_queries:
+        if isinstance(parsed_query, StaticQuery):
+            encoded.append(["static", parsed_query.query])
+        elif isinstance(parsed_query, PythonExprQuery):
+            encoded.append(["python_expr", parsed_query.python_expr])
+        elif isinstance(parsed_query, AlternativeQuery):
+            encoded.append(["alternatives", [
+                [condition, _encode(sub_queries)]
+                for condition, sub_queries in parsed_query.alternatives
+            ]])
+        else:
+            raise ValueError(f"Unexpected query component : {parsed_query}")
+
+    return encoded
+
+
+def _decode(encoded: List[list]) -> List[TwinQuery]:
+    parsed_queries: List[TwinQuery] = []
+    for kind, value in encoded:
+        if kind == "static":
+            parsed_queries.append(StaticQuery(value))
+        elif kind == "python_expr":
+            parsed_queries.append(PythonExprQuery(value))
+        elif kind == "alternatives":
+            parsed_queries.append(AlternativeQuery([
+                (condition, _decode(sub_queries))
+                for condition, sub_queries in value
+            ]))
+        else:
+            raise ValueError(f"Unexpected query component : {kind}")
+
+    return parsed_queries
@@ -0,0 +1,188 @@
+from typing import Callable, Any, Dict, Hashable, NamedTuple, Optional, Set
+from collections import OrderedDict
+from enum import Enum
+import sys
+import threading
+
+from ._support import description
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of cache.
+
+    Attributes:
+        hits (int): count of found in cache.
+        misses (int): count of not found in cache.
+        maxsize (Optional[int]): max count of entries. None is unlimited.
+        currsize (int): current count of entries.
+        evictions (int): count of entries removed for the limits.
+        maxbytes (Optional[int]): max approximate bytes of entries.
+            None is unlimited.
+        currbytes (int): current approximate bytes of entries.
+    """
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+    evictions: int = 0
+    maxbytes: Optional[int] = None
+    currbytes: int = 0
+
+
+@description(("maxsize", "maxbytes"))
+class LRUCache:
+    """
+    Least-recently-used cache shared across threads.
+
+    Args:
+        maxsize (Optional[int], optional):
+            Max count of entries. If None, the entries are not limited.
+            If 0, no entries are kept. Defaults to 128.
+        maxbytes (Optional[int], optional):
+            Max approximate bytes of entries. If None, the bytes are not
+            limited. Defaults to None.
+        sizeof (Callable[[Any, Any], int], optional):
+            Function to estimate bytes of an entry from the key and
+            the value. Defaults to `approximate_size` of both.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128,
+                 maxbytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any, Any], int]] = None):
+
+        self.maxsize: Optional[int] = maxsize
+        self.maxbytes: Optional[int] = maxbytes
+        self._sizeof: Callable[[Any, Any], int] = sizeof if sizeof \
+            else (lambda key, value: approximate_size(key, value))
+        self._entries: OrderedDict = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._bytes: int = 0
+
+    def get(self, key: Hashable, loader: Callable[[Any], Any]) -> Any:
+        """
+        Returns the cached value for `key`.
+        If not cached, the value is created by `loader(key)` and cached.
+        `loader` is called without holding the lock, so it may be called
+        more than once for the same key by concurrent threads.
+        """
+
+        with self._lock:
+            try:
+                value: Any = self._entries[key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+
+        value = loader(key)
+        if self.maxsize == 0:
+            return value
+
+        size: int = self._sizeof(key, value)
+        if (self.maxbytes is not None) and (size > self.maxbytes):
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while self._overflowed():
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted_key)
+                self._evictions += 1
+
+        return value
+
+    def grow(self, key: Hashable, size: int) -> None:
+        """
+        Add `size` bytes to the cached entry of `key`, for values which
+        grow after cached. The entries are evicted if the limit is over.
+        If `key` is not cached, nothing is done.
+        """
+
+        with self._lock:
+            if key not in self._sizes:
+                return
+
+            self._sizes[key] += size
+            self._bytes += size
+            while self._overflowed():
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted_key)
+                self._evictions += 1
+
+    def _overflowed(self) -> bool:
+        return (
+            (self.maxsize is not None and len(self._entries) > self.maxsize)
+            or (self.maxbytes is not None and self._bytes > self.maxbytes)
+        )
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(hits=self._hits, misses=self._misses,
+                             maxsize=self.maxsize,
+                             currsize=len(self._entries),
+                             evictions=self._evictions,
+                             maxbytes=self.maxbytes, currbytes=self._bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._bytes = 0
+
+
+def approximate_size(*objects: Any) -> int:
+    """
+    Approximate bytes of objects.
+
+    Strings, bytes and containers are counted with their items,
+    and other objects are counted with their attributes.
+    Objects referred from many objects (such as classes and functions)
+    are counted only by their own size.
+    """
+
+    seen: Set[int] = set()
+    return sum(_approximate_size(target, seen, 3) for target in objects)
+
+
+def _approximate_size(target: Any, seen: Set[int], depth: int) -> int:
+    if id(target) in seen:
+        return 0
+    seen.add(id(target))
+
+    size: int = sys.getsizeof(target, 0)
+    if depth <= 0 or isinstance(target, (str, bytes, type, Enum)) \
+            or callable(target):
+        return size
+
+    if isinstance(target, dict):
+        return size + sum(
+            _approximate_size(key, seen, depth - 1)
+            + _approximate_size(value, seen, depth - 1)
+            for key, value in target.items()
+        )
+    if isinstance(target, (tuple, list, set, frozenset)):
+        return size + sum(
+            _approximate_size(item, seen, depth - 1) for item in target)
+
+    attributes: Optional[dict] = getattr(target, "__dict__", None)
+    return size + (
+        _approximate_size(attributes, seen, depth - 1)
+        if attributes is not None else 0
+    )
@@ -0,0 +1,115 @@
+from typing import Callable, Any, Optional, Tuple, Type, Union
+from collections import OrderedDict
+from inspect import signature
+
+from ._support import description
+from ._querybindbuilder import QueryBindBuilder, QueryContext
+from ._sqlbuilder import TemplateParser
+from ._resultbuilder import ResultType, ResultTypeBuilder
+from ._columnar import ColumnarResultType
+from ._pagination import keyset
+from . import exceptions
+
+
+# Count of rows fetched at once from server side cursor in default.
+DEFAULT_FETCH_SIZE: int = 1000
+
+
+@description(("function", "param_names", "result_type"))
+class CallPlan:
+    """
+    Pre-computed layout of a decorated function.
+
+    Everything which does not depend on the arguments of each call
+    (parameter names, the position of `self` and the query binder)
+    is resolved once when decorating.
+    So each call only packs the arguments and executes the query.
+    The result type is resolved by the cache of the TWinSQLA object
+    executing the query.
+    """
+
+    def __init__(self, func: Callable, binder: QueryBindBuilder, *,
+                 query: Optional[str], sql_path: Optional[str],
+                 table_name: Optional[str],
+                 condition_columns: Tuple[str, ...],
+                 result_type: Optional[Type[Any]], iteratable: bool,
+                 template_parser: Optional[TemplateParser] = None,
+                 bulk: Union[bool, int, str] = False,
+                 stream: bool = False, fetch_size: Optional[int] = None,
+                 prefetch: int = 0, paginate: Optional[keyset] = None):
+
+        if iteratable and isinstance(result_type, ColumnarResultType):
+            # Not to execute the query before the error.
+            raise exceptions.TWinSQLAException(
+                "Columnar result type is not available with"
+                " 'iteratable=True'.")
+
+        param_names: Tuple[str, ...] = tuple(signature(func).parameters)
+        has_self: bool = len(param_names) > 0 and param_names[0] == "self"
+
+        self.function: Callable = func
+        self.binder: QueryBindBuilder = binder
+        self.query: Optional[str] = query
+        self.sql_path: Optional[str] = sql_path
+        self.table_name: Optional[str] = table_name
+        self.condition_columns: Tuple[str, ...] = condition_columns
+        self.iteratable: bool = iteratable
+        self.template_parser: Optional[TemplateParser] = template_parser
+        self.bulk: Union[bool, int, str] = bulk
+        self.stream: bool = stream
+        self.prefetch: int = prefetch
+        self.paginate: Optional[keyset] = paginate
+        self.fetch_size: Optional[int] = fetch_size if fetch_size \
+            else (DEFAULT_FETCH_SIZE if stream or prefetch > 0 else None)
+        self.result_type: Optional[Type[Any]] = result_type
+
+        # `__self__` exists only when the decorated object is bound method.
+        self.bound_owner: Optional[Any] = getattr(func, "__self__", None)
+        self.has_self: bool = has_self
+        self.param_names: Tuple[str, ...] = \
+            param_names[1:] if has_self else param_names
+
+    def resolve_result_type(self, type_builder: ResultTypeBuilder
+                            ) -> Optional[ResultType]:
+        return type_builder.build(self.result_type) \
+            if self.result_type is not None else None
+
+    def owner(self, args: tuple) -> Optional[Any]:
+        if self.bound_owner is not None:
+            return self.bound_owner
+
+        return args[0] if self.has_self and len(args) > 0 else None
+
+    def bind_arguments(self, args: tuple, kwargs: dict,
+                       except_value: Optional[Any] = None) -> OrderedDict:
+
+        positionals: tuple = args[1:] if self.has_self else args
+        key_values: OrderedDict = OrderedDict(
+            (param_name, param_value) for param_name, param_value
+            in zip(self.param_names, positionals)
+            if param_value is not except_value
+        )
+
+        if kwargs:
+            for param_name in self.param_names[len(positionals):]:
+                param_value: Optional[Any] = kwargs.get(param_name)
+                if (param_value is not None) and \
+                        (param_value is not except_value):
+                    key_values[param_name] = param_value
+
+        return key_values
+
+    def context(self, bind_params: dict, args: tuple, kwargs: dict,
+                dialect_name: Optional[str] = None,
+                driver_name: Optional[str] = None) -> QueryContext:
+
+        return QueryContext(
+            query=self.query, sql_path=self.sql_path,
+            table_name=self.table_name,
+            condition_columns=self.condition_columns,
+            bind_params=bind_params, triggered_function=self.function,
+            function_args=args, function_kwargs=kwargs,
+            template_parser=self.template_parser, bulk=self.bulk,
+            dialect_name=dialect_name, driver_name=driver_name,
+            argument_names=self.param_names
+        )
@@ -0,0 +1,238 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy
+except ImportError:  # numpy is an optional extra.
+    numpy = None
+
+from ._support import description
+from ._resultbuilder import ResultType
+from . import exceptions
+
+
+# Count of rows fetched by each `fetchmany()`.
+DEFAULT_BATCH_SIZE: int = 10000
+
+# NumPy dtypes of type codes in cursor description for each dialect.
+TYPE_CODES: Dict[str, Dict[Any, str]] = {
+    # OIDs of PostgreSQL types
+    "postgresql": {
+        16: "bool", 20: "int64", 21: "int16", 23: "int32",
+        700: "float32", 701: "float64"
+    },
+    # Field types of MySQL
+    "mysql": {
+        1: "int8", 2: "int16", 3: "int32", 4: "float32", 5: "float64",
+        8: "int64", 9: "int32"
+    }
+}
+
+
+@description(("dtypes", "structured", "batch_size"))
+class ColumnarResultType(ResultType):
+    """
+    Result type converting all rows to a NumPy array for each column.
+
+    The rows are fetched by `fetchmany()` for each `batch_size`,
+    and the values of each batch are converted to compact arrays.
+    The dtype of each column is
+        1. the dtype specified in `dtypes`,
+        2. the dtype of the type code in cursor description
+            (PostgreSQL and MySQL),
+        3. or the dtype inferred by NumPy from the first batch.
+    If values of a later batch do not fit the dtype of 2. or 3. (for
+    example, floats in a column inferred as integers), the dtype is
+    promoted by `numpy.result_type()` for the whole column.
+    Strings and values without NumPy dtypes (for example, NULL in integer
+    columns or integers out of 64 bits) are kept in arrays of `object`
+    dtype.
+
+    Args:
+        dtypes (Optional[Dict[str, Any]], optional):
+            NumPy dtypes for each column name. Defaults to None.
+        structured (bool, optional):
+            If True, returns one structured array. If False, returns
+            a dict of arrays with column names. Defaults to False.
+        batch_size (int, optional):
+            count of rows fetched at once. Defaults to 10000.
+    """
+
+    def __init__(self, dtypes: Optional[Dict[str, Any]] = None, *,
+                 structured: bool = False,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+
+        if numpy is None:
+            raise ImportError(
+                "NumPy is required for columnar result type."
+                " Install it by 'pip install twinsqla[numpy]'."
+            )
+
+        super().__init__(entity_type=dict, sequencial=True)
+        self.dtypes: Dict[str, Any] = dict(dtypes) if dtypes else {}
+        self.structured: bool = structured
+        self.batch_size: int = batch_size
+
+    def to_values(self, results) -> Any:
+        keys: Tuple[str, ...] = tuple(results.keys()) \
+            if results.returns_rows else ()
+        buffers: _ColumnBuffers = _ColumnBuffers(
+            keys, self._initial_dtypes(results, keys),
+            set(key for key in keys if key in self.dtypes))
+
+        while keys:
+            rows: list = results.fetchmany(self.batch_size)
+            if not rows:
+                break
+            buffers.append(rows)
+        results.close()
+
+        return buffers.to_structured() if self.structured \
+            else buffers.to_dict()
+
+    def mapper(self, keys):
+        raise exceptions.TWinSQLAException(
+            "Columnar result type is not available with 'iteratable=True'.")
+
+    def _initial_dtypes(self, results, keys: Tuple[str, ...]
+                        ) -> List[Optional[Any]]:
+
+        described: List[Optional[str]] = _described_dtypes(results, keys)
+        return [
+            self.dtypes[key] if key in self.dtypes else dtype
+            for key, dtype in zip(keys, described)
+        ]
+
+
+def columnar(dtypes: Optional[Dict[str, Any]] = None, *,
+             structured: bool = False,
+             batch_size: int = DEFAULT_BATCH_SIZE) -> ColumnarResultType:
+    """
+    Result type of NumPy arrays for each column.
+    NumPy needs to be installed. (`pip install twinsqla[numpy]`)
+
+    For example:
+        @twinsqla.select("SELECT staff_id, age FROM staff",
+                         result_type=twinsqla.columnar({"age": "int16"}))
+        def fetch_ages() -> Dict[str, numpy.ndarray]:
+            pass
+
+    Args:
+        dtypes (Optional[Dict[str, Any]], optional):
+            NumPy dtypes for each column name. The dtypes of other columns
+            are inferred. Defaults to None.
+        structured (bool, optional):
+            If True, returns one structured array. If False, returns
+            a dict of arrays with column names. Defaults to False.
+        batch_size (int, optional):
+            count of rows fetched at once. Defaults to 10000.
+
+    Returns:
+        ColumnarResultType: result type
+    """
+
+    return ColumnarResultType(dtypes, structured=structured,
+                              batch_size=batch_size)
+
+
+class _ColumnBuffers:
+    def __init__(self, keys: Tuple[str, ...], dtypes: List[Optional[Any]],
+                 explicit_keys: Set[str]):
+        self.keys: Tuple[str, ...] = keys
+        self.dtypes: List[Optional[Any]] = dtypes
+        self.explicit_keys: Set[str] = explicit_keys
+        self.chunks: List[list] = [[] for _ in keys]
+
+    def append(self, rows: list) -> None:
+        for index, values in enumerate(zip(*rows)):
+            # `_to_array()` may replace the chunks of the column.
+            array = self._to_array(index, values)
+            self.chunks[index].append(array)
+
+    def _to_array(self, index: int, values: tuple) -> Any:
+        dtype: Optional[Any] = self.dtypes[index]
+        if self.keys[index] in self.explicit_keys:
+            return numpy.asarray(values, dtype=dtype)
+
+        try:
+            array = numpy.asarray(values)
+        except (TypeError, ValueError, OverflowError):
+            return self._to_objects(index, values)
+        if array.ndim != 1 or array.dtype.kind in "USVO":
+            return self._to_objects(index, values)
+
+        if dtype is None:
+            self.dtypes[index] = array.dtype
+            return array
+        if _fits(array, numpy.dtype(dtype)):
+            return array.astype(dtype, copy=False)
+
+        # Values of this batch are not converted to the dtype without loss.
+        promoted = numpy.result_type(dtype, array.dtype)
+        self._promote(index, promoted)
+        return array.astype(promoted, copy=False)
+
+    def _to_objects(self, index: int, values: tuple) -> Any:
+        if self.dtypes[index] != numpy.dtype(object):
+            self._promote(index, numpy.dtype(object))
+        return _object_array(values)
+
+    def _promote(self, index: int, dtype: Any) -> None:
+        self.dtypes[index] = dtype
+        self.chunks[index] = [
+            chunk.astype(dtype) for chunk in self.chunks[index]]
+
+    def _column(self, index: int) -> Any:
+        chunks: list = self.chunks[index]
+        if not chunks:
+            return numpy.empty(0, dtype=self.dtypes[index] or object)
+        return chunks[0] if len(chunks) == 1 else numpy.concatenate(chunks)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            key: self._column(index) for index, key in enumerate(self.keys)}
+
+    def to_structured(self) -> Any:
+        columns: list = [
+            self._column(index) for index in range(len(self.keys))]
+        array = numpy.empty(
+            len(columns[0]) if columns else 0,
+            dtype=[(key, column.dtype)
+                   for key, column in zip(self.keys, columns)])
+        for key, column in zip(self.keys, columns):
+            array[key] = column
+        return array
+
+
+def _described_dtypes(results, keys: Tuple[str, ...]
+                      ) -> List[Optional[str]]:
+
+    dialect = getattr(results, "dialect", None) \
+        or getattr(getattr(results, "context", None), "dialect", None)
+    type_codes: Dict[Any, str] = TYPE_CODES.get(
+        getattr(dialect, "name", None), {})
+    cursor_description: Optional[list] = getattr(
+        getattr(results, "cursor", None), "description", None)
+
+    if not type_codes or not cursor_description \
+            or len(cursor_description) != len(keys):
+        return [None for _ in keys]
+    return [type_codes.get(column[1]) for column in cursor_description]
+
+
+def _fits(array: Any, dtype: Any) -> bool:
+    if numpy.can_cast(array.dtype, dtype):
+        return True
+    if array.dtype.kind == "f" and dtype.kind == "f":
+        # Floats of the database are returned as python float.
+        return True
+    if array.dtype.kind in "iu" and dtype.kind in "iu" and len(array):
+        limits = numpy.iinfo(dtype)
+        return bool(array.min() >= limits.min and array.max() <= limits.max)
+    return False
+
+
+def _object_array(values: tuple) -> Any:
+    array = numpy.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        array[index] = value
+    return array
@@ -0,0 +1,305 @@
+from typing import List, NamedTuple, Optional, Tuple
+import re
+
+from ._dynamic_parser import (
+    DynamicQuery, QueryCompiler,
+    TwinQuery, StaticQuery, PythonExprQuery, AlternativeQuery
+)
+from .exceptions import QueryParseFailedException
+
+
+class _Token(NamedTuple):
+    kind: str
+    value: str
+
+
+_TOKEN_START = re.compile(
+    r"'|\"|--|/\*|(?<![A-Za-z0-9_$])\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_QUOTED_IDENTIFIER = re.compile(r'"(?:[^"]|"")*"')
+_BIND_PARAM = re.compile(r"\s*(:[a-zA-Z_]\w*)\s*", re.DOTALL)
+_DUMMY_VALUE = re.compile(
+    r"\s*(?:'(?:[^\n']|'')*'"
+    r"|[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?"
+    r"|(?:TRUE|FALSE|NULL)(?![A-Za-z0-9_]))",
+    re.IGNORECASE
+)
+# Dummy value of list after 'IN' : /* :values */(1, 2)
+_DUMMY_LIST = re.compile(
+    r"\s*\((?:[^()']|'(?:[^']|'')*'"
+    r"|\((?:[^()']|'(?:[^']|'')*')*\))*\)"
+)
+_IN_OPERATOR = re.compile(r"(?<![A-Za-z0-9_$])IN\s*\Z", re.IGNORECASE)
+# Positions of boolean operands, where if-blocks are parsed by the grammar.
+_OPERAND_POSITION = re.compile(
+    r"(?:(?<![<>!])=|!=|<>|[(,]|(?<![A-Za-z0-9_$])(?:WHERE|HAVING|ON|AND"
+    r"|OR|NOT|CASE|WHEN|THEN|ELSE|SELECT|DISTINCT|BY))\Z",
+    re.IGNORECASE
+)
+_CONDITION_DIRECTIVE = re.compile(
+    r"%(if|elif|elseif)\s(.*)", re.IGNORECASE | re.DOTALL)
+_SIMPLE_DIRECTIVE = re.compile(r"%(else|end)\s*", re.IGNORECASE)
+_DUMMY_OP = re.compile(r"(?:OR|AND)(?![A-Za-z0-9_])\s*", re.IGNORECASE)
+
+
+class DirectiveScanner():
+    """
+    Parser of two-way sql templates which scans only directives.
+
+    Unlike `DynamicParser`, the sql statement is not parsed by the grammar.
+    Only sql comments, string literals and quoted identifiers are
+    tokenized to find the following directives.
+        - bind parameter : /* :param */dummy_value
+        - python expression : /* python_expression */dummy_value
+        - if-block : /*%if cond */ ... /*%elif cond */ OR ... /*%end*/
+    So any sql of any dialects is available, and templates without
+    directives are not scanned.
+
+    Comments starting with '/**', and comments not followed by a dummy
+    value (for example, optimizer hints) are kept as they are.
+
+    If-blocks at boolean operands (for example, after 'WHERE' or 'AND')
+    are analyzed as same as `DynamicParser`. If-blocks at other positions
+    are not supported by the grammar, and they are replaced to nothing
+    when no blocks are selected. Such if-blocks can not have dummy
+    operators, because they are not alternatives of boolean operands.
+    """
+
+    def parse(self, query: str, arg_keys: Tuple[str, ...] = ()
+              ) -> DynamicQuery:
+        return QueryCompiler(self.analyze(query), arg_keys).compile()
+
+    def analyze(self, query: str) -> List[TwinQuery]:
+        template: str = query.strip()
+        if not has_directive(template):
+            return [StaticQuery(template)]
+
+        tokens: List[_Token] = _tokenize(template)
+        parsed_queries, index = _parse_block(tokens, 0, (), False)
+        if index < len(tokens):
+            raise QueryParseFailedException(
+                "Failed to parse dynamic query. Detail : unexpected"
+                f" '/*%{tokens[index].kind}*/' without '/*%if ...*/'"
+            )
+        return parsed_queries
+
+
+def has_directive(query: str) -> bool:
+    return "/*" in query
+
+
+def _tokenize(template: str) -> List[_Token]:
+    tokens: List[_Token] = []
+    texts: List[str] = []
+    index: int = 0
+
+    def _flush() -> None:
+        if texts:
+            tokens.append(_Token("text", "".join(texts)))
+            texts.clear()
+
+    while index < len(template):
+        matched: Optional[re.Match] = _TOKEN_START.search(template, index)
+        if matched is None:
+            texts.append(template[index:])
+            break
+
+        start: int = matched.start()
+        texts.append(template[index:start])
+        marker: str = matched.group(0)
+
+        if marker != "/*":
+            end: int = _skip_literal(template, start, marker)
+            texts.append(template[start:end])
+            index = end
+            continue
+
+        close: int = template.find("*/", start + 2)
+        if close < 0:
+            raise QueryParseFailedException(
+                "Failed to parse dynamic query. Detail : unclosed comment"
+                f" at position {start}"
+            )
+        comment: str = template[start + 2:close]
+        index = close + 2
+
+        if comment.startswith("*"):
+            texts.append(template[start:index])
+            continue
+
+        if comment.startswith("%"):
+            _flush()
+            tokens.append(_directive_token(comment))
+            continue
+
+        dummy: Optional[re.Match] = _dummy_value(template, start, index)
+        bind_param: Optional[re.Match] = _BIND_PARAM.fullmatch(comment)
+        if bind_param is not None:
+            texts.append(bind_param.group(1))
+            index = dummy.end() if dummy else index
+            continue
+
+        if dummy is None:
+            # not two-way sql expression but sql comment.
+            texts.append(template[start:index])
+            continue
+
+        _flush()
+        tokens.append(_Token("python_expr", comment.strip()))
+        index = dummy.end()
+
+    _flush()
+    return tokens
+
+
+def _dummy_value(template: str, start: int, index: int
+                 ) -> Optional[re.Match]:
+
+    if _IN_OPERATOR.search(template[:start]) is None \
+            or not template[index:].lstrip().startswith("("):
+        return _DUMMY_VALUE.match(template, index)
+
+    dummy: Optional[re.Match] = _DUMMY_LIST.match(template, index)
+    if dummy is None:
+        raise QueryParseFailedException(
+            "Failed to parse dynamic query. Detail : unsupported dummy"
+            f" value of list at position {index}"
+        )
+    return dummy
+
+
+def _skip_literal(template: str, start: int, marker: str) -> int:
+    if marker == "--":
+        end: int = template.find("\n", start)
+        return len(template) if end < 0 else end
+
+    if marker.startswith("$"):
+        end = template.find(marker, start + len(marker))
+        return len(template) if end < 0 else end + len(marker)
+
+    pattern: re.Pattern = _STRING_LITERAL if marker == "'" \
+        else _QUOTED_IDENTIFIER
+    matched: Optional[re.Match] = pattern.match(template, start)
+    return matched.end() if matched else len(template)
+
+
+def _directive_token(comment: str) -> _Token:
+    condition: Optional[re.Match] = _CONDITION_DIRECTIVE.fullmatch(comment)
+    if condition is not None:
+        kind: str = condition.group(1).lower()
+        return _Token("if" if kind == "if" else "elif",
+                      condition.group(2).strip())
+
+    simple: Optional[re.Match] = _SIMPLE_DIRECTIVE.fullmatch(comment)
+    if simple is not None:
+        return _Token(simple.group(1).lower(), "")
+
+    raise QueryParseFailedException(
+        f"Failed to parse dynamic query. Detail : unknown directive"
+        f" '/*{comment}*/'"
+    )
+
+
+def _parse_block(tokens: List[_Token], index: int,
+                 stop_kinds: Tuple[str, ...], operand: bool
+                 ) -> Tuple[List[TwinQuery], int]:
+    """
+    Parses tokens until one of `stop_kinds`.
+    `operand` is whether the head of the block is a boolean operand.
+    """
+
+    parsed_queries: List[TwinQuery] = []
+    while index < len(tokens):
+        token: _Token = tokens[index]
+        if token.kind in stop_kinds:
+            break
+
+        if token.kind == "text":
+            parsed_queries.append(StaticQuery(token.value))
+            index += 1
+        elif token.kind == "python_expr":
+            parsed_queries.append(PythonExprQuery(token.value))
+            index += 1
+        elif token.kind == "if":
+            alternative, index = _parse_alternatives(
+                tokens, index, _is_operand(parsed_queries, operand))
+            parsed_queries.append(alternative)
+        else:
+            break
+
+    return (parsed_queries, index)
+
+
+def _parse_alternatives(tokens: List[_Token], index: int, operand: bool
+                        ) -> Tuple[AlternativeQuery, int]:
+
+    alternatives: List[Tuple[str, List[TwinQuery]]] = []
+    while True:
+        token: _Token = tokens[index]
+        sub_queries, index = _parse_block(
+            tokens, index + 1, ("elif", "else", "end"), operand)
+        if token.kind != "if" and not operand \
+                and _DUMMY_OP.match(_head(sub_queries)):
+            raise QueryParseFailedException(
+                "Failed to parse dynamic query. Detail : dummy operator"
+                f" after '/*%{token.kind}*/' is available only in if-blocks"
+                " at boolean operands"
+            )
+        condition: str = token.value if token.kind != "else" else "True"
+        alternatives.append(
+            (condition, _trim(sub_queries, token.kind != "if")))
+
+        if index >= len(tokens):
+            raise QueryParseFailedException(
+                "Failed to parse dynamic query. Detail : '/*%if ...*/'"
+                " is not closed by '/*%end*/'"
+            )
+        if tokens[index].kind == "end":
+            if not operand and token.kind != "else":
+                # Not to replace the if-block to 'FALSE'.
+                alternatives.append(("True", []))
+            return (AlternativeQuery(alternatives), index + 1)
+        if token.kind == "else":
+            raise QueryParseFailedException(
+                "Failed to parse dynamic query. Detail : unexpected"
+                f" '/*%{tokens[index].kind}*/' after '/*%else*/'"
+            )
+
+
+def _is_operand(parsed_queries: List[TwinQuery], head: bool) -> bool:
+    for parsed_query in reversed(parsed_queries):
+        if not isinstance(parsed_query, StaticQuery):
+            return False
+        text: str = parsed_query.query.rstrip()
+        if text:
+            return _OPERAND_POSITION.search(text) is not None
+    return head
+
+
+def _head(sub_queries: List[TwinQuery]) -> str:
+    return sub_queries[0].query.lstrip() \
+        if sub_queries and isinstance(sub_queries[0], StaticQuery) else ""
+
+
+def _trim(sub_queries: List[TwinQuery], has_dummy_op: bool
+          ) -> List[TwinQuery]:
+    """
+    Removes white spaces around the block, and the dummy operator
+    ('AND' or 'OR') at the head of 'elif' and 'else' blocks.
+    """
+
+    trimmed: List[TwinQuery] = list(sub_queries)
+    if trimmed and isinstance(trimmed[0], StaticQuery):
+        head: str = trimmed[0].query.lstrip()
+        if has_dummy_op:
+            head = _DUMMY_OP.sub("", head, count=1) \
+                if _DUMMY_OP.match(head) else head
+        trimmed[0] = StaticQuery(head)
+
+    if trimmed and isinstance(trimmed[-1], StaticQuery):
+        trimmed[-1] = StaticQuery(trimmed[-1].query.rstrip())
+
+    return [
+        sub_query for sub_query in trimmed
+        if not (isinstance(sub_query, StaticQuery) and not sub_query.query)
+    ]
@@ -1,12 +1,48 @@
-from typing import Optional, Union, Tuple, List, Dict
+from typing import Callable, Any, Optional, Union, Tuple, List, Dict
+from typing import Iterator
 from abc import ABCMeta, abstractmethod
-
+from collections import OrderedDict
+from pathlib import Path
+import ast
+import builtins
+import hashlib
+import logging
+import pickle
+import threading
+
+import lark
 from lark import Lark, Transformer, Tree, v_args, LarkError
+from lark.grammar import Rule
+from lark.lark import LarkOptions
+from lark.lexer import TerminalDef
+from lark.utils import SerializeMemoizer
 
 from ._support import description
+from ._cache import approximate_size
 from .exceptions import QueryParseFailedException
 
 
+GRAMMAR_CACHE_FORMAT: str = "twinsqla-grammar-cache"
+
+_GRAMMAR_FILES: List[str] = ["sql.two_way.lark", "python_grammer.lark"]
+
+# Query parsed by the grammar loaded from the cache to verify it.
+_GRAMMAR_CACHE_PROBE: str = \
+    "SELECT a FROM t WHERE /*%if b */ a = /* b */0 /*%end*/"
+
+
+def grammar_digest() -> str:
+    """
+    Digest of the grammar files used for analyzing templates.
+    Bundles and grammar caches created with other grammars are not available.
+    """
+
+    digest = hashlib.sha256()
+    for grammar_file in _GRAMMAR_FILES:
+        digest.update((Path(__file__).parent / grammar_file).read_bytes())
+    return digest.hexdigest()
+
+
 class TwinQuery():
     pass
 
@@ -194,6 +230,10 @@ class QueryTransformer(Transformer):
     def twoway_bind_numeric(self, tree: Tree):
         return self._twoway_binding(tree)
 
+    @v_args(tree=True)
+    def twoway_bind_list(self, tree: Tree):
+        return self._twoway_binding(tree)
+
     def _twoway_binding(self, tree: Tree):
         return DynamicFactor(
             original_range=QueryRange(start_pos=tree.meta.start_pos,
@@ -216,55 +256,237 @@ class QueryTransformer(Transformer):
         )
 
 
+ShapeBlock = List[Union[str, Tuple["ShapeBlock", ...]]]
+
+
 class DynamicQuery():
+    """
+    Compiled two-way sql template.
+
+    `decide` is one generated python function per template. It evaluates
+    each condition of if-blocks only once, and returns the branch key
+    (indexes of selected blocks in order of evaluation) and the values of
+    python expression parameters together.
+    The python expression parameters in not selected blocks are None.
+
+    The sql statement is same for the same branch key, so it is built
+    only once for each branch key and reused. All sql statements can be
+    built beforehand by `shapes()`.
+
+    The arguments of `decide` are bound by name in calling, and not
+    specified arguments are evaluated as None. So a template is compiled
+    only once regardless of which arguments are specified.
+
+    `query_func` and `pydynamic_params` are kept for calling each part
+    separately. They also accept positional arguments in order of
+    `arg_keys`.
+
+    `on_shape` is called with the approximate bytes of each sql statement
+    built newly, for caches limited by bytes.
+    """
+
+    def __init__(self,
+                 decide: Callable[..., Tuple[Tuple[int, ...], Dict[str, Any]]],
+                 shape: ShapeBlock, dynamic_param_names: Tuple[str, ...],
+                 source: str, arg_keys: Tuple[str, ...] = ()):
+
+        self.decide: Callable[
+            ..., Tuple[Tuple[int, ...], Dict[str, Any]]] = decide
+        self.shape: ShapeBlock = shape
+        self.dynamic_param_names: Tuple[str, ...] = dynamic_param_names
+        self.source: str = source
+        self._sql_by_key: Dict[Tuple[int, ...], str] = {}
+        self.on_shape: Optional[Callable[[int], None]] = None
+
+        self.query_func: callable = _render_query_func(self.render, arg_keys)
+        self.pydynamic_params: Dict[str, callable] = {
+            param_name: _render_param_func(self.render, arg_keys, param_name)
+            for param_name in dynamic_param_names
+        }
+
+    def render(self, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns the sql statement and the values of python expression
+        parameters for the arguments.
+        """
+
+        branch_key, params = self.decide(**kwargs)
+        try:
+            return (self._sql_by_key[branch_key], params)
+        except KeyError:
+            return (self.sql_of(branch_key), params)
+
+    def sql_of(self, branch_key: Tuple[int, ...]) -> str:
+        """
+        Returns the sql statement for the branch key.
+        """
+
+        sql: Optional[str] = self._sql_by_key.get(branch_key)
+        if sql is None:
+            texts: List[str] = []
+            _build_shape(self.shape, iter(branch_key), texts)
+            sql = self._add_shape(branch_key, "".join(texts))
+        return sql
+
+    def shapes(self) -> Dict[Tuple[int, ...], str]:
+        """
+        Returns all sql statements of the template keyed by the branch key.
+        The count of statements is the product of the count of blocks in
+        each if-block, so be careful for templates with many if-blocks.
+        """
+
+        for branch_key, sql in _enumerate_shapes(self.shape):
+            if branch_key not in self._sql_by_key:
+                self._add_shape(branch_key, sql)
+        return dict(self._sql_by_key)
+
+    def _add_shape(self, branch_key: Tuple[int, ...], sql: str) -> str:
+        added: str = self._sql_by_key.setdefault(branch_key, sql)
+        if added is sql and self.on_shape is not None:
+            self.on_shape(approximate_size(branch_key, sql))
+        return added
+
+
+def _build_shape(shape: ShapeBlock, branch_key: Iterator[int],
+                 texts: List[str]) -> None:
+
+    for item in shape:
+        if isinstance(item, str):
+            texts.append(item)
+        else:
+            _build_shape(item[next(branch_key)], branch_key, texts)
+
+
+def _enumerate_shapes(shape: ShapeBlock
+                      ) -> List[Tuple[Tuple[int, ...], str]]:
+
+    shapes: List[Tuple[Tuple[int, ...], str]] = [((), "")]
+    for item in shape:
+        if isinstance(item, str):
+            shapes = [(branch_key, sql + item) for branch_key, sql in shapes]
+            continue
 
-    def __init__(self, query_func: callable,
-                 pydynamic_params: Dict[str, callable]):
+        alternatives: List[Tuple[Tuple[int, ...], str]] = [
+            ((index, ) + sub_key, sub_sql)
+            for index, block in enumerate(item)
+            for sub_key, sub_sql in _enumerate_shapes(block)
+        ]
+        shapes = [
+            (branch_key + sub_key, sql + sub_sql)
+            for branch_key, sql in shapes for sub_key, sub_sql in alternatives
+        ]
 
-        self.query_func: callable = query_func
-        self.pydynamic_params: Dict[str, callable] = pydynamic_params
+    return shapes
 
 
-class DynamicParser():
+def _render_query_func(render: Callable, arg_keys: Tuple[str, ...]
+                       ) -> callable:
+    return lambda *args, **kwargs: \
+        render(**dict(zip(arg_keys, args), **kwargs))[0]
 
-    def __init__(self):
-        from pathlib import Path
 
-        self.parser: Lark = Lark.open(
-            Path(__file__).parent / "sql.two_way.lark",
-            start="query_statement",
-            propagate_positions=True,
-            maybe_placeholders=True
-        )
+def _render_param_func(render: Callable, arg_keys: Tuple[str, ...],
+                       param_name: str) -> callable:
+    return lambda *args, **kwargs: \
+        render(**dict(zip(arg_keys, args), **kwargs))[1][param_name]
+
+
+class DynamicParser():
+    """
+    Parser of two-way sql templates by the grammar.
+
+    Compiling the grammar is expensive, so use `DynamicParser.shared()`
+    instead of constructing new parser. The shared parser is constructed
+    at the first call in the process, and used by all TWinSQLA objects.
+    Parsing does not change the state of the parser, so the parser is
+    available from multiple threads.
+
+    Args:
+        parser (Optional[Lark], optional):
+            compiled grammar. If None, the grammar is compiled from
+            grammar files. Defaults to None.
+    """
+
+    _shared: Optional["DynamicParser"] = None
+    _shared_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, parser: Optional[Lark] = None):
+        self.parser: Lark = parser if parser is not None \
+            else _compile_grammar()
         self.transformer: QueryTransformer = QueryTransformer()
 
-    def parse(self, query: str, arg_keys: Tuple[str]) -> DynamicQuery:
+    @classmethod
+    def shared(cls, grammar_cache: Optional[Union[Path, str]] = None
+               ) -> "DynamicParser":
+        """
+        Process-wide parser constructed at the first call.
+
+        Args:
+            grammar_cache (Optional[Union[Path, str]], optional):
+                file path of compiled grammar cache. If the file exists,
+                the compiled grammar is loaded from the file without
+                analyzing grammar files. If not, the compiled grammar is
+                saved to the file. This is used only at the first call.
+                Defaults to None.
+
+        Returns:
+            DynamicParser: shared parser
+        """
+
+        shared: Optional[DynamicParser] = cls._shared
+        if shared is not None:
+            return shared
+
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    _open_grammar_cache(grammar_cache)
+                    if grammar_cache is not None else None
+                )
+            return cls._shared
+
+    def save_grammar(self, file_path: Union[Path, str]) -> None:
+        """
+        Save the compiled grammar to the file for `shared(grammar_cache)`.
+        """
+
+        data, memo = self.parser.memo_serialize([TerminalDef, Rule])
+        grammar_cache: Dict[str, Any] = {
+            "format": GRAMMAR_CACHE_FORMAT,
+            "grammar": grammar_digest(),
+            "lark": lark.__version__,
+            "data": data,
+            "memo": memo
+        }
+        with open(file_path, "wb") as cache_file:
+            pickle.dump(grammar_cache, cache_file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    def parse(self, query: str, arg_keys: Tuple[str, ...] = ()
+              ) -> DynamicQuery:
+        return QueryCompiler(self.analyze(query), arg_keys).compile()
+
+    def analyze(self, query: str) -> List[TwinQuery]:
         try:
-            return self._do_parse(query, arg_keys)
+            return self._do_analyze(query)
         except LarkError as lark_exc:
             raise QueryParseFailedException(
                 f"Failed to parse dynamic query. Detail : {lark_exc}"
             ) from lark_exc
 
-    def _do_parse(self, query: str, arg_keys: Tuple[str]) -> DynamicQuery:
+    def _do_analyze(self, query: str) -> List[TwinQuery]:
 
         root_tree: Tree = self.parser.parse(query)
         dynamic_params: List[TwinFactor] = self._seek_dynamic_params(
             root_tree)
-        parsed_queries: List[TwinQuery] = _parse_query(
-            root_tree, query, dynamic_params)
-
-        dynamic_query, pydynamic_params = _do_build_query(
-            parsed_queries, ", ".join(arg_keys))
-
-        return DynamicQuery(eval(dynamic_query), pydynamic_params)
+        return _parse_query(root_tree, query, dynamic_params)
 
     def _seek_dynamic_params(self, root: Tree) -> List[TwinFactor]:
 
         dynamic_params: List[TwinFactor] = []
         for target_data in (
             "twoway_bind_text", "twoway_bind_bool", "twoway_bind_numeric",
-            "dynamic_if_bool"
+            "twoway_bind_list", "dynamic_if_bool"
         ):
 
             dynamic_trees: List[Tree] = root.find_data(target_data)
@@ -277,6 +499,69 @@ class DynamicParser():
         return dynamic_params
 
 
+def _compile_grammar() -> Lark:
+    return Lark.open(
+        Path(__file__).parent / "sql.two_way.lark",
+        start="query_statement",
+        propagate_positions=True,
+        maybe_placeholders=True
+    )
+
+
+def _open_grammar_cache(file_path: Union[Path, str]) -> Lark:
+    # The cache depends on the internals of lark, so the grammar is compiled
+    # from grammar files whenever the cache is not available.
+    logger = logging.getLogger(__name__)
+    try:
+        return _load_grammar(file_path)
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.warning("Ignored grammar cache '%s'. Detail : %s",
+                       file_path, exc)
+
+    parser: DynamicParser = DynamicParser()
+    try:
+        parser.save_grammar(file_path)
+    except Exception as exc:
+        logger.warning("Failed to save grammar cache '%s'. Detail : %s",
+                       file_path, exc)
+    return parser.parser
+
+
+def _load_grammar(file_path: Union[Path, str]) -> Lark:
+    # `Lark.load()` is not available for earley parser in lark-parser 0.11.
+    # So only the result of grammar analysis (rules and terminals) is
+    # restored, and the earley parser is constructed from them.
+    with open(file_path, "rb") as cache_file:
+        grammar_cache: Dict[str, Any] = pickle.load(cache_file)
+
+    if not isinstance(grammar_cache, dict) \
+            or grammar_cache.get("format") != GRAMMAR_CACHE_FORMAT \
+            or grammar_cache.get("grammar") != grammar_digest() \
+            or grammar_cache.get("lark") != lark.__version__:
+        raise ValueError("created with other version of TWinSQLA or lark.")
+
+    memo = SerializeMemoizer.deserialize(
+        grammar_cache["memo"], {"Rule": Rule, "TerminalDef": TerminalDef}, {})
+    data: Dict[str, Any] = grammar_cache["data"]
+
+    parser: Lark = Lark.__new__(Lark)
+    parser.options = LarkOptions.deserialize(dict(data["options"]), memo)
+    parser.rules = [Rule.deserialize(rule, memo) for rule in data["rules"]]
+    parser.source_path = str(file_path)
+    parser.lexer_conf = parser._deserialize_lexer_conf(
+        data["parser"], memo, parser.options)
+    parser.terminals = parser.lexer_conf.terminals
+    parser._terminals_dict = {
+        terminal.name: terminal for terminal in parser.terminals}
+    parser.parser = parser._build_parser()
+
+    # Verify the restored parser, not to fail at parsing templates.
+    parser.parse(_GRAMMAR_CACHE_PROBE)
+    return parser
+
+
 def _parse_query(
     tree: Tree, query: str, dynamic_params: List[TwinFactor]
 ) -> List[TwinQuery]:
@@ -307,78 +592,216 @@ def _parse_query(
     return build_queries
 
 
-def _do_build_query(
-    parsed_queries: List[TwinQuery], func_arguments: str,
-    current_params: Optional[Dict[str, callable]] = None,
-    current_condition: Optional[str] = None
-) -> Tuple[str, Dict[str, callable]]:
-
-    pydynamic_params: Dict[str, callable] = current_params \
-        if current_params else {}
+class QueryCompiler():
+    """
+    Code generator from parsed two-way sql to one python function.
+
+    For example, the following template
+        SELECT * FROM staff WHERE
+            /*%if min_age */ age >= /* min_age */0 /*%else*/ OR TRUE /*%end*/
+    is compiled to the following function,
+        def _twinsqla_decide(*, min_age=None, **_twinsqla_unused):
+            _twinsqla_params = {'pydynamic_param0': None}
+            _twinsqla_key = []
+            _twinsqla_branch = _twinsqla_key.append
+            if (min_age):
+                _twinsqla_branch(0)
+                _twinsqla_params['pydynamic_param0'] = (min_age)
+            else:
+                _twinsqla_branch(1)
+            return tuple(_twinsqla_key), _twinsqla_params
+    and the following shape of sql statements.
+        ['SELECT * FROM staff WHERE\n    ',
+         (['age >= :pydynamic_param0'], ['TRUE'])]
+    """
+
+    _FUNCTION_NAME: str = "_twinsqla_decide"
+    _INDENT: str = "    "
+
+    def __init__(self, parsed_queries: List[TwinQuery],
+                 arg_keys: Tuple[str, ...] = ()):
+
+        self.parsed_queries: List[TwinQuery] = parsed_queries
+        self.arg_keys: Tuple[str, ...] = arg_keys
+        self._param_names: List[str] = []
+
+    def compile(self) -> DynamicQuery:
+        shape: ShapeBlock = []
+        source: str = self.generate(shape)
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, "<twinsqla template>", "exec"), namespace)
+
+        return DynamicQuery(namespace[self._FUNCTION_NAME], shape,
+                            tuple(self._param_names), source, self.arg_keys)
+
+    def generate(self, shape: Optional[ShapeBlock] = None) -> str:
+        """
+        Returns the source of the generated function.
+        If `shape` is specified, the shape of sql statements is added to it.
+        """
+
+        self._param_names = []
+        target_shape: ShapeBlock = shape if shape is not None else []
+        header: str = f"def {self._FUNCTION_NAME}({self._arguments()}):"
+
+        if not any(isinstance(parsed_query, AlternativeQuery)
+                   for parsed_query in self.parsed_queries):
+            # Without if-blocks, the sql statement is always same.
+            params: List[str] = []
+            target_shape.append(self._generate_queries(
+                self.parsed_queries,
+                lambda param_name, python_expr: params.append(
+                    f"{repr(param_name)}: ({python_expr})")
+            ))
+            return "\n".join([
+                header,
+                f"{self._INDENT}return (), {{{', '.join(params)}}}",
+                ""
+            ])
+
+        body: List[str] = []
+        self._generate_block(self.parsed_queries, body, target_shape, 1)
+        initial_params: str = ", ".join(
+            f"{repr(param_name)}: None" for param_name in self._param_names)
+
+        return "\n".join([
+            header,
+            f"{self._INDENT}_twinsqla_params = {{{initial_params}}}",
+            f"{self._INDENT}_twinsqla_key = []",
+            f"{self._INDENT}_twinsqla_branch = _twinsqla_key.append",
+            *body,
+            f"{self._INDENT}return tuple(_twinsqla_key), _twinsqla_params",
+            ""
+        ])
+
+    def _arguments(self) -> str:
+        # All names in python expressions are keyword arguments.
+        # Names of arguments default to None even if they are same as
+        # builtins (such as `id`), and other names of builtins default to
+        # themselves.
+        arguments: List[str] = [
+            f"{name}={name}"
+            if name not in self.arg_keys and hasattr(builtins, name)
+            else f"{name}=None"
+            for name in _collect_names(self.parsed_queries)
+            if not name.startswith("_twinsqla_")
+        ]
+        keyword_only: List[str] = ["*"] if arguments else []
+        return ", ".join(keyword_only + arguments + ["**_twinsqla_unused"])
 
-    dynamic_queries: List[str] = []
-    for index, parsed_query in enumerate(parsed_queries):
-        if isinstance(parsed_query, StaticQuery):
-            dynamic_queries.append(f"{repr(parsed_queries[index].query)}")
-            continue
+    def _generate_block(self, parsed_queries: List[TwinQuery],
+                        lines: List[str], shape: ShapeBlock,
+                        depth: int) -> None:
 
-        if isinstance(parsed_query, PythonExprQuery):
-            # append python evaluation to bind_params
-            dynamic_param: str = f"pydynamic_param{len(pydynamic_params)}"
-            dynamic_queries.append(f'":{dynamic_param}"')
-            param_condition: str = f" if ({current_condition}) else None" \
-                if current_condition else ""
+        indent: str = self._INDENT * depth
 
-            pydynamic_params[dynamic_param] = eval(
-                f"lambda {func_arguments}:"
-                f"(({parsed_query.python_expr}){param_condition})"
+        def _assign_param(param_name: str, python_expr: str) -> None:
+            lines.append(
+                f"{indent}_twinsqla_params[{repr(param_name)}]"
+                f" = ({python_expr})"
             )
-            continue
 
-        if isinstance(parsed_query, AlternativeQuery):
-            dynamic_sub_query, updated_params = _do_build_for_alternative(
-                parsed_query.alternatives, func_arguments, pydynamic_params,
-                current_condition)
-            dynamic_queries.append(dynamic_sub_query)
-            pydynamic_params = updated_params
-            continue
-
-        # TODO
-        raise Exception("Not implemented.")
-
-    return (
-        f"""(lambda {func_arguments}:( {' + '.join(dynamic_queries)} ))""",
-        pydynamic_params
-    )
-
-
-def _do_build_for_alternative(
-    alternatives: List[Tuple[str, List[TwinQuery]]],
-    func_arguments: str, current_params: Dict[str, callable],
-    current_condition: Optional[str] = None
-) -> Tuple[str, Dict[str, callable]]:
+        pending: List[str] = []
+        for parsed_query in parsed_queries:
+            if isinstance(parsed_query, AlternativeQuery):
+                if "".join(pending):
+                    shape.append("".join(pending))
+                pending = []
+                self._generate_alternatives(
+                    parsed_query.alternatives, lines, shape, depth)
+                continue
+
+            pending.append(
+                self._generate_queries([parsed_query], _assign_param))
+
+        if "".join(pending):
+            shape.append("".join(pending))
+
+    def _generate_alternatives(
+        self, alternatives: List[Tuple[str, List[TwinQuery]]],
+        lines: List[str], shape: ShapeBlock, depth: int
+    ) -> None:
+
+        indent: str = self._INDENT * depth
+        blocks: List[ShapeBlock] = []
+        has_else: bool = False
+        for index, (condition, sub_queries) in enumerate(alternatives):
+            if index > 0 and index == len(alternatives) - 1 \
+                    and condition == "True":
+                lines.append(f"{indent}else:")
+                has_else = True
+            else:
+                keyword: str = "if" if index == 0 else "elif"
+                lines.append(f"{indent}{keyword} ({condition}):")
+
+            block: ShapeBlock = []
+            lines.append(f"{indent}{self._INDENT}_twinsqla_branch({index})")
+            self._generate_block(sub_queries, lines, block, depth + 1)
+            blocks.append(block)
+
+        if not has_else:
+            # When no blocks are selected, the if-block is replaced
+            # to 'FALSE' to keep the sql statement valid.
+            lines.append(f"{indent}else:")
+            lines.append(
+                f"{indent}{self._INDENT}_twinsqla_branch({len(blocks)})")
+            blocks.append(["FALSE"])
+
+        shape.append(tuple(blocks))
+
+    def _generate_queries(
+        self, parsed_queries: List[TwinQuery],
+        on_param: Callable[[str, str], None]
+    ) -> str:
+        """
+        Returns sql text of static queries and python expression parameters.
+        Each python expression parameter is notified to `on_param` with
+        the parameter name and the python expression.
+        """
+
+        texts: List[str] = []
+        for parsed_query in parsed_queries:
+            if isinstance(parsed_query, StaticQuery):
+                texts.append(parsed_query.query)
+                continue
+
+            if isinstance(parsed_query, PythonExprQuery):
+                param_name: str = \
+                    f"pydynamic_param{len(self._param_names)}"
+                self._param_names.append(param_name)
+                texts.append(f":{param_name}")
+                on_param(param_name, parsed_query.python_expr)
+                continue
 
-    if len(alternatives) == 0:
-        return ("'FALSE'", current_params)
+            raise QueryParseFailedException(
+                f"Unexpected query component : {parsed_query}")
 
-    condition, sub_queries = alternatives[0]
+        return "".join(texts)
 
-    else_condition: str = \
-        f"({current_condition} and (not bool({condition})))" \
-        if current_condition else f"(not bool({condition}))"
-    later_sub_query, pydynamic_params = _do_build_for_alternative(
-        alternatives[1:], func_arguments, current_params, else_condition
-    )
 
-    sub_condition: str = f"bool({condition}) and {current_condition}" \
-        if current_condition else f"bool({condition})"
-    sub_expr, updated_params = _do_build_query(
-        sub_queries, func_arguments, pydynamic_params, sub_condition)
+def _collect_names(parsed_queries: List[TwinQuery]) -> List[str]:
+    names: Dict[str, None] = OrderedDict()
 
-    sub_query = (
-        "("
-        f"{sub_expr}({func_arguments})"
-        f" if bool({condition}) else {later_sub_query}"
-        ")"
-    )
-    return (sub_query, updated_params)
+    def _collect_expr(python_expr: str) -> None:
+        try:
+            tree: ast.AST = ast.parse(python_expr.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise QueryParseFailedException(
+                f"Invalid python expression '{python_expr}'. Detail : {exc}"
+            ) from exc
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                names[node.id] = None
+
+    def _collect(queries: List[TwinQuery]) -> None:
+        for parsed_query in queries:
+            if isinstance(parsed_query, PythonExprQuery):
+                _collect_expr(parsed_query.python_expr)
+            elif isinstance(parsed_query, AlternativeQuery):
+                for condition, sub_queries in parsed_query.alternatives:
+                    _collect_expr(condition)
+                    _collect(sub_queries)
+
+    _collect(parsed_queries)
+    return list(names)
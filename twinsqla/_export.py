@@ -0,0 +1,302 @@
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple, Union
+from abc import ABCMeta, abstractmethod
+from pathlib import Path
+import csv
+import datetime
+import decimal
+import json
+import queue
+import threading
+import uuid
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pyarrow is an optional extra.
+    pyarrow = None
+
+from ._support import description
+from . import exceptions
+
+
+# Count of rows fetched by each `fetchmany()` in exporting.
+DEFAULT_EXPORT_BATCH_SIZE: int = 10000
+
+# Count of batches waiting for the writer thread.
+DEFAULT_EXPORT_QUEUE_SIZE: int = 4
+
+# Max count of batches held back to infer the Arrow types of columns
+# which are NULL in all rows of the batches.
+ARROW_PENDING_BATCHES: int = 8
+
+# Marker of the end of batches.
+_END: object = object()
+
+Destination = Union[str, Path, IO]
+
+
+@description(("format_name", "keys"))
+class ExportSink(metaclass=ABCMeta):
+    """
+    Base class of writers of batches of rows.
+
+    Args:
+        format_name (str): name of the format
+        keys (Tuple[str, ...]): column names
+    """
+
+    binary: bool = False
+
+    def __init__(self, format_name: str, keys: Tuple[str, ...]):
+        self.format_name: str = format_name
+        self.keys: Tuple[str, ...] = keys
+
+    def open(self, stream: IO) -> None:
+        self.stream: IO = stream
+
+    @abstractmethod
+    def write(self, rows: List[Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class CsvSink(ExportSink):
+    def __init__(self, keys: Tuple[str, ...], header: bool = True,
+                 **fmtparams):
+        super().__init__("csv", keys)
+        self.header: bool = header
+        self.fmtparams: Dict[str, Any] = fmtparams
+
+    def open(self, stream: IO) -> None:
+        super().open(stream)
+        self.writer = csv.writer(stream, **self.fmtparams)
+        if self.header:
+            self.writer.writerow(self.keys)
+
+    def write(self, rows: List[Any]) -> None:
+        self.writer.writerows(rows)
+
+
+class JsonLinesSink(ExportSink):
+    def __init__(self, keys: Tuple[str, ...]):
+        super().__init__("ndjson", keys)
+        self.encoder: json.JSONEncoder = json.JSONEncoder(
+            ensure_ascii=False, default=_json_default)
+
+    def write(self, rows: List[Any]) -> None:
+        keys: Tuple[str, ...] = self.keys
+        encode: Callable[[Any], str] = self.encoder.encode
+        self.stream.write("".join([
+            encode(dict(zip(keys, row))) + "\n" for row in rows]))
+
+
+class ArrowSink(ExportSink):
+    """
+    Writer of Arrow IPC stream.
+
+    The schema of the stream is fixed by the first written batch.
+    Without `schema`, the types are inferred by PyArrow. Batches are held
+    back (at most `ARROW_PENDING_BATCHES`) while some columns are NULL in
+    all rows, and the type of each column is unified from the batches:
+    integers and floats are unified to float64. Later batches are cast to
+    the schema without loss, or raise `TWinSQLAException`. In that case,
+    specify `schema`.
+    """
+
+    binary: bool = True
+
+    def __init__(self, keys: Tuple[str, ...], schema: Optional[Any] = None):
+        if pyarrow is None:
+            raise ImportError(
+                "PyArrow is required for exporting to Arrow IPC."
+                " Install it by 'pip install twinsqla[arrow]'."
+            )
+
+        super().__init__("arrow", keys)
+        self.schema: Optional[Any] = schema
+        self.inferred: bool = schema is None
+        self.writer: Optional[Any] = None
+        self._pending: List[list] = []
+
+    def write(self, rows: List[Any]) -> None:
+        columns: List[tuple] = list(zip(*rows))
+        if not self.inferred:
+            self._writer().write_batch(pyarrow.RecordBatch.from_arrays([
+                pyarrow.array(column, type=field.type)
+                for column, field in zip(columns, self.schema)
+            ], schema=self.schema))
+            return
+
+        arrays: list = [pyarrow.array(column) for column in columns]
+        if self.schema is not None:
+            self._write_arrays(arrays)
+            return
+
+        self._pending.append(arrays)
+        types: List[Any] = _unified_types(self.keys, self._pending)
+        if len(self._pending) >= ARROW_PENDING_BATCHES \
+                or not any(pyarrow.types.is_null(type_) for type_ in types):
+            self._flush(types)
+
+    def close(self) -> None:
+        if self._pending:
+            self._flush(_unified_types(self.keys, self._pending))
+        self._writer().close()
+
+    def _flush(self, types: List[Any]) -> None:
+        self.schema = pyarrow.schema(list(zip(self.keys, types)))
+        pending: List[list] = self._pending
+        self._pending = []
+        for arrays in pending:
+            self._write_arrays(arrays)
+
+    def _write_arrays(self, arrays: list) -> None:
+        casted: list = []
+        for array, field in zip(arrays, self.schema):
+            try:
+                casted.append(array if array.type == field.type
+                              else array.cast(field.type))
+            except pyarrow.ArrowException as exc:
+                raise exceptions.TWinSQLAException(
+                    f"Values of column '{field.name}' are not converted"
+                    f" to {field.type} inferred from the previous rows."
+                    f" Specify 'schema' to export. Detail : {exc}"
+                ) from exc
+
+        self._writer().write_batch(
+            pyarrow.RecordBatch.from_arrays(casted, schema=self.schema))
+
+    def _writer(self) -> Any:
+        if self.writer is None:
+            if self.schema is None:
+                # No rows are exported.
+                self.schema = pyarrow.schema([
+                    (key, pyarrow.null()) for key in self.keys])
+            self.writer = pyarrow.ipc.new_stream(self.stream, self.schema)
+        return self.writer
+
+
+def _unified_types(keys: Tuple[str, ...], batches: List[list]
+                   ) -> List[Any]:
+    unified: List[Any] = []
+    for index, key in enumerate(keys):
+        types: List[Any] = []
+        for arrays in batches:
+            type_: Any = arrays[index].type
+            if not pyarrow.types.is_null(type_) and type_ not in types:
+                types.append(type_)
+
+        if not types:
+            unified.append(pyarrow.null())
+        elif len(types) == 1:
+            unified.append(types[0])
+        elif all(pyarrow.types.is_integer(type_) for type_ in types):
+            unified.append(pyarrow.int64())
+        elif all(pyarrow.types.is_integer(type_)
+                 or pyarrow.types.is_floating(type_) for type_ in types):
+            unified.append(pyarrow.float64())
+        else:
+            raise exceptions.TWinSQLAException(
+                f"Types of column '{key}' are not unified from"
+                f" {[str(type_) for type_ in types]}."
+                " Specify 'schema' to export.")
+
+    return unified
+
+
+def export_result(result, sink: ExportSink, destination: Destination, *,
+                  batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                  queue_size: int = DEFAULT_EXPORT_QUEUE_SIZE) -> int:
+    """
+    Export all remaining rows of the result to the destination.
+
+    The rows are fetched by `fetchmany()` in the calling thread, and
+    written by a background thread, so fetching and writing overlap.
+    At most `queue_size` batches wait for writing, so the memory is
+    limited regardless of the count of results.
+
+    Args:
+        result: result of sqlalchemy
+        sink (ExportSink): writer of the format
+        destination (Destination): file path or file object
+        batch_size (int, optional):
+            count of rows fetched at once. Defaults to 10000.
+        queue_size (int, optional):
+            count of batches waiting for writing. Defaults to 4.
+
+    Returns:
+        int: count of exported rows
+    """
+
+    if isinstance(destination, (str, Path)):
+        with _open(destination, sink.binary) as stream:
+            return _export(result, sink, stream, batch_size, queue_size)
+    return _export(result, sink, destination, batch_size, queue_size)
+
+
+def _open(path: Union[str, Path], binary: bool) -> IO:
+    if binary:
+        return open(path, "wb")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _export(result, sink: ExportSink, stream: IO, batch_size: int,
+            queue_size: int) -> int:
+
+    batches: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+    writer: _WriterThread = _WriterThread(sink, stream, batches)
+    writer.start()
+
+    count: int = 0
+    try:
+        while writer.error is None:
+            rows: list = result.fetchmany(batch_size)
+            if not rows:
+                break
+            batches.put(rows)
+            count += len(rows)
+    finally:
+        batches.put(_END)
+        writer.join()
+        result.close()
+
+    if writer.error is not None:
+        raise writer.error
+    return count
+
+
+class _WriterThread(threading.Thread):
+    def __init__(self, sink: ExportSink, stream: IO, batches: queue.Queue):
+        super().__init__(name="twinsqla-export", daemon=True)
+        self.sink: ExportSink = sink
+        self.stream: IO = stream
+        self.batches: queue.Queue = batches
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            self.sink.open(self.stream)
+            batch: Any = self.batches.get()
+            while batch is not _END:
+                self.sink.write(batch)
+                batch = self.batches.get()
+            self.sink.close()
+        except BaseException as exc:
+            self.error = exc
+            # Consume batches not to block the fetching thread.
+            while self.batches.get() is not _END:
+                pass
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(
+            type(value).__name__))
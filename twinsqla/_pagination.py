@@ -0,0 +1,258 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import re
+
+from ._support import description
+from ._cache import LRUCache
+from ._querybindbuilder import PreparedQuery, STATEMENT_CACHE_SIZE
+from . import exceptions
+
+
+# Count of rows of each page in default.
+DEFAULT_PAGE_SIZE: int = 1000
+
+# Dialects with row value comparison "(a, b) > (1, 2)".
+ROW_COMPARISON_DIALECTS: Tuple[str, ...] = (
+    "postgresql", "mysql", "mariadb", "sqlite")
+
+# Dialects with "LIMIT n". Other dialects use "FETCH FIRST n ROWS ONLY".
+LIMIT_DIALECTS: Tuple[str, ...] = ("postgresql", "mysql", "mariadb", "sqlite")
+
+# Prefix of bind parameters of the keys of the last row.
+KEY_PARAMETER_PREFIX: str = "twinsqla_last_"
+
+_PATTERN_STATEMENT_END = re.compile(r"[\s;]+\Z")
+
+_PATTERN_QUOTED = re.compile(r'"[^"]*"|`[^`]*`|\[[^\]]*\]')
+
+
+@description(("columns", "page_size", "new_connection"))
+class keyset:
+    """
+    Keyset pagination of select query.
+
+    The query is executed for each page, wrapped by the condition that
+    the keys are greater than the keys of the last row in the previous
+    page, ordered by the keys and limited by `page_size`.
+    So each page is as fast as the first page, unlike OFFSET.
+
+    Args:
+        columns (str): column names of the keys in the results.
+            The keys need to be unique and not NULL. The names are not
+            qualified by table names (e.g. "id", not "t.id"), because
+            the query is wrapped as a subquery.
+        page_size (int, optional):
+            count of rows of each page. Defaults to 1000.
+        new_connection (bool, optional):
+            If True, each page is executed by a connection checked out
+            from the pool and returned after the page, so no connection
+            is held between pages. If False, all pages are executed by
+            one connection. (In transaction of TWinSQLA, all pages are
+            executed in the transaction.) Defaults to True.
+    """
+
+    page_cache: LRUCache = LRUCache(maxsize=STATEMENT_CACHE_SIZE)
+
+    def __init__(self, *columns: str, page_size: int = DEFAULT_PAGE_SIZE,
+                 new_connection: bool = True):
+
+        if not columns:
+            raise ValueError("At least one key column is required.")
+        if page_size <= 0:
+            raise ValueError("'page_size' must be positive.")
+
+        qualified: List[str] = [
+            column for column in columns
+            if "." in _PATTERN_QUOTED.sub("", column)]
+        if qualified:
+            raise exceptions.TWinSQLAException(
+                "Key columns {} must not be qualified by table names. "
+                "Use the column names in the results.".format(qualified))
+
+        self.columns: Tuple[str, ...] = columns
+        self.page_size: int = page_size
+        self.new_connection: bool = new_connection
+
+    def page_query(self, prepared: PreparedQuery, dialect_name: str,
+                   last_key: Optional[tuple] = None) -> PreparedQuery:
+        """
+        Query of the page after `last_key`. If `last_key` is None,
+        query of the first page.
+        """
+
+        page_sql: str = self.page_cache.get(
+            (prepared.prepared_sql, self.columns, self.page_size,
+             dialect_name, last_key is not None),
+            _render_page)
+        if last_key is None:
+            return PreparedQuery(page_sql, prepared.parameters)
+
+        parameters: Dict[str, Any] = dict(prepared.parameters)
+        parameters.update(
+            (KEY_PARAMETER_PREFIX + str(index), value)
+            for index, value in enumerate(last_key)
+        )
+        return PreparedQuery(page_sql, parameters)
+
+
+class PagedResult:
+    """
+    Result of all pages of keyset pagination.
+
+    This object has the same methods as the result of sqlalchemy
+    used in TWinSQLA (`keys()`, `fetchone()`, `fetchmany()`, iteration,
+    and so on), and the rows of all pages are returned continuously.
+    The next page is executed when all rows of the current page are
+    fetched.
+
+    Args:
+        pagination (keyset): pagination
+        execute_page (Callable[[Optional[tuple]], Any]):
+            function executing the page after the keys
+        on_close (Optional[Callable[[], None]], optional):
+            function called when this object is closed. Defaults to None.
+    """
+
+    def __init__(self, pagination: keyset,
+                 execute_page: Callable[[Optional[tuple]], Any],
+                 on_close: Optional[Callable[[], None]] = None):
+
+        self.pagination: keyset = pagination
+        self.closed: bool = False
+        self._execute_page: Callable[[Optional[tuple]], Any] = execute_page
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+        self._page: Optional[Any] = None
+        self._page_rows: int = 0
+        self._last_row: Optional[Any] = None
+        try:
+            self._page = execute_page(None)
+            self.returns_rows: bool = self._page.returns_rows
+            self._keys: Tuple[str, ...] = tuple(self._page.keys()) \
+                if self.returns_rows else ()
+            self._key_indexes: Tuple[int, ...] = _key_indexes(
+                self._keys, pagination.columns)
+        except BaseException:
+            self.close()
+            raise
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def fetchmany(self, size: int) -> list:
+        rows: list = []
+        while len(rows) < size and self._page is not None:
+            fetched: list = self._page.fetchmany(size - len(rows))
+            if not fetched:
+                self._next_page()
+                continue
+
+            rows.extend(fetched)
+            self._page_rows += len(fetched)
+            self._last_row = fetched[-1]
+        return rows
+
+    def fetchone(self) -> Optional[Any]:
+        rows: list = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchall(self) -> list:
+        rows: list = []
+        fetched: list = self.fetchmany(self.pagination.page_size)
+        while fetched:
+            rows.extend(fetched)
+            fetched = self.fetchmany(self.pagination.page_size)
+        return rows
+
+    def __iter__(self):
+        rows: list = self.fetchmany(self.pagination.page_size)
+        while rows:
+            for row in rows:
+                yield row
+            rows = self.fetchmany(self.pagination.page_size)
+
+    def close(self) -> None:
+        if self._page is not None:
+            self._page.close()
+            self._page = None
+        if not self.closed:
+            self.closed = True
+            if self._on_close is not None:
+                self._on_close()
+
+    def _next_page(self) -> None:
+        self._page.close()
+        if self._page_rows < self.pagination.page_size:
+            # The last page.
+            self.close()
+            return
+
+        last_key: tuple = tuple(
+            self._last_row[index] for index in self._key_indexes)
+        self._page = None
+        self._page_rows = 0
+        self._page = self._execute_page(last_key)
+
+
+def _key_indexes(keys: Tuple[str, ...], columns: Tuple[str, ...]
+                 ) -> Tuple[int, ...]:
+
+    lower_keys: List[str] = [key.lower() for key in keys]
+    missing: List[str] = [
+        column for column in columns
+        if _unquoted(column).lower() not in lower_keys]
+    if missing:
+        raise exceptions.TWinSQLAException(
+            "Key columns {} are not found in the results {}.".format(
+                missing, list(keys)))
+
+    return tuple(
+        lower_keys.index(_unquoted(column).lower()) for column in columns)
+
+
+def _unquoted(column: str) -> str:
+    return column.strip("\"`[]")
+
+
+def _render_page(key: tuple) -> str:
+    sql, columns, page_size, dialect_name, after = key
+
+    lines: List[str] = [
+        "SELECT * FROM (",
+        _PATTERN_STATEMENT_END.sub("", sql),
+        ") twinsqla_page"
+    ]
+    if after:
+        lines.append("WHERE " + _render_after(columns, dialect_name))
+    lines.append("ORDER BY " + ", ".join(columns))
+    lines.append(_render_limit(page_size, dialect_name))
+    return "\n".join(lines)
+
+
+def _render_after(columns: Tuple[str, ...], dialect_name: str) -> str:
+    params: List[str] = [
+        ":" + KEY_PARAMETER_PREFIX + str(index)
+        for index in range(len(columns))
+    ]
+    if len(columns) == 1:
+        return "{} > {}".format(columns[0], params[0])
+
+    if dialect_name in ROW_COMPARISON_DIALECTS:
+        return "({}) > ({})".format(", ".join(columns), ", ".join(params))
+
+    # (a > :a) OR (a = :a AND b > :b) OR ...
+    return " OR ".join(
+        "({})".format(" AND ".join(
+            ["{} = {}".format(column, param) for column, param
+             in zip(columns[:position], params[:position])]
+            + ["{} > {}".format(columns[position], params[position])]
+        ))
+        for position in range(len(columns))
+    )
+
+
+def _render_limit(page_size: int, dialect_name: str) -> str:
+    if dialect_name in LIMIT_DIALECTS:
+        return "LIMIT {}".format(page_size)
+    if dialect_name == "mssql":
+        return "OFFSET 0 ROWS FETCH NEXT {} ROWS ONLY".format(page_size)
+    return "FETCH FIRST {} ROWS ONLY".format(page_size)
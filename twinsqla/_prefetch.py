@@ -0,0 +1,114 @@
+from typing import Any, Callable, List, Optional
+import queue
+import threading
+
+from ._support import description
+
+
+# Seconds to wait before checking whether the prefetcher is closed.
+_POLL_INTERVAL: float = 0.1
+
+# Marker of the end of batches.
+_END: object = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error: BaseException = error
+
+
+@description(("fetch_size", "depth"))
+class Prefetcher:
+    """
+    Background thread fetching and converting the next batches of rows,
+    while the caller processes the current batch.
+
+    At most `depth` converted batches wait in the queue. The thread is
+    stopped by `close()`, and the result is not used by the thread after
+    `close()` returns.
+
+    Args:
+        result: result of sqlalchemy
+        mapper (Callable[[Any], Any]): function converting a row
+        fetch_size (int): count of rows fetched at once
+        depth (int): count of batches read ahead
+    """
+
+    def __init__(self, result, mapper: Callable[[Any], Any],
+                 fetch_size: int, depth: int):
+
+        self.result = result
+        self.mapper: Callable[[Any], Any] = mapper
+        self.fetch_size: int = fetch_size
+        self.depth: int = depth
+        self.finished: bool = False
+
+        self._batches: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+        self._stopped: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name="twinsqla-prefetch", daemon=True)
+        self._thread.start()
+
+    def next_batch(self) -> List[Any]:
+        """
+        Next converted batch. If all rows are fetched, returns empty list.
+        Errors occurred in fetching are raised here.
+        """
+
+        if self.finished:
+            return []
+
+        item: Any = self._batches.get()
+        if item is _END:
+            self.finished = True
+            return []
+        if isinstance(item, _Failure):
+            self.finished = True
+            raise item.error
+        return item
+
+    def close(self) -> None:
+        """
+        Stop the thread and wait for the fetching in progress.
+        """
+
+        self.finished = True
+        self._stopped.set()
+        if self._thread.is_alive() \
+                and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                rows: list = self.result.fetchmany(self.fetch_size)
+                if not rows:
+                    break
+                if not self._put(list(map(self.mapper, rows))):
+                    return
+        except BaseException as exc:
+            self._put(_Failure(exc))
+            return
+
+        self._put(_END)
+
+    def _put(self, item: Any) -> bool:
+        # Not to block forever after the caller stops reading.
+        while not self._stopped.is_set():
+            try:
+                self._batches.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+def start_prefetch(result, mapper: Optional[Callable[[Any], Any]],
+                   fetch_size: int, depth: int) -> Optional[Prefetcher]:
+    """
+    Start `Prefetcher` if the result returns rows and `depth` is positive.
+    """
+
+    if depth <= 0 or mapper is None or not result.returns_rows:
+        return None
+    return Prefetcher(result, mapper, fetch_size, depth)
@@ -1,61 +1,318 @@
-from typing import Any, Optional, Union, List, Tuple
+from typing import Any, Optional, Union, List, Tuple, Dict, Sequence
 from abc import ABCMeta, abstractmethod
+import csv
+import datetime
+import decimal
+import io
+import json
 
 import sqlalchemy
 
 from ._support import description
+from ._cache import LRUCache
 from ._dynamic_parser import DynamicQuery
-from ._sqlbuilder import SqlBuilder
+from ._sqlbuilder import SqlBuilder, TemplateParser
+from ._tableplan import entity_values
 from . import exceptions
 
 
+STATEMENT_CACHE_SIZE: int = 512
+
+# Max count of bind parameters in one statement for each dialect.
+PARAMETER_LIMITS: Dict[str, int] = {
+    "sqlite": 999,
+    "mssql": 2100,
+    "postgresql": 32767,
+    "mysql": 65535,
+    "mariadb": 65535,
+    "oracle": 65535
+}
+DEFAULT_PARAMETER_LIMIT: int = 999
+
+# Max count of rows in one statement of bulk operations.
+BULK_MAX_ROWS: int = 1000
+
+# Dialects with row value constructors "(a, b) IN ((1, 2), (3, 4))".
+ROW_VALUE_DIALECTS: Tuple[str, ...] = (
+    "postgresql", "mysql", "mariadb", "sqlite", "oracle")
+
+# Dialects with "UPDATE ... FROM (VALUES ...)".
+UPDATE_FROM_VALUES_DIALECTS: Tuple[str, ...] = ("postgresql", )
+
+# Clauses of insert-or-update for each dialect.
+UPSERT_DIALECTS: Tuple[str, ...] = ("postgresql", "sqlite", "mysql", "mariadb")
+
+# Drivers with "COPY ... FROM STDIN" available in `bulk="copy"`.
+COPY_DRIVERS: Tuple[str, ...] = ("psycopg2", "psycopg2cffi")
+
+
 class PreparedQuery:
+    """
+    Query statement and bind parameters to execute.
+
+    `TextClause` objects are cached by the rendered sql statement
+    in `statement_cache` shared across all threads.
+    So the same statement is not scanned again for its bind parameters,
+    and SQLAlchemy can reuse the compiled form of the same object.
+    """
+
+    statement_cache: LRUCache = LRUCache(maxsize=STATEMENT_CACHE_SIZE)
 
     def __init__(self, prepared_sql: Union[str, DynamicQuery],
-                 parameters: Union[dict, List[dict]]):
+                 parameters: Union[dict, List[dict]],
+                 argument_names: Tuple[str, ...] = ()):
 
         if (isinstance(parameters, list)
                 and isinstance(prepared_sql, DynamicQuery)):
             raise ValueError("Unexpected arguments pair.")
 
-        self.prepared_sql: str = self._init_prepared_sql(
-            prepared_sql, parameters)
-        self.parameters: Union[dict, List[dict]] = self._init_bind_param(
-            prepared_sql, parameters)
+        self.prepared_sql: str
+        self.parameters: Union[dict, List[dict]]
+        self.prepared_sql, self.parameters = self._render(
+            prepared_sql, parameters, argument_names)
 
     @classmethod
-    def _init_prepared_sql(cls, prepared: Union[str, DynamicQuery],
-                           parameters: Union[dict, List[dict]]) -> str:
+    def _render(cls, prepared: Union[str, DynamicQuery],
+                parameters: Union[dict, List[dict]],
+                argument_names: Tuple[str, ...] = ()
+                ) -> Tuple[str, Union[dict, List[dict]]]:
 
         if isinstance(prepared, str):
-            return prepared
+            return (prepared, parameters)
 
         # When prepared object is not instance of string,
         # then parameters object must be instance of dict not list.
-        return prepared.query_func(**parameters)
+        # Arguments omitted or None are evaluated as None in the template,
+        # even if the names are same as builtins.
+        arguments: dict = dict.fromkeys(argument_names)
+        arguments.update(parameters)
+        query, dynamic_params = prepared.render(**arguments)
+        return (query, dict(parameters, **dynamic_params))
+
+    def statement(self) -> sqlalchemy.sql.text:
+        return self.statement_cache.get(self.prepared_sql, sqlalchemy.sql.text)
 
     @classmethod
-    def _init_bind_param(cls, prepared: Union[str, DynamicQuery],
-                         parameters: Union[dict, List[dict]]
-                         ) -> Union[dict, List[dict]]:
+    def prepare_statements(cls, prepared: Union[str, DynamicQuery]) -> int:
+        """
+        Cache `TextClause` objects of all sql statements of the query
+        beforehand, and returns the count of the statements.
+        """
+
+        statements: List[str] = [prepared] if isinstance(prepared, str) \
+            else list(prepared.shapes().values())
+        for statement in statements:
+            cls.statement_cache.get(statement, sqlalchemy.sql.text)
+        return len(statements)
 
-        if isinstance(prepared, str):
-            return parameters
+    def bind_params(self) -> Union[dict, List[dict]]:
+        return self.parameters
 
-        # When prepared object is not instance of string,
-        # then parameters object must be instance of dict not list.
-        dynamic_params: dict = {
-            key: param(**parameters)
-            for key, param in prepared.pydynamic_params.items()
-        }
 
-        return dict(parameters, **dynamic_params)
+@description("queries")
+class PreparedBatch:
+    """
+    Multiple queries executed in order in one transaction.
+    The result of the last query is returned.
 
-    def statement(self) -> sqlalchemy.sql.text:
-        return sqlalchemy.sql.text(self.prepared_sql)
+    Args:
+        queries (List[Union[PreparedQuery, PreparedCopy]]):
+            queries to execute
+    """
 
-    def bind_params(self) -> Union[dict, List[dict]]:
-        return self.parameters
+    def __init__(self, queries: List[Union[PreparedQuery, "PreparedCopy"]]):
+        self.queries: List[Union[PreparedQuery, PreparedCopy]] = queries
+
+
+@description(("table_name", "columns"))
+class PreparedCopy:
+    """
+    Rows inserted by "COPY ... FROM STDIN" statement of PostgreSQL.
+    The rows are sent to the database as CSV text in memory.
+
+    Values are written as the text input of PostgreSQL types.
+    bytes are written as bytea in hex format, dict as json, and list
+    as array, as same as the types adapted by psycopg2.
+
+    Args:
+        table_name (str): table name for inserting
+        columns (Tuple[str, ...]): column names for inserting
+        rows (List[List[Any]]): values of columns for each row
+    """
+
+    def __init__(self, table_name: str, columns: Tuple[str, ...],
+                 rows: List[List[Any]]):
+        self.table_name: str = table_name
+        self.columns: Tuple[str, ...] = columns
+        self.rows: List[List[Any]] = rows
+
+    def statement(self) -> str:
+        return (
+            f"COPY {self.table_name}({', '.join(self.columns)})"
+            " FROM STDIN WITH (FORMAT csv)"
+        )
+
+    def buffer(self) -> io.StringIO:
+        # Strings are quoted in order to distinguish empty strings from NULL.
+        buffer: io.StringIO = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC,
+                            lineterminator="\n")
+        writer.writerows(
+            [[_copy_value(value) for value in row] for row in self.rows])
+        buffer.seek(0)
+        return buffer
+
+
+@description("rowcount")
+class CopyResult:
+    """
+    Result of "COPY ... FROM STDIN" statement, which returns no rows.
+
+    Args:
+        rowcount (int): count of copied rows
+    """
+
+    returns_rows: bool = False
+
+    def __init__(self, rowcount: int):
+        self.rowcount: int = rowcount
+
+    def keys(self) -> List[str]:
+        return []
+
+    def __iter__(self):
+        return iter(())
+
+    def close(self) -> None:
+        pass
+
+
+# Types written to CSV for COPY as it is.
+_COPY_AS_IS: Tuple[type, ...] = (str, int, float, bool, decimal.Decimal)
+
+
+class _CopyNull(int):
+    # csv writes numbers without quotes, so NULL is written as an empty
+    # field without quotes, which is distinguished from empty strings.
+    def __str__(self) -> str:
+        return ""
+
+
+_COPY_NULL: _CopyNull = _CopyNull()
+
+
+def _copy_value(value: Any) -> Any:
+    if value is None:
+        return _COPY_NULL
+    if type(value) in _COPY_AS_IS:
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, list):
+        return _array_literal(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, _COPY_AS_IS):
+        return value
+    return str(value)
+
+
+def _array_literal(values: list) -> str:
+    return "{" + ",".join(
+        "NULL" if value is None
+        else _array_literal(value) if isinstance(value, list)
+        else '"{}"'.format(str(_copy_value(value))
+                           .replace("\\", "\\\\").replace('"', '\\"'))
+        for value in values
+    ) + "}"
+
+
+def prepared_of(queries: List[Union[PreparedQuery, PreparedCopy]]
+                ) -> Union[PreparedQuery, PreparedBatch, PreparedCopy]:
+    return queries[0] if len(queries) == 1 else PreparedBatch(queries)
+
+
+def group_by_columns(bind_parameters: List[dict],
+                     excluded_columns: Tuple[str, ...] = ()
+                     ) -> List[Tuple[Tuple[str, ...], List[dict]]]:
+    """
+    Groups consecutive rows by the column names of not None values,
+    because None values are removed from bind parameters of each entity.
+    Only consecutive rows are grouped, so the rows are written in their
+    order even if the rows of the same keys are in other groups.
+
+    Args:
+        bind_parameters (List[dict]): bind parameters for each row
+        excluded_columns (Tuple[str, ...], optional):
+            column names not used for grouping. Defaults to ().
+
+    Returns:
+        List[Tuple[Tuple[str, ...], List[dict]]]:
+            pairs of the column names and the rows
+    """
+
+    groups: List[Tuple[Tuple[str, ...], List[dict]]] = []
+    for row in bind_parameters:
+        columns: Tuple[str, ...] = tuple(
+            key for key in row.keys() if key not in excluded_columns)
+        if groups and groups[-1][0] == columns:
+            groups[-1][1].append(row)
+        else:
+            groups.append((columns, [row]))
+    return groups
+
+
+def _merged_rows_by_keys(rows: List[dict], columns: Tuple[str, ...]
+                         ) -> List[dict]:
+    """
+    Rows merged for each key. Values of the later rows override the
+    earlier ones, as same as writing the rows one by one, because None
+    values are not in the rows. The merged rows are kept at the position
+    of the first rows of the keys. Rows with None keys are all kept,
+    because they do not conflict with each other.
+    """
+
+    keyed: Dict[tuple, int] = {}
+    merged_rows: List[dict] = []
+    for row in rows:
+        key: tuple = tuple(row.get(column) for column in columns)
+        if None in key:
+            merged_rows.append(row)
+        elif key in keyed:
+            merged_rows[keyed[key]] = {**merged_rows[keyed[key]], **row}
+        else:
+            keyed[key] = len(merged_rows)
+            merged_rows.append(row)
+    return merged_rows
+
+
+def bulk_rows(bulk: Union[bool, int, str], dialect_name: Optional[str],
+              params_per_row: int) -> int:
+    """
+    Count of rows in one statement of bulk operations.
+    The count is limited by the count of bind parameters of the dialect.
+
+    Args:
+        bulk (Union[bool, int, str]):
+            If int, max count of rows specified by user.
+        dialect_name (Optional[str]): name of sqlalchemy dialect
+        params_per_row (int): count of bind parameters for each row
+
+    Returns:
+        int: count of rows
+    """
+
+    max_rows: int = bulk if isinstance(bulk, int) \
+        and (not isinstance(bulk, bool)) and bulk > 0 else BULK_MAX_ROWS
+    parameter_limit: int = PARAMETER_LIMITS.get(
+        dialect_name, DEFAULT_PARAMETER_LIMIT)
+    return max(1, min(max_rows, parameter_limit // max(1, params_per_row)))
+
+
+def chunked(rows: Sequence[Any], size: int) -> List[Sequence[Any]]:
+    return [rows[index:index + size] for index in range(0, len(rows), size)]
 
 
 @description(("query", "sql_path", "table_name", "bind_params",
@@ -65,7 +322,12 @@ class QueryContext():
     def __init__(self, *, query: Optional[str], sql_path: Optional[str],
                  table_name: Optional[str], bind_params: dict,
                  triggered_function: callable, function_args: tuple,
-                 function_kwargs: dict, condition_columns: Tuple[str, ...]):
+                 function_kwargs: dict, condition_columns: Tuple[str, ...],
+                 template_parser: Optional[TemplateParser] = None,
+                 bulk: Union[bool, int, str] = False,
+                 dialect_name: Optional[str] = None,
+                 driver_name: Optional[str] = None,
+                 argument_names: Tuple[str, ...] = ()):
 
         self.query: Optional[str] = query
         self.sql_path: Optional[str] = sql_path
@@ -75,20 +337,17 @@ class QueryContext():
         self.function_args: tuple = function_args
         self.function_kwargs: dict = function_kwargs
         self.conditions: Tuple[str, ...] = condition_columns
+        self.template_parser: Optional[TemplateParser] = template_parser
+        self.bulk: Union[bool, int, str] = bulk
+        self.dialect_name: Optional[str] = dialect_name
+        self.driver_name: Optional[str] = driver_name
+        self.argument_names: Tuple[str, ...] = argument_names
 
     def init_structure(self, operation: str) -> Tuple[str, List[dict]]:
         entities: List[Any] = self.find_entities()
         table_name: str = self.find_table_name(entities[0], operation)
         bind_parameters: List[dict] = [
-            {
-                key: value for key, value in vars(entity).items()
-                if (value is not None) and (
-                    key not in ("__twinsqla_table_name",
-                                "__twinsqla_primary_keys",
-                                "__twinsqla_auto_keys")
-                )
-            } for entity in entities
-        ]
+            entity_values(entity) for entity in entities]
 
         return (table_name, bind_parameters)
 
@@ -130,16 +389,13 @@ class QueryContext():
 
         return target_table_name
 
-    def arg_keys(self) -> Tuple[str]:
-        return tuple(self.bind_params.keys())
-
 
 @description()
 class QueryBindBuilder(metaclass=ABCMeta):
 
     @abstractmethod
     def bind(self, builder: SqlBuilder, context: QueryContext
-             ) -> PreparedQuery:
+             ) -> Union[PreparedQuery, PreparedBatch]:
         pass
 
     def _bind_from_query(self, builder: SqlBuilder, context: QueryContext
@@ -147,9 +403,10 @@ class QueryBindBuilder(metaclass=ABCMeta):
 
         prepared_sql: Optional[Union[str, DynamicQuery]] = builder.build(
             query=context.query, sql_path=context.sql_path,
-            arg_keys=context.arg_keys())
+            template_parser=context.template_parser)
 
-        return PreparedQuery(prepared_sql, context.bind_params) \
+        return PreparedQuery(prepared_sql, context.bind_params,
+                             context.argument_names) \
             if prepared_sql is not None else None
 
 
@@ -168,8 +425,11 @@ class SelectBindBuilder(QueryBindBuilder):
 
 @description()
 class InsertBindBuilder(QueryBindBuilder):
+
+    values_cache: LRUCache = LRUCache(maxsize=STATEMENT_CACHE_SIZE)
+
     def bind(self, builder: SqlBuilder, context: QueryContext
-             ) -> PreparedQuery:
+             ) -> Union[PreparedQuery, PreparedBatch, PreparedCopy]:
 
         prepared_query: Optional[PreparedQuery] = self._bind_from_query(
             builder, context)
@@ -180,24 +440,97 @@ class InsertBindBuilder(QueryBindBuilder):
         table_name: str = structure[0]
         bind_parameters: List[dict] = structure[1]
 
-        auto_keys: Tuple[str, ...] = context.auto_keys()
-        insert_columns: List[str] = [
-            key for key in bind_parameters[0].keys() if key not in auto_keys]
+        queries: List[Union[PreparedQuery, PreparedCopy]] = []
+        for columns, rows in group_by_columns(
+                bind_parameters, context.auto_keys()):
+            queries.extend(
+                self._bind_rows(context, table_name, columns, rows))
+
+        return prepared_of(queries)
+
+    def _bind_rows(self, context: QueryContext, table_name: str,
+                   columns: Tuple[str, ...], rows: List[dict]
+                   ) -> List[Union[PreparedQuery, PreparedCopy]]:
+        """
+        Insert rows with the same columns.
+        In bulk operation, multiple rows are inserted by each statement
+        "INSERT INTO table(a, b) VALUES (:p0_0, :p0_1), (:p1_0, :p1_1), ...".
+        The sql statement is cached for each count of rows.
+        """
+
+        if context.bulk == "copy" and context.dialect_name == "postgresql" \
+                and context.driver_name in COPY_DRIVERS:
+            return [PreparedCopy(table_name, columns, [
+                _row_values(columns, row) for row in rows])]
+
+        if not context.bulk:
+            return [PreparedQuery(self.values_cache.get(
+                (table_name, columns, 0), _render_insert_values), rows)]
+
+        size: int = bulk_rows(context.bulk, context.dialect_name,
+                              len(columns))
+        return [
+            PreparedQuery(
+                self.values_cache.get((table_name, columns, len(chunk)),
+                                      _render_insert_values),
+                _bulk_parameters(columns, chunk))
+            for chunk in chunked(rows, size)
+        ]
 
-        prepared_sql: str = (
-            f"INSERT INTO {table_name}"
-            f"({', '.join([f'{key}' for key in insert_columns])})"
-            f" VALUES "
-            f"({', '.join([f':{key}' for key in insert_columns])})"
-        )
 
-        return PreparedQuery(prepared_sql, bind_parameters)
+def _render_insert_values(key: Tuple[str, Tuple[str, ...], int]) -> str:
+    table_name, columns, rows = key
+    return (
+        f"INSERT INTO {table_name}({', '.join(columns)})"
+        f" VALUES {_render_values(columns, rows)}"
+    )
+
+
+def _render_values(columns: Tuple[str, ...], rows: int) -> str:
+    """
+    Values of "INSERT ... VALUES" with bind parameters ":p{row}_{column}".
+    If the count of rows is 0, values of one row with bind parameters named
+    by the column names for `executemany`.
+    """
+
+    return _render_rows(len(columns), rows) if rows \
+        else f"({', '.join(f':{column}' for column in columns)})"
+
+
+def _render_rows(width: int, rows: int) -> str:
+    return ", ".join(
+        "(" + ", ".join(f":p{row}_{index}" for index in range(width)) + ")"
+        for row in range(rows)
+    )
+
+
+def _bulk_parameters(columns: Tuple[str, ...], rows: Sequence[dict]
+                     ) -> dict:
+
+    parameters: dict = {}
+    for row_index, row in enumerate(rows):
+        for column_index, value in enumerate(_row_values(columns, row)):
+            parameters[f"p{row_index}_{column_index}"] = value
+    return parameters
+
+
+def _row_values(columns: Tuple[str, ...], row: dict) -> List[Any]:
+    try:
+        return [row[column] for column in columns]
+    except KeyError as exc:
+        raise exceptions.InvalidStructureException(
+            f"The column {exc} needed in bulk operation is None or"
+            " not found in some entities."
+        ) from None
 
 
 @description()
 class UpdateBindBuilder(QueryBindBuilder):
+
+    set_cache: LRUCache = LRUCache(maxsize=STATEMENT_CACHE_SIZE)
+
     def bind(self, builder: SqlBuilder, context: QueryContext
-             ) -> PreparedQuery:
+             ) -> Union[PreparedQuery, PreparedBatch]:
 
         prepared_query: Optional[PreparedQuery] = self._bind_from_query(
             builder, context)
@@ -208,27 +541,233 @@ class UpdateBindBuilder(QueryBindBuilder):
         table_name: str = structure[0]
         bind_parameters: List[dict] = structure[1]
         condition_columns: Tuple[str, ...] = context.condition_columns()
+        if context.bulk and condition_columns:
+            # One statement updates a row only once, so the rows are merged
+            # for each key before grouping.
+            bind_parameters = _merged_rows_by_keys(
+                bind_parameters, condition_columns)
+
+        queries: List[PreparedQuery] = []
+        for columns, rows in group_by_columns(
+                bind_parameters, condition_columns):
+            if not columns:
+                raise exceptions.InvalidStructureException(
+                    "No columns to update are found in entities.")
+
+            if context.bulk and condition_columns:
+                queries.extend(self._bind_bulk(
+                    context, table_name, condition_columns, columns, rows))
+            else:
+                queries.append(PreparedQuery(self.set_cache.get(
+                    (table_name, condition_columns, columns),
+                    _render_update), rows))
+
+        return prepared_of(queries)
+
+    def _bind_bulk(self, context: QueryContext, table_name: str,
+                   condition_columns: Tuple[str, ...],
+                   updating_columns: Tuple[str, ...], rows: List[dict]
+                   ) -> List[PreparedQuery]:
+        """
+        Update multiple rows by each statement.
+            - PostgreSQL : "UPDATE table AS t SET a = v.a
+                FROM (VALUES ((SELECT pk FROM table WHERE false),
+                    (SELECT a FROM table WHERE false)),
+                    (:p0_0, :p0_1), ...) AS v(pk, a)
+                WHERE t.pk = v.pk"
+            - others : "UPDATE table SET a = CASE WHEN pk = :p0_0 THEN :p0_1
+                ... END WHERE pk IN (:p0_0, ...)"
+        The sql statement is cached for each count of rows.
+        """
+
+        columns: Tuple[str, ...] = condition_columns + updating_columns
+        form: str = "values" \
+            if context.dialect_name in UPDATE_FROM_VALUES_DIALECTS \
+            else "case" if context.dialect_name in ROW_VALUE_DIALECTS \
+            else "case_or"
+        # In CASE form, bind parameters of condition columns appear
+        # in each CASE and WHERE condition.
+        params_per_row: int = len(columns) if form == "values" else (
+            len(condition_columns) * (len(updating_columns) + 1)
+            + len(updating_columns)
+        )
 
-        updating_columns: List[str] = [
-            f'{key} = :{key}' for key in bind_parameters[0].keys()
-            if key not in condition_columns
+        size: int = bulk_rows(context.bulk, context.dialect_name,
+                              params_per_row)
+        return [
+            PreparedQuery(
+                self.set_cache.get(
+                    (table_name, condition_columns, updating_columns,
+                     len(chunk), form),
+                    _render_update_rows),
+                _bulk_parameters(columns, chunk))
+            for chunk in chunked(rows, size)
         ]
-        filter_conditions: List[str] = [
-            f"{column} = :{column}" for column in condition_columns
-        ]
-        prepared_sql: str = \
-            f"UPDATE {table_name} SET {', '.join(updating_columns)}" + (
-                f" WHERE {' AND '.join(filter_conditions)}"
-                if filter_conditions else ""
+
+
+def _render_update(key: Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+                   ) -> str:
+    table_name, condition_columns, updating_columns = key
+    filter_conditions: List[str] = [
+        f"{column} = :{column}" for column in condition_columns
+    ]
+    return (
+        f"UPDATE {table_name} SET "
+        + ", ".join(f"{column} = :{column}" for column in updating_columns)
+        + (
+            f" WHERE {' AND '.join(filter_conditions)}"
+            if filter_conditions else ""
+        )
+    )
+
+
+def _render_update_rows(
+    key: Tuple[str, Tuple[str, ...], Tuple[str, ...], int, str]
+) -> str:
+
+    table_name, condition_columns, updating_columns, rows, form = key
+    columns: Tuple[str, ...] = condition_columns + updating_columns
+
+    if form == "values":
+        # Bind parameters in VALUES are typed as text without the other
+        # types, so the first row is NULL of the types of the table columns.
+        # The row matches no rows in updating.
+        typed_row: str = ", ".join(
+            f"(SELECT {column} FROM {table_name} WHERE false)"
+            for column in columns)
+        return (
+            f"UPDATE {table_name} AS t SET "
+            + ", ".join(f"{column} = v.{column}"
+                        for column in updating_columns)
+            + f" FROM (VALUES ({typed_row}),"
+            + f" {_render_rows(len(columns), rows)})"
+            + f" AS v({', '.join(columns)}) WHERE "
+            + " AND ".join(f"t.{column} = v.{column}"
+                           for column in condition_columns)
+        )
+
+    def _when(row: int) -> str:
+        return " AND ".join(
+            f"{column} = :p{row}_{index}"
+            for index, column in enumerate(condition_columns)
+        )
+
+    assignments: List[str] = [
+        f"{column} = CASE " + " ".join(
+            f"WHEN {_when(row)} THEN :p{row}_{len(condition_columns) + index}"
+            for row in range(rows)
+        ) + " END"
+        for index, column in enumerate(updating_columns)
+    ]
+    return (
+        f"UPDATE {table_name} SET {', '.join(assignments)} WHERE "
+        + _render_keys_condition(condition_columns, rows, form == "case")
+    )
+
+
+@description()
+class UpsertBindBuilder(QueryBindBuilder):
+
+    upsert_cache: LRUCache = LRUCache(maxsize=STATEMENT_CACHE_SIZE)
+
+    def bind(self, builder: SqlBuilder, context: QueryContext
+             ) -> Union[PreparedQuery, PreparedBatch]:
+
+        prepared_query: Optional[PreparedQuery] = self._bind_from_query(
+            builder, context)
+        if prepared_query is not None:
+            return prepared_query
+
+        structure: Tuple[str, List[dict]] = context.init_structure("upsert")
+        table_name: str = structure[0]
+        bind_parameters: List[dict] = structure[1]
+        condition_columns: Tuple[str, ...] = context.condition_columns()
+        if not condition_columns:
+            raise exceptions.InvalidStructureException(
+                "The columns of the conflict target in upsert are not found."
+                " You need to specify primary keys by '@twinsqla.table'"
+                " or decorator argument 'condition_columns'."
             )
 
-        return PreparedQuery(prepared_sql, bind_parameters)
+        if context.bulk:
+            # One statement cannot affect a row twice in PostgreSQL,
+            # so the rows are merged for each key before grouping.
+            bind_parameters = _merged_rows_by_keys(
+                bind_parameters, condition_columns)
+
+        # Unlike insert, the values of auto keys are also inserted
+        # in order to update the existing rows.
+        queries: List[PreparedQuery] = []
+        for columns, rows in group_by_columns(bind_parameters):
+            if not context.bulk:
+                queries.append(PreparedQuery(self.upsert_cache.get(
+                    (table_name, columns, condition_columns, 0,
+                     context.dialect_name),
+                    _render_upsert), rows))
+                continue
+
+            size: int = bulk_rows(context.bulk, context.dialect_name,
+                                  len(columns))
+            queries.extend(
+                PreparedQuery(
+                    self.upsert_cache.get(
+                        (table_name, columns, condition_columns, len(chunk),
+                         context.dialect_name),
+                        _render_upsert),
+                    _bulk_parameters(columns, chunk))
+                for chunk in chunked(rows, size)
+            )
+
+        return prepared_of(queries)
+
+
+def _render_upsert(
+    key: Tuple[str, Tuple[str, ...], Tuple[str, ...], int, Optional[str]]
+) -> str:
+    """
+    Insert-or-update statement. If the count of rows is 0, the statement
+    inserts one row with bind parameters named by the column names.
+        - PostgreSQL, SQLite : "INSERT ... ON CONFLICT (pk) DO UPDATE
+            SET a = excluded.a"
+        - MySQL : "INSERT ... ON DUPLICATE KEY UPDATE a = VALUES(a)"
+    """
+
+    table_name, columns, condition_columns, rows, dialect_name = key
+    if dialect_name not in UPSERT_DIALECTS:
+        raise exceptions.UnsupportedDialectException(
+            "upsert", dialect_name, list(UPSERT_DIALECTS))
+
+    values: str = _render_values(columns, rows)
+    updating_columns: List[str] = [
+        column for column in columns if column not in condition_columns]
+
+    prepared_sql: str = \
+        f"INSERT INTO {table_name}({', '.join(columns)}) VALUES {values}"
+    if dialect_name in ("mysql", "mariadb"):
+        # "pk = pk" does nothing for the existing rows.
+        assignments: List[str] = [
+            f"{column} = VALUES({column})" for column in updating_columns
+        ] or [f"{condition_columns[0]} = {condition_columns[0]}"]
+        return (
+            f"{prepared_sql} ON DUPLICATE KEY UPDATE {', '.join(assignments)}"
+        )
+
+    action: str = "DO UPDATE SET " + ", ".join(
+        f"{column} = excluded.{column}" for column in updating_columns
+    ) if updating_columns else "DO NOTHING"
+    return (
+        f"{prepared_sql} ON CONFLICT ({', '.join(condition_columns)})"
+        f" {action}"
+    )
 
 
 @description()
 class DeleteBindBuilder(QueryBindBuilder):
+
+    keys_cache: LRUCache = LRUCache(maxsize=STATEMENT_CACHE_SIZE)
+
     def bind(self, builder: SqlBuilder, context: QueryContext
-             ) -> PreparedQuery:
+             ) -> Union[PreparedQuery, PreparedBatch]:
 
         prepared_query: Optional[PreparedQuery] = self._bind_from_query(
             builder, context)
@@ -238,11 +777,15 @@ class DeleteBindBuilder(QueryBindBuilder):
         structure: Tuple[str, List[dict]] = context.init_structure("delete")
         table_name: str = structure[0]
         bind_parameters: List[dict] = structure[1]
+        condition_columns: Tuple[str, ...] = context.condition_columns()
+
+        if len(bind_parameters) > 1 and condition_columns:
+            return self._bind_keys(context, table_name, condition_columns,
+                                   bind_parameters)
 
         filter_conditions: List[str] = [
-            f"{column} = :{column}" for column in context.condition_columns()
+            f"{column} = :{column}" for column in condition_columns
         ]
-        # TODO 削除対象のPKをまとめて1クエリで記載する
         prepared_sql: str = \
             f"DELETE FROM {table_name}" + (
                 f" WHERE {' AND '.join(filter_conditions)}"
@@ -251,6 +794,66 @@ class DeleteBindBuilder(QueryBindBuilder):
 
         return PreparedQuery(prepared_sql, bind_parameters)
 
+    def _bind_keys(self, context: QueryContext, table_name: str,
+                   columns: Tuple[str, ...], bind_parameters: List[dict]
+                   ) -> Union[PreparedQuery, PreparedBatch]:
+        """
+        Delete multiple rows by each statement
+        "DELETE FROM table WHERE pk IN (:p0_0, :p1_0, ...)".
+        The sql statement is cached for each count of rows.
+        """
+
+        row_value: bool = len(columns) == 1 \
+            or context.dialect_name in ROW_VALUE_DIALECTS
+        rows: int = bulk_rows(True, context.dialect_name, len(columns))
+        queries: List[PreparedQuery] = []
+        for chunk in chunked(bind_parameters, rows):
+            prepared_sql: str = self.keys_cache.get(
+                (table_name, columns, len(chunk), row_value),
+                _render_delete_keys)
+            queries.append(PreparedQuery(
+                prepared_sql, _bulk_parameters(columns, chunk)))
+
+        return prepared_of(queries)
+
+
+def _render_delete_keys(key: Tuple[str, Tuple[str, ...], int, bool]) -> str:
+    table_name, columns, rows, row_value = key
+    return (
+        f"DELETE FROM {table_name}"
+        f" WHERE {_render_keys_condition(columns, rows, row_value)}"
+    )
+
+
+def _render_keys_condition(columns: Tuple[str, ...], rows: int,
+                           row_value: bool) -> str:
+    """
+    Condition matching any of rows with bind parameters ":p{row}_{column}".
+        - single column : "a IN (:p0_0, :p1_0)"
+        - row value : "(a, b) IN ((:p0_0, :p0_1), (:p1_0, :p1_1))"
+        - otherwise : "(a = :p0_0 AND b = :p0_1) OR (a = :p1_0 AND ...)"
+    """
+
+    if len(columns) == 1:
+        return (
+            f"{columns[0]} IN"
+            f" ({', '.join(f':p{row}_0' for row in range(rows))})"
+        )
+
+    if row_value:
+        return (
+            f"({', '.join(columns)}) IN"
+            f" ({_render_rows(len(columns), rows)})"
+        )
+
+    return " OR ".join(
+        "(" + " AND ".join(
+            f"{column} = :p{row}_{index}"
+            for index, column in enumerate(columns)
+        ) + ")"
+        for row in range(rows)
+    )
+
 
 @description()
 class ExecuteBindBuilder(QueryBindBuilder):
@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+from collections import OrderedDict
+import threading
+import weakref
+
+
+class TemplateSource(NamedTuple):
+    """
+    Template specified in query decorators.
+
+    Attributes:
+        query (Optional[str]): query text specified by `query`
+        sql_path (Optional[str]): file path specified by `sql_path`
+        template_parser (Optional[str]):
+            parser name specified by `template_parser`
+    """
+
+    query: Optional[str]
+    sql_path: Optional[str]
+    template_parser: Optional[str] = None
+
+
+class TemplateRegistry:
+    """
+    Registry of templates specified in query decorators.
+    Templates are registered when decorating, in order of decorating.
+
+    Templates of decorators bound to TWinSQLA object (such as
+    `sqla.select(...)`) are registered with the object as owner,
+    and templates of module level decorators are registered without owner.
+    """
+
+    def __init__(self):
+        self._sources: Dict[TemplateSource, weakref.WeakSet] = OrderedDict()
+        self._unowned: Set[TemplateSource] = set()
+        self._lock: threading.Lock = threading.Lock()
+
+    def register(self, query: Optional[str], sql_path: Optional[str],
+                 template_parser: Optional[str] = None,
+                 owner: Optional[Any] = None) -> None:
+
+        if (query is None) and (sql_path is None):
+            return
+        source: TemplateSource = TemplateSource(
+            query, sql_path, template_parser)
+        with self._lock:
+            owners: weakref.WeakSet = self._sources.setdefault(
+                source, weakref.WeakSet())
+            if owner is None:
+                self._unowned.add(source)
+            else:
+                owners.add(owner)
+
+    def sources(self, owner: Optional[Any] = None) -> List[TemplateSource]:
+        """
+        Registered templates.
+
+        Args:
+            owner (Optional[Any], optional):
+                If specified, only templates without owner and templates
+                owned by this object are returned. Defaults to None.
+
+        Returns:
+            List[TemplateSource]: templates in order of registering
+        """
+
+        with self._lock:
+            return [
+                source for source, owners in self._sources.items()
+                if (owner is None) or (source in self._unowned)
+                or (owner in owners)
+            ]
+
+
+template_registry: TemplateRegistry = TemplateRegistry()
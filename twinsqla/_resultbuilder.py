@@ -1,21 +1,43 @@
-from typing import Callable, Type, TypeVar, Generic
-from typing import Any, Tuple, List, Optional, Union
+from typing import Type, TypeVar, Generic
+from typing import Any, Callable, Tuple, List, Optional, Union
 from collections import OrderedDict
 from collections.abc import Sequence
-from functools import lru_cache
+import keyword
+
+import sqlalchemy.engine
 
 from ._support import description
+from ._cache import LRUCache
 
 
 RESULT_TYPE = TypeVar("RESULT_TYPE")
 
+# Max count of row mappers for each result type not built by
+# `ResultTypeBuilder`.
+MAPPER_CACHE_SIZE: int = 32
+
+# Row classes of sqlalchemy returned without converting.
+#     RowProxy in sqlalchemy < 1.4
+#     Row in sqlalchemy >= 1.4
+_ROW_TYPES: Tuple[type, ...] = tuple(
+    row_type for row_type in (
+        getattr(sqlalchemy.engine, "RowProxy", None),
+        getattr(sqlalchemy.engine, "Row", None)
+    ) if row_type is not None
+)
+
 
 @description("entity_type")
 class ResultType(Generic[RESULT_TYPE]):
 
-    def __init__(self, entity_type: Type[RESULT_TYPE], sequencial: bool):
+    def __init__(self, entity_type: Type[RESULT_TYPE], sequencial: bool,
+                 mappers: Optional[LRUCache] = None):
         self.entity_type: Type[RESULT_TYPE] = entity_type
         self.sequencial: bool = sequencial
+        # Mappers are keyed by the entity type and the column names,
+        # so the cache is shareable with other result types.
+        self.mappers: LRUCache = mappers if mappers is not None \
+            else LRUCache(maxsize=MAPPER_CACHE_SIZE)
 
     def to_values(self, results) -> Union[
             Optional[RESULT_TYPE], Tuple[RESULT_TYPE, ...]]:
@@ -26,70 +48,154 @@ class ResultType(Generic[RESULT_TYPE]):
         if results.returns_rows is False:
             return () if self.sequencial is True else None
 
+        mapper: Callable[[Any], RESULT_TYPE] = self.mapper(results.keys())
         if self.sequencial is False:
-            return_value: RESULT_TYPE = self.to_value(results.fetchone())
+            return_value: RESULT_TYPE = mapper(results.fetchone())
             results.close()
 
             return return_value
 
-        return tuple(self.to_value(result) for result in results)
+        return tuple(map(mapper, results))
 
     def to_value(self, result) -> RESULT_TYPE:
-        return self.entity_type(**OrderedDict(result))
+        return self.mapper(result.keys())(result)
 
+    def mapper(self, keys) -> Callable[[Any], RESULT_TYPE]:
+        """
+        Function to convert a row with the column names `keys`
+        to the result type. The function is compiled once for each
+        column names.
+        """
+
+        return self.mappers.get(
+            (self.entity_type, tuple(keys)),
+            lambda mapper_key: compile_mapper(*mapper_key))
+
+
+def compile_mapper(entity_type: Type[Any], keys: Tuple[str, ...]
+                   ) -> Callable[[Any], Any]:
+    """
+    Function to convert a row to `entity_type`.
+
+    The following types are converted with minimal work for each row.
+        - `typing.Any` or the row class of sqlalchemy : the row itself
+        - `tuple` : tuple of the row values
+        - `dict`, `OrderedDict` : dictionary of the column names and values
+        - `typing.NamedTuple` class with the fields same as the column names
+            : `_make()` with the row values
+
+    For other types, compiles a function which reads values of a row
+    by position and calls `entity_type` with keyword arguments of
+    the column names.
+    For example, with keys ("staff_id", "username"), the function is
+        def _map(row):
+            return entity_type(staff_id=row[0], username=row[1])
+
+    If some column names are not available as keyword arguments of python
+    (or duplicated), the row values are passed by a dictionary.
+    """
+
+    if entity_type is Any or entity_type in _ROW_TYPES:
+        return _as_row
+    if entity_type is tuple:
+        return tuple
+    if entity_type in (dict, OrderedDict):
+        return lambda row: entity_type(zip(keys, row))
+    if _is_named_tuple(entity_type) and entity_type._fields == keys:
+        return entity_type._make
+
+    if any(not key.isidentifier() or keyword.iskeyword(key)
+           for key in keys) or len(set(keys)) != len(keys):
+        return lambda row: entity_type(**dict(zip(keys, row)))
+
+    arguments: str = ", ".join(
+        f"{key}=row[{index}]" for index, key in enumerate(keys))
+    source: str = f"def _map(row):\n    return entity_type({arguments})\n"
+
+    namespace: dict = {"entity_type": entity_type}
+    exec(compile(source, "<twinsqla mapper>", "exec"), namespace)
+    return namespace["_map"]
 
-@description("cache_size")
-class ResultTypeBuilder:
-    def __init__(self, cache_size: Optional[int] = None):
 
-        def _is_generic_sequencial(
-            result_type: Type[Any], meta_param: str
-        ) -> bool:
+def _as_row(row: Any) -> Any:
+    return row
 
-            orign_class: Optional[type] = getattr(
-                result_type, meta_param, None)
 
-            if not orign_class:
-                return False
+def _is_named_tuple(entity_type: Type[Any]) -> bool:
+    return isinstance(entity_type, type) and issubclass(entity_type, tuple) \
+        and hasattr(entity_type, "_make") and hasattr(entity_type, "_fields")
 
-            try:
-                if issubclass(orign_class, str):
-                    return False
-                if issubclass(orign_class, Sequence):
-                    return True
-            except Exception:
-                pass
 
+def _is_generic_sequencial(result_type: Type[Any], meta_param: str) -> bool:
+    orign_class: Optional[type] = getattr(result_type, meta_param, None)
+
+    if not orign_class:
+        return False
+
+    try:
+        if issubclass(orign_class, str):
             return False
+        if issubclass(orign_class, Sequence):
+            return True
+    except Exception:
+        pass
+
+    return False
+
 
-        def _is_sequencial(result_type: Type[Any]) -> bool:
-            if result_type in (list, tuple, List, Tuple):
-                return True
-
-            # python_version >= 3.7
-            if _is_generic_sequencial(result_type, "__origin__"):
-                return True
-            # python_version < 3.7
-            if _is_generic_sequencial(result_type, "__extra__"):
-                return True
-
-            try:
-                if issubclass(result_type, str):
-                    return False
-                if issubclass(result_type, Sequence):
-                    return True
-            except Exception:
-                pass
+def _is_sequencial(result_type: Type[Any]) -> bool:
+    if result_type in (list, tuple, List, Tuple):
+        return True
 
+    # python_version >= 3.7
+    if _is_generic_sequencial(result_type, "__origin__"):
+        return True
+    # python_version < 3.7
+    if _is_generic_sequencial(result_type, "__extra__"):
+        return True
+
+    try:
+        if issubclass(result_type, str) or _is_named_tuple(result_type):
             return False
+        if issubclass(result_type, Sequence):
+            return True
+    except Exception:
+        pass
+
+    return False
+
 
-        @lru_cache(maxsize=cache_size)
-        def _build(result_type: Type[Any]) -> ResultType:
-            if _is_sequencial(result_type) is False:
-                return ResultType(entity_type=result_type, sequencial=False)
+def resolve_result_type(result_type: Type[Any],
+                        mappers: Optional[LRUCache] = None) -> ResultType:
+    if isinstance(result_type, ResultType):
+        return result_type
 
-            entity_type: Type[Any] = result_type.__args__[0]
-            return ResultType(entity_type=entity_type, sequencial=True)
+    if _is_sequencial(result_type) is False:
+        return ResultType(entity_type=result_type, sequencial=False,
+                          mappers=mappers)
 
-        self.build: Callable[[Type[Any]], ResultType] = _build
+    # Without the type of elements (such as `tuple` or `List`),
+    # rows of sqlalchemy are returned without converting.
+    type_args: tuple = getattr(result_type, "__args__", None) or (Any, )
+    entity_type: Type[Any] = Any if isinstance(type_args[0], TypeVar) \
+        else type_args[0]
+    return ResultType(entity_type=entity_type, sequencial=True,
+                      mappers=mappers)
+
+
+@description(("cache", "mapper_cache"))
+class ResultTypeBuilder:
+    """
+    Cache of result types, and of row mappers shared by the result types.
+    """
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.cache: LRUCache = LRUCache(maxsize=cache_size)
+        self.mapper_cache: LRUCache = LRUCache(maxsize=cache_size)
         self.cache_size: Optional[int] = cache_size
+
+    def build(self, result_type: Type[Any]) -> ResultType:
+        return self.cache.get(result_type, self._resolve)
+
+    def _resolve(self, result_type: Type[Any]) -> ResultType:
+        return resolve_result_type(result_type, self.mapper_cache)
@@ -1,54 +1,270 @@
-from typing import Callable, Optional, Union, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+import functools
 import os
 from pathlib import Path
-from functools import lru_cache
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from enum import Enum
 import textwrap
 
 from ._support import description
-from ._dynamic_parser import DynamicParser, DynamicQuery
+from ._cache import LRUCache
+from ._dynamic_parser import (
+    DynamicParser, DynamicQuery, QueryCompiler, TwinQuery
+)
+from ._directive_scanner import DirectiveScanner, has_directive
+from ._bundle import TemplateBundle
+from ._registry import TemplateSource
 from . import exceptions
 
 
-@description(("sql_file_root", "cache_size"))
+class TemplateParser(Enum):
+    """
+    Parser of two-way sql templates.
+
+    GRAMMAR parses whole sql statement by the grammar.
+    SCANNER scans only sql comments, string literals and directives,
+    so it is faster and available for sql of any dialects.
+    """
+
+    GRAMMAR = "grammar"
+    SCANNER = "scanner"
+
+    @classmethod
+    def of(cls, template_parser: Union[str, "TemplateParser"]
+           ) -> "TemplateParser":
+
+        if isinstance(template_parser, TemplateParser):
+            return template_parser
+        try:
+            return cls(template_parser)
+        except ValueError:
+            raise exceptions.UnknownTemplateParserException(
+                template_parser, [f"'{parser.value}'" for parser in cls]
+            ) from None
+
+
+@description(("sql_file_root", "query_cache", "template_parser"))
 class SqlBuilder:
 
     def __init__(self, available_dynamic_query: bool,
                  sql_file_root: Optional[Union[Path, str]] = None,
-                 cache_size: Optional[int] = None):
+                 cache_size: Optional[int] = None,
+                 template_bundle: Optional[TemplateBundle] = None,
+                 template_parser: Union[str, TemplateParser]
+                 = TemplateParser.GRAMMAR,
+                 grammar_cache: Optional[Union[Path, str]] = None,
+                 cache_bytes: Optional[int] = None):
 
         sql_root: Path = Path(os.getcwd()) if sql_file_root is None \
             else Path(sql_file_root)
-        dynamic_parser: Optional[DynamicParser] = DynamicParser() \
-            if available_dynamic_query else None
 
-        @lru_cache(maxsize=cache_size)
-        def load_query(
-            query: Optional[str], sql_path: Optional[str], arg_keys: Tuple[str]
-        ) -> Union[str, DynamicQuery]:
-
-            base_query: str = textwrap.dedent(query) if query is not None \
-                else _read_file(sql_path, sql_root)
-
-            return dynamic_parser.parse(base_query, arg_keys) \
-                if dynamic_parser else base_query
-
-        def _read_file(sql_path: str, sql_root: Path) -> str:
-            file_path: Path = sql_root.joinpath(sql_path).resolve()
-            with open(file_path, 'r') as sql_file:
-                return sql_file.read()
-
-        self._load_query: Callable[[Optional[str], Optional[str], Tuple[str]],
-                                   Union[str, DynamicQuery]] = load_query
+        # Compiled queries are cached by (query, sql_path, template_parser).
+        self.query_cache: LRUCache = LRUCache(
+            maxsize=cache_size, maxbytes=cache_bytes)
+        self._directive_scanner: DirectiveScanner = DirectiveScanner()
+        self.template_bundle: Optional[TemplateBundle] = template_bundle
+        # Templates analyzed in warming up, kept only until compiled.
+        self._analyzed: Optional[TemplateBundle] = None
+        self.grammar_cache: Optional[Union[Path, str]] = grammar_cache
+        self.template_parser: TemplateParser = \
+            TemplateParser.of(template_parser)
         self.available_dynamic_query: bool = available_dynamic_query
         self.sql_file_root: Path = sql_root.resolve()
         self.cache_size: Optional[int] = cache_size
+        self.cache_bytes: Optional[int] = cache_bytes
 
     def build(self, *, query: Optional[str], sql_path: Optional[str],
-              arg_keys: Tuple[str]) -> Optional[str]:
+              template_parser: Optional[TemplateParser] = None
+              ) -> Optional[Union[str, DynamicQuery]]:
 
         if (query is None) and (sql_path is None):
             return None
         if (query is not None) and (sql_path is not None):
             raise exceptions.DuplicatedQueryArgumentException()
 
-        return self._load_query(query, sql_path, arg_keys)
+        return self.query_cache.get(
+            (query, sql_path,
+             template_parser if template_parser else self.template_parser),
+            self._load_query
+        )
+
+    def _load_query(
+        self, key: Tuple[Optional[str], Optional[str], TemplateParser]
+    ) -> Union[str, DynamicQuery]:
+
+        query, sql_path, template_parser = key
+        base_query: str = load_template(query, sql_path, self.sql_file_root)
+        if not self.available_dynamic_query:
+            return base_query
+
+        compiled: Union[str, DynamicQuery] = \
+            self._compile(base_query, template_parser)
+        if isinstance(compiled, DynamicQuery) \
+                and self.query_cache.maxbytes is not None:
+            # Sql statements built after cached are added to the bytes.
+            compiled.on_shape = functools.partial(self.query_cache.grow, key)
+        return compiled
+
+    def warmup(self, sources: Iterable[TemplateSource],
+               executor: Optional[Executor] = None
+               ) -> List[Tuple[TemplateSource, Exception]]:
+        """
+        Compile templates and cache them before they are executed.
+
+        With `ProcessPoolExecutor`, templates are analyzed in the worker
+        processes and the analyzed queries are compiled in this process,
+        because compiled functions cannot be sent between processes.
+
+        Args:
+            sources (Iterable[TemplateSource]): templates to compile
+            executor (Optional[Executor], optional):
+                executor to compile templates in parallel.
+                If None, templates are compiled in this thread.
+                Defaults to None.
+
+        Returns:
+            List[Tuple[TemplateSource, Exception]]:
+                templates failed to compile and the exceptions
+        """
+
+        targets: List[TemplateSource] = list(sources)
+        try:
+            if isinstance(executor, ProcessPoolExecutor) \
+                    and self.available_dynamic_query:
+                targets, failures = self._analyze_in_processes(
+                    targets, executor)
+            else:
+                failures = []
+            return failures + self._build_sources(targets, executor)
+        finally:
+            # Analyzed templates are not needed after compiled and cached.
+            self._analyzed = None
+
+    def _build_sources(self, targets: List[TemplateSource],
+                       executor: Optional[Executor]
+                       ) -> List[Tuple[TemplateSource, Exception]]:
+
+        failures: List[Tuple[TemplateSource, Exception]] = []
+        submit: Callable[..., Future] = executor.submit \
+            if executor is not None \
+            and not isinstance(executor, ProcessPoolExecutor) \
+            else _run_now
+        futures: List[Tuple[TemplateSource, Future]] = [
+            (source, submit(self.build_source, source)) for source in targets
+        ]
+        for source, future in futures:
+            exc: Optional[BaseException] = future.exception()
+            if isinstance(exc, (exceptions.TWinSQLAException, OSError)):
+                failures.append((source, exc))
+            elif exc is not None:
+                raise exc
+
+        return failures
+
+    def _analyze_in_processes(
+        self, sources: List[TemplateSource], executor: ProcessPoolExecutor
+    ) -> Tuple[List[TemplateSource], List[Tuple[TemplateSource, Exception]]]:
+
+        failures: List[Tuple[TemplateSource, Exception]] = []
+        futures: List[Tuple[TemplateSource, str, str, Future]] = []
+        for source in sources:
+            try:
+                template: str = load_template(
+                    source.query, source.sql_path, self.sql_file_root)
+            except (exceptions.TWinSQLAException, OSError) as exc:
+                failures.append((source, exc))
+                continue
+
+            parser: str = self._parser_of(source).value
+            if has_directive(template) and (
+                self.template_bundle is None
+                or self.template_bundle.find(template, parser) is None
+            ):
+                futures.append((source, template, parser, executor.submit(
+                    analyze_template, template, parser, self.grammar_cache
+                )))
+
+        analyzed: TemplateBundle = TemplateBundle()
+        for source, template, parser, future in futures:
+            try:
+                analyzed.add(template, future.result(), parser)
+            except (exceptions.TWinSQLAException, OSError) as exc:
+                failures.append((source, exc))
+
+        # Analyzed queries are found in compiling.
+        self._analyzed = analyzed
+        failed: List[TemplateSource] = [source for source, _ in failures]
+        return ([source for source in sources if source not in failed],
+                failures)
+
+    def build_source(self, source: TemplateSource
+                     ) -> Optional[Union[str, DynamicQuery]]:
+        return self.build(query=source.query, sql_path=source.sql_path,
+                          template_parser=self._parser_of(source))
+
+    def _parser_of(self, source: TemplateSource) -> TemplateParser:
+        return TemplateParser.of(source.template_parser) \
+            if source.template_parser else self.template_parser
+
+    def _compile(self, template: str, template_parser: TemplateParser
+                 ) -> Union[str, DynamicQuery]:
+
+        # Templates without any directives are executed as it is.
+        if not has_directive(template):
+            return template.strip()
+
+        parsed_queries: Optional[List[TwinQuery]] = \
+            self._find_analyzed(template, template_parser)
+        if parsed_queries is not None:
+            return QueryCompiler(parsed_queries).compile()
+
+        if template_parser is TemplateParser.SCANNER:
+            return self._directive_scanner.parse(template)
+
+        # The grammar is loaded only when a template is not found
+        # in the template bundle, and shared in the process.
+        return DynamicParser.shared(self.grammar_cache).parse(template)
+
+    def _find_analyzed(self, template: str, template_parser: TemplateParser
+                       ) -> Optional[List[TwinQuery]]:
+
+        for bundle in (self.template_bundle, self._analyzed):
+            parsed_queries: Optional[List[TwinQuery]] = \
+                bundle.find(template, template_parser.value) \
+                if bundle is not None else None
+            if parsed_queries is not None:
+                return parsed_queries
+        return None
+
+
+def analyze_template(template: str, template_parser: str,
+                     grammar_cache: Optional[Union[Path, str]] = None
+                     ) -> List[TwinQuery]:
+
+    return (
+        DirectiveScanner().analyze(template)
+        if TemplateParser.of(template_parser) is TemplateParser.SCANNER
+        else DynamicParser.shared(grammar_cache).analyze(template)
+    )
+
+
+def _run_now(func: Callable, *args) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except BaseException as exc:
+        future.set_exception(exc)
+    return future
+
+
+def load_template(query: Optional[str], sql_path: Optional[str],
+                  sql_root: Path) -> str:
+
+    if (query is not None) and (sql_path is not None):
+        raise exceptions.DuplicatedQueryArgumentException()
+    if query is not None:
+        return textwrap.dedent(query)
+
+    file_path: Path = sql_root.joinpath(sql_path).resolve()
+    with open(file_path, 'r') as sql_file:
+        return sql_file.read()
@@ -0,0 +1,119 @@
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from ._support import description
+
+
+# Class attributes set by `@twinsqla.table` (not columns of the table).
+TWINSQLA_ATTRIBUTES: frozenset = frozenset((
+    "__twinsqla_table_name", "__twinsqla_primary_keys",
+    "__twinsqla_auto_keys", "__twinsqla_table_plan"
+))
+
+
+@description()
+class TablePlan:
+    """
+    Pre-computed reading of values of entities of a class decorated by
+    `@twinsqla.table`. (The table name and the keys are the class
+    attributes set by `@twinsqla.table`.)
+
+    The values are read by `vars(entity)` and by the slot names of the
+    class and its base classes. The slot names are resolved for each class
+    of the entities at the first entity, because class decorators such as
+    `@dataclass(slots=True)` may be applied after `@twinsqla.table`,
+    and subclasses may have their own slots.
+    """
+
+    def __init__(self):
+        self._extractors: Dict[Type[Any], Callable[[Any], dict]] = {}
+
+    def values(self, entity: Any) -> dict:
+        """
+        Values of the entity with column names, except None values.
+        """
+
+        entity_type: Type[Any] = type(entity)
+        extract: Optional[Callable[[Any], dict]] = \
+            self._extractors.get(entity_type)
+        if extract is None:
+            extract = self._extractors.setdefault(
+                entity_type, extractor_of(entity_type))
+        return extract(entity)
+
+
+def plan_of(entity: Any) -> Optional[TablePlan]:
+    """
+    `TablePlan` of the entity's class or the nearest base class decorated
+    by `@twinsqla.table`. If no classes are decorated, None is returned.
+    """
+
+    return getattr(type(entity), "__twinsqla_table_plan", None)
+
+
+def entity_values(entity: Any) -> dict:
+    """
+    Values of the entity with column names, except None values.
+    """
+
+    plan: Optional[TablePlan] = plan_of(entity)
+    return plan.values(entity) if plan is not None \
+        else values_from_vars(entity)
+
+
+def extractor_of(entity_type: Type[Any]) -> Callable[[Any], dict]:
+    """
+    Function reading values of instances of the class.
+    """
+
+    slots, has_dict = slot_names(entity_type)
+    if not slots:
+        return values_from_vars
+
+    # Slots may not be set.
+    def values_from_slots(entity: Any) -> dict:
+        return _not_none(
+            slots, tuple(getattr(entity, name, None) for name in slots))
+
+    if not has_dict:
+        return values_from_slots
+    return lambda entity: {
+        **values_from_slots(entity), **values_from_vars(entity)}
+
+
+def slot_names(entity_type: Type[Any]) -> Tuple[Tuple[str, ...], bool]:
+    """
+    Slot names of the class and its base classes, and whether instances
+    of the class have `__dict__`.
+    """
+
+    names: list = []
+    has_dict: bool = False
+    for cls in entity_type.__mro__:
+        if cls is object:
+            continue
+        if "__slots__" not in vars(cls):
+            has_dict = True
+            continue
+
+        slots: Any = vars(cls)["__slots__"]
+        for name in (slots, ) if isinstance(slots, str) else tuple(slots):
+            if name == "__dict__":
+                has_dict = True
+            elif name != "__weakref__" and name not in names:
+                names.append(name)
+
+    return (tuple(names), has_dict)
+
+
+def values_from_vars(entity: Any) -> dict:
+    return {
+        key: value for key, value in vars(entity).items()
+        if (value is not None) and (key not in TWINSQLA_ATTRIBUTES)
+    }
+
+
+def _not_none(names: Tuple[str, ...], values: tuple) -> dict:
+    return {
+        name: value for name, value in zip(names, values)
+        if value is not None
+    }
@@ -43,6 +43,53 @@ class InvalidStructureException(TWinSQLAException):
     pass
 
 
+class UnknownTemplateParserException(TWinSQLAException):
+    def __init__(self, template_parser: str, available: List[str]):
+        super().__init__(
+            f"Unknown template parser '{template_parser}'."
+            f" Template parser must be one of {', '.join(available)}."
+        )
+        self.template_parser: str = template_parser
+
+
+class InvalidTemplateBundleException(TWinSQLAException):
+    """
+    Occured in failed to load template bundle file.
+    """
+    pass
+
+
+class TemplateWarmupException(TWinSQLAException):
+    """
+    Occured in failed to compile templates in warming up.
+    All failed templates and exceptions are contained in `failures`.
+    """
+
+    def __init__(self, failures: list):
+        details: List[str] = [
+            f"  sql file '{source.sql_path}' : {exc}"
+            if source.sql_path is not None
+            else f"  query {repr(source.query.strip())} : {exc}"
+            for source, exc in failures
+        ]
+        super().__init__(
+            f"Failed to compile {len(failures)} templates.\n"
+            + "\n".join(details)
+        )
+        self.failures: list = failures
+
+
+class UnsupportedDialectException(TWinSQLAException):
+    def __init__(self, operation: str, dialect_name: str,
+                 available: List[str]):
+        super().__init__(
+            f"The operation '{operation}' is not supported"
+            f" in the database '{dialect_name}'."
+            f" Supported databases are {', '.join(available)}."
+        )
+        self.dialect_name: str = dialect_name
+
+
 class InvalidTableNameException(TWinSQLAException):
     def __init__(self, table_name: str, pattern):
         super().__init__(
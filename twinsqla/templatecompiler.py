@@ -0,0 +1,129 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+import argparse
+import importlib
+import os
+import sys
+
+from ._dynamic_parser import DynamicParser, TwinQuery
+from ._directive_scanner import DirectiveScanner
+from ._sqlbuilder import load_template, TemplateParser
+from ._bundle import TemplateBundle
+from ._registry import template_registry, TemplateSource
+from .exceptions import TWinSQLAException
+
+
+def main():
+    args = init_argument_parser().parse_args()
+    succeeded: bool = execute(
+        to_file=args.to_file, sql_file_root=args.sql_file_root,
+        modules=args.module or [], sql_suffix=args.sql_suffix,
+        template_parser=args.template_parser,
+        grammar_cache=args.grammar_cache)
+    sys.exit(0 if succeeded else 1)
+
+
+def init_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        "Compile TWinSQLA two-way sql templates to a template bundle."
+        " The bundle is loaded by 'TWinSQLA(template_bundle=...)'.")
+    parser.add_argument(
+        "to_file", help="file path to write the template bundle.")
+    parser.add_argument(
+        "--sql_file_root", default=None,
+        help="root directory of sql files. All sql files under this"
+        " directory are compiled. Specify the same directory"
+        " as 'TWinSQLA(sql_file_root=...)'."
+    )
+    parser.add_argument(
+        "--module", action="append",
+        help="python module name with decorated queries (repeatable)."
+        " Queries of decorators in the module are compiled."
+    )
+    parser.add_argument("--sql_suffix", default=".sql",
+                        help="suffix of sql files. Defaults to '.sql'.")
+    parser.add_argument(
+        "--template_parser", default=TemplateParser.GRAMMAR.value,
+        choices=[template_parser.value for template_parser in TemplateParser],
+        help="parser of templates without 'template_parser' specified"
+        " in the decorator, and of sql files. Specify the same parser as"
+        " 'TWinSQLA(template_parser=...)'. Defaults to 'grammar'."
+    )
+    parser.add_argument(
+        "--grammar_cache", default=None,
+        help="file path to write the compiled grammar. Specify the same"
+        " file as 'TWinSQLA(grammar_cache=...)' to skip analyzing the"
+        " grammar at startup."
+    )
+
+    return parser
+
+
+def execute(to_file: str, sql_file_root: Optional[str] = None,
+            modules: Sequence[str] = (), sql_suffix: str = ".sql",
+            template_parser: str = TemplateParser.GRAMMAR.value,
+            grammar_cache: Optional[str] = None) -> bool:
+
+    # Modules in current directory are available as same as 'python -m'.
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    for module in modules:
+        importlib.import_module(module)
+
+    sql_root: Path = Path(sql_file_root) if sql_file_root \
+        else Path(os.getcwd())
+    sources: List[TemplateSource] = template_registry.sources()
+    if sql_file_root:
+        sources.extend(
+            TemplateSource(None, str(sql_file.relative_to(sql_root)))
+            for sql_file in sorted(sql_root.rglob(f"*{sql_suffix}"))
+            if sql_file.is_file()
+        )
+
+    # The grammar is compiled only when a template is parsed by it.
+    analyzers: Dict[TemplateParser, Callable[[str], List[TwinQuery]]] = {
+        TemplateParser.GRAMMAR:
+            lambda template: DynamicParser.shared().analyze(template),
+        TemplateParser.SCANNER: DirectiveScanner().analyze
+    }
+    default_parser: TemplateParser = TemplateParser.of(template_parser)
+    bundle: TemplateBundle = TemplateBundle()
+    failures: List[Tuple[TemplateSource, Exception]] = []
+    for source in sources:
+        try:
+            template: str = load_template(
+                source.query, source.sql_path, sql_root)
+            parser: TemplateParser = \
+                TemplateParser.of(source.template_parser) \
+                if source.template_parser else default_parser
+            if bundle.find(template, parser.value) is None:
+                parsed_queries: List[TwinQuery] = \
+                    analyzers[parser](template)
+                bundle.add(template, parsed_queries, parser.value)
+        except (TWinSQLAException, OSError) as exc:
+            failures.append((source, exc))
+
+    bundle.save(to_file)
+    if grammar_cache:
+        DynamicParser.shared().save_grammar(grammar_cache)
+
+    for source, exc in failures:
+        print(f"Failed to compile {_describe(source)}. Detail : {exc}",
+              file=sys.stderr)
+
+    print(f"Succeed to output template bundle to '{to_file}'."
+          f" ({len(bundle)} templates, {len(failures)} failures)")
+    return len(failures) == 0
+
+
+def _describe(source: TemplateSource) -> str:
+    if source.sql_path is not None:
+        return f"sql file '{source.sql_path}'"
+
+    first_line: str = source.query.strip().splitlines()[0] \
+        if source.query.strip() else ""
+    return f"query '{first_line}'"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,45 @@
 import logging
 from typing import Callable, Any, List, Tuple, NamedTuple, Optional, Union
-from typing import Type, TypeVar, Generic
+from typing import Type, TypeVar, Generic, Dict, Iterator
 from collections import OrderedDict
 from contextlib import contextmanager
+from concurrent.futures import Executor
 from pathlib import Path
 from enum import Enum
 import functools
 import re
 import threading
+import weakref
 
 import sqlalchemy
-from sqlalchemy.engine.base import Engine
+from sqlalchemy.engine.base import Connection, Engine
+from sqlalchemy.engine.interfaces import Dialect
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 
-from ._sqlbuilder import SqlBuilder
+from ._sqlbuilder import SqlBuilder, TemplateParser
 from ._querybindbuilder import (
     QueryBindBuilder, SelectBindBuilder, ExecuteBindBuilder,
     InsertBindBuilder, UpdateBindBuilder, DeleteBindBuilder,
-    QueryContext, PreparedQuery
+    UpsertBindBuilder,
+    PreparedQuery, PreparedBatch, PreparedCopy, CopyResult,
+    STATEMENT_CACHE_SIZE
 )
 from ._resultbuilder import ResultTypeBuilder, ResultType
-from ._support import description, _find_instance, _merge_arguments_to_dict
+from ._cache import CacheInfo
+from ._callplan import CallPlan, DEFAULT_FETCH_SIZE
+from ._prefetch import Prefetcher, start_prefetch
+from ._pagination import keyset, PagedResult
+from ._tableplan import TablePlan
+from ._export import (
+    ExportSink, CsvSink, JsonLinesSink, ArrowSink, Destination,
+    export_result, DEFAULT_EXPORT_BATCH_SIZE, DEFAULT_EXPORT_QUEUE_SIZE
+)
+from ._bundle import TemplateBundle
+from ._registry import template_registry, TemplateSource
+from ._support import (
+    description, _find_instance, _find_instance_in_owner
+)
 from . import exceptions
 
 
@@ -45,18 +63,49 @@ class TWinSQLA:
             Specify the root directory of sql files. Defaults to None.
         cache_size (Optional[int], optional):
             Cache size of loaded query function. Defaults to 128.
+        cache_bytes (Optional[int], optional):
+            Max approximate bytes of cached query functions.
+            If None, only `cache_size` limits the cache. Defaults to None.
+        template_bundle (Optional[Union[Path, str]], optional):
+            File path of template bundle created by `twinsqla-compile`
+            command. Templates in the bundle are available without
+            parsing. Defaults to None.
+        template_parser (str, optional):
+            Parser of two-way sql templates, 'grammar' or 'scanner'.
+            'grammar' parses whole sql statements by the grammar.
+            'scanner' scans only sql comments, string literals and
+            directives, so it is faster and available for sql of any
+            dialects. Defaults to 'grammar'.
+        grammar_cache (Optional[Union[Path, str]], optional):
+            File path to cache the compiled grammar of two-way sql.
+            If the file exists, the grammar is loaded from it without
+            analyzing. If not, the compiled grammar is saved to it.
+            The grammar is compiled once in the process and shared with
+            all TWinSQLA objects. Defaults to None.
     """
 
     def __init__(self, engine: sqlalchemy.engine.base.Engine, *,
                  available_dynamic_query: bool = True,
                  sql_file_root: Optional[Union[Path, str]] = None,
-                 cache_size: Optional[int] = 128):
+                 cache_size: Optional[int] = 128,
+                 cache_bytes: Optional[int] = None,
+                 template_bundle: Optional[Union[Path, str]] = None,
+                 template_parser: str = "grammar",
+                 grammar_cache: Optional[Union[Path, str]] = None):
 
         self._engine: Engine = engine
-        self._sessionmaker: sessionmaker = sessionmaker(bind=engine)
+        self._execution_engine: Engine = _with_compiled_cache(engine)
+        self._stream_engine: Optional[Engine] = None
+        self._sessionmaker: sessionmaker = sessionmaker(
+            bind=self._execution_engine)
         self._sql_builder: SqlBuilder = SqlBuilder(
             available_dynamic_query=available_dynamic_query,
-            sql_file_root=sql_file_root, cache_size=cache_size)
+            sql_file_root=sql_file_root, cache_size=cache_size,
+            template_bundle=TemplateBundle.load(template_bundle)
+            if template_bundle is not None else None,
+            template_parser=template_parser, grammar_cache=grammar_cache,
+            cache_bytes=cache_bytes
+        )
         self._type_builder: ResultTypeBuilder = ResultTypeBuilder(cache_size)
         self._locals: threading.local = threading.local()
         self._logger = logging.getLogger(__name__)
@@ -97,10 +146,92 @@ class TWinSQLA:
             session.rollback()
             raise exc
 
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """
+        Statistics of caches.
+
+        Returns:
+            Dict[str, CacheInfo]: statistics keyed by the cache name.
+                - "query": compiled queries of this object
+                - "result_type": result types of this object
+                - "mapper": row mappers of the result types of this object
+                - "statement": sqlalchemy statements shared in the process
+        """
+
+        return {
+            "query": self._sql_builder.query_cache.info(),
+            "result_type": self._type_builder.cache.info(),
+            "mapper": self._type_builder.mapper_cache.info(),
+            "statement": PreparedQuery.statement_cache.info()
+        }
+
+    def clear_caches(self) -> None:
+        """
+        Clear caches of this object and their statistics.
+        The statement cache shared in the process is not cleared.
+        """
+
+        self._sql_builder.query_cache.clear()
+        self._type_builder.cache.clear()
+        self._type_builder.mapper_cache.clear()
+
+    def warmup(self, *, executor: Optional[Executor] = None,
+               shapes: bool = False) -> None:
+        """
+        Compile all templates of decorated functions before executing.
+
+        In default, templates are loaded and compiled when the decorated
+        functions are called at first. By calling this method in starting
+        application, the first calls do not pay for compiling.
+        Templates of module level decorators and decorators of this object
+        are compiled. Modules with decorated functions need to be imported
+        before calling this method.
+
+        For example:
+            sqla: TWinSQLA = TWinSQLA(engine, sql_file_root="./sql")
+            with ThreadPoolExecutor() as executor:
+                sqla.warmup(executor=executor)
+
+        Args:
+            executor (Optional[Executor], optional):
+                executor to compile templates in parallel, such as
+                `ThreadPoolExecutor` or `ProcessPoolExecutor`.
+                If None, templates are compiled in the calling thread.
+                Defaults to None.
+            shapes (bool, optional):
+                If True, all sql statements of each template (one per
+                combination of blocks selected in if-blocks) are also
+                prepared as sqlalchemy statements. Defaults to False.
+
+        Raises:
+            exceptions.TemplateWarmupException:
+                if any templates are failed to compile.
+                All failures are contained in the exception.
+        """
+
+        sources: List[TemplateSource] = template_registry.sources(owner=self)
+        failures: List[Tuple[TemplateSource, Exception]] = \
+            self._sql_builder.warmup(sources, executor=executor)
+
+        if shapes:
+            failed: List[TemplateSource] = [source for source, _ in failures]
+            for source in sources:
+                if source not in failed:
+                    PreparedQuery.prepare_statements(
+                        self._sql_builder.build_source(source))
+
+        if failures:
+            raise exceptions.TemplateWarmupException(failures)
+
     def select(self, query: Optional[str] = None, *,
                sql_path: Optional[str] = None,
                result_type: Type[Any] = Tuple[OrderedDict, ...],
-               iteratable: bool = False):
+               iteratable: bool = False,
+               template_parser: Optional[str] = None,
+               stream: bool = False,
+               fetch_size: Optional[int] = None,
+               prefetch: int = 0,
+               paginate: Optional[keyset] = None):
         """
         Function decorator of select operation.
         Only one argument `query` or `sql_path` must be specified.
@@ -133,18 +264,45 @@ class TWinSQLA:
                 When you want to fetching iterataly result,
                 then True specified and returned ResultIterator object.
                 Defaults to False.
+            template_parser (Optional[str], optional):
+                parser of two-way sql, 'grammar' or 'scanner'.
+                If None, the parser specified in TWinSQLA is used.
+                Defaults to None.
+            stream (bool, optional):
+                If True, the query is executed with server side cursor
+                (sqlalchemy's `stream_results` option), and the rows are
+                not loaded into client memory all at once.
+                Defaults to False.
+            fetch_size (Optional[int], optional):
+                count of rows fetched at once by ResultIterator.
+                If None, ResultIterator fetches 1000 rows at once with
+                `stream=True` or `prefetch`, or one row at once without
+                them. Defaults to None.
+            prefetch (int, optional):
+                count of batches fetched and converted ahead by
+                a background thread of ResultIterator.
+                If 0, no batches are read ahead. Defaults to 0.
+            paginate (Optional[keyset], optional):
+                If specified, the query is executed for each page by
+                keyset pagination, and the results of all pages are
+                returned continuously. Defaults to None.
 
         Returns:
             Callable: Function decorator for select query
         """
 
-        return _do_select(query, sql_path, result_type, iteratable, sqla=self)
+        return _do_select(query, sql_path, result_type, iteratable,
+                          template_parser=template_parser, sqla=self,
+                          stream=stream, fetch_size=fetch_size,
+                          prefetch=prefetch, paginate=paginate)
 
     def insert(self, query: Optional[str] = None, *,
                sql_path: Optional[str] = None,
                table_name: Optional[str] = None,
                result_type: Type[Any] = None,
-               iteratable: bool = False):
+               iteratable: bool = False,
+               template_parser: Optional[str] = None,
+               bulk: Union[bool, int, str] = False):
         """
         Function decorator of insert operation.
         In constructing insert query by yourself, you need to specify either
@@ -169,19 +327,37 @@ class TWinSQLA:
                 In almost cases, this argument need not to specified.
                 The only useful case is in using "INSERT RETURNING" query.
                 Defaults to False.
+            template_parser (Optional[str], optional):
+                parser of two-way sql, 'grammar' or 'scanner'.
+                If None, the parser specified in TWinSQLA is used.
+                Defaults to None.
+            bulk (Union[bool, int, str], optional):
+                If True, entities are inserted by multi-row
+                "INSERT ... VALUES (...), (...)" statements in one
+                transaction. The count of rows in each statement is limited
+                by the count of bind parameters of the database.
+                If int, it is the max count of rows in each statement.
+                If "copy", entities are inserted by "COPY ... FROM STDIN"
+                in PostgreSQL with psycopg2, and by multi-row insert
+                statements in other databases.
+                Available only in constructing query by this decorator.
+                Defaults to False.
 
         Returns:
             Callable: Function decorator for insert query
         """
 
         return _do_insert(query, sql_path, table_name, result_type, iteratable,
+                          template_parser=template_parser, bulk=bulk,
                           sqla=self)
 
     def update(self, query: Optional[str] = None, *,
                sql_path: Optional[str] = None,
                table_name: Optional[str] = None,
                condition_columns: Optional[Union[str, Tuple[str, ...]]] = None,
-               result_type: Type[Any] = None, iteratable: bool = False):
+               result_type: Type[Any] = None, iteratable: bool = False,
+               template_parser: Optional[str] = None,
+               bulk: Union[bool, int] = False):
         """
         Function decorator of update operation.
         In constructing update query by yourself, you need to specify either
@@ -217,19 +393,34 @@ class TWinSQLA:
                 In almost cases, this argument need not to specified.
                 The only useful case is in using "UPDATE RETURNING" query.
                 Defaults to False.
+            template_parser (Optional[str], optional):
+                parser of two-way sql, 'grammar' or 'scanner'.
+                If None, the parser specified in TWinSQLA is used.
+                Defaults to None.
+            bulk (Union[bool, int], optional):
+                If True, entities are updated by statements with multiple
+                rows in one transaction, "UPDATE ... FROM (VALUES ...)"
+                in PostgreSQL and "UPDATE ... SET col = CASE ... END"
+                in other databases. If int, it is the max count of rows
+                in each statement.
+                Available only in constructing query by this decorator.
+                Defaults to False.
 
         Returns:
             Callable: Function decorator for update query
         """
 
         return _do_update(query, sql_path, table_name, condition_columns,
-                          result_type, iteratable, sqla=self)
+                          result_type, iteratable,
+                          template_parser=template_parser, bulk=bulk,
+                          sqla=self)
 
     def delete(self, query: Optional[str] = None, *,
                sql_path: Optional[str] = None,
                table_name: Optional[str] = None,
                condition_columns: Optional[Union[str, Tuple[str, ...]]] = None,
-               result_type: Type[Any] = None, iteratable: bool = False):
+               result_type: Type[Any] = None, iteratable: bool = False,
+               template_parser: Optional[str] = None):
         """
         Function decorator of delete operation.
         In constructing delete query by yourself, you need to specify either
@@ -245,6 +436,12 @@ class TWinSQLA:
                 by decorating '@twinsqla.table' with `pk` parameter
                 or by decorator argument 'condition_columns'.
 
+        Multiple entities are deleted by statements such as
+        "DELETE FROM table WHERE pk IN (...)" in one transaction.
+        Composite keys are matched by "(a, b) IN ((...), ...)",
+        or by "(a = ... AND b = ...) OR ..." in databases without
+        row value constructors.
+
         Args:
             query (Optional[str], optional):
                 delete query (available TwoWay SQL). Defaults to None.
@@ -265,18 +462,90 @@ class TWinSQLA:
                 In almost cases, this argument need not to specified.
                 The only useful case is in using "DELETE RETURNING" query.
                 Defaults to False.
+            template_parser (Optional[str], optional):
+                parser of two-way sql, 'grammar' or 'scanner'.
+                If None, the parser specified in TWinSQLA is used.
+                Defaults to None.
 
         Returns:
             Callable: Function decorator for delete query
         """
 
         return _do_delete(query, sql_path, table_name, condition_columns,
-                          result_type, iteratable, sqla=self)
+                          result_type, iteratable,
+                          template_parser=template_parser, sqla=self)
+
+    def upsert(self, query: Optional[str] = None, *,
+               sql_path: Optional[str] = None,
+               table_name: Optional[str] = None,
+               condition_columns: Optional[Union[str, Tuple[str, ...]]] = None,
+               result_type: Type[Any] = None, iteratable: bool = False,
+               template_parser: Optional[str] = None,
+               bulk: Union[bool, int] = False):
+        """
+        Function decorator of insert-or-update operation.
+        In constructing upsert query by yourself, you need to specify either
+        one of the arguments `query` or `sql_path`.
+
+        In neither `query` nor `sql_path` are specified, this decorator creates
+        upsert query with arguments of decorated method.
+        In this case, you need follows.
+            1. To specify upserted table name
+                by decorating '@twinsqla.table' to entity class.
+                or by decorator argument 'table_name'
+            2. To specifry the column names of the conflict target
+                by decorating '@twinsqla.table' with `pk` parameter
+                or by decorator argument 'condition_columns'.
+
+        The query is "INSERT ... ON CONFLICT (pk) DO UPDATE SET ..."
+        in PostgreSQL and SQLite, and "INSERT ... ON DUPLICATE KEY UPDATE ..."
+        in MySQL. Other databases are not supported.
+
+        Args:
+            query (Optional[str], optional):
+                upsert query (available TwoWay SQL). Defaults to None.
+            sql_path (Optional[str], optional):
+                file path with sql (available TwoWay SQL). Defaults to None.
+            table_name (Optional[str], optional):
+                table name for upserting. Defaults to None.
+            condition_columns (
+                Optional[Union[str, Tuple[str, ...]]], optional
+            ):
+                column names of the conflict target. In almost cases,
+                you are recommended to specify primary key names of the table.
+                Defaults to None.
+            result_type (Type[Any], optional):
+                When constructing "RETURNING" query, it is useful to
+                specify return type. Defaults to None.
+            iteratable (bool, optional):
+                In almost cases, this argument need not to specified.
+                The only useful case is in using "RETURNING" query.
+                Defaults to False.
+            template_parser (Optional[str], optional):
+                parser of two-way sql, 'grammar' or 'scanner'.
+                If None, the parser specified in TWinSQLA is used.
+                Defaults to None.
+            bulk (Union[bool, int], optional):
+                If True, entities are upserted by multi-row statements
+                in one transaction. If int, it is the max count of rows
+                in each statement.
+                Available only in constructing query by this decorator.
+                Defaults to False.
+
+        Returns:
+            Callable: Function decorator for upsert query
+        """
+
+        return _do_upsert(query, sql_path, table_name, condition_columns,
+                          result_type, iteratable,
+                          template_parser=template_parser, bulk=bulk,
+                          sqla=self)
 
     def execute(self, query: Optional[str] = None, *,
                 sql_path: Optional[str] = None,
                 result_type: Type[Any] = Tuple[OrderedDict, ...],
-                iteratable: bool = False):
+                iteratable: bool = False,
+                template_parser: Optional[str] = None):
         """
         Function decorator of any operation.
         Only one argument `query` or `sql_path` must be specified.
@@ -295,22 +564,135 @@ class TWinSQLA:
                 When you want to fetching iterataly result,
                 then True specified and returned ResultIterator object.
                 Defaults to False.
+            template_parser (Optional[str], optional):
+                parser of two-way sql, 'grammar' or 'scanner'.
+                If None, the parser specified in TWinSQLA is used.
+                Defaults to None.
 
         Returns:
             Callable: Function decorator for select query
         """
 
-        return _do_execute(query, sql_path, result_type, iteratable, sqla=self)
+        return _do_execute(query, sql_path, result_type, iteratable,
+                           template_parser=template_parser, sqla=self)
+
+    def _execute_query(
+        self, prepared: Union[PreparedQuery, PreparedBatch, PreparedCopy],
+        stream: bool = False
+    ) -> any:
+        if isinstance(prepared, PreparedBatch):
+            return self._execute_batch(prepared)
+        if isinstance(prepared, PreparedCopy):
+            return self._execute_batch(PreparedBatch([prepared]))
 
-    def _execute_query(self, prepared: PreparedQuery) -> any:
         query: sqlalchemy.sql.text = prepared.statement()
         bind_params: Union[dict, List[dict]] = prepared.bind_params()
 
-        self._logger.info(f"Execute query : {query.text}")
+        self._logger.info("Execute query : %s", query.text)
 
         session = getattr(self._locals, 'session', None)
+        if stream:
+            # Server side cursor is used with the option `stream_results`.
+            executor: Union[Connection, Engine] = \
+                session.connection().execution_options(stream_results=True) \
+                if session else self._streaming_engine()
+            return executor.execute(query, bind_params)
+
         return session.execute(query, bind_params) if session \
-            else self._engine.execute(query, bind_params)
+            else self._execution_engine.execute(query, bind_params)
+
+    def _execute_pages(self, prepared: PreparedQuery, pagination: keyset,
+                       dialect_name: str, stream: bool = False
+                       ) -> PagedResult:
+
+        # The executor is fixed here, because the pages may be executed
+        # by the prefetching thread without the session of this thread.
+        session = getattr(self._locals, 'session', None)
+        connection: Optional[Connection] = session.connection() \
+            if session else None
+        own_connection: bool = connection is None \
+            and not pagination.new_connection
+        if own_connection:
+            connection = self._execution_engine.connect()
+
+        executor: Union[Connection, Engine] = (
+            connection.execution_options(stream_results=True) if stream
+            else connection
+        ) if connection is not None else (
+            self._streaming_engine() if stream else self._execution_engine
+        )
+
+        def execute_page(last_key: Optional[tuple]) -> Any:
+            page: PreparedQuery = pagination.page_query(
+                prepared, dialect_name, last_key)
+            query: sqlalchemy.sql.text = page.statement()
+            self._logger.info("Execute query : %s", query.text)
+            return executor.execute(query, page.bind_params())
+
+        return PagedResult(
+            pagination, execute_page,
+            on_close=connection.close if own_connection else None)
+
+    def _streaming_engine(self) -> Engine:
+        engine: Optional[Engine] = self._stream_engine
+        if engine is None:
+            engine = self._execution_engine.execution_options(
+                stream_results=True)
+            self._stream_engine = engine
+        return engine
+
+    def _execute_batch(self, batch: PreparedBatch) -> any:
+        session = getattr(self._locals, 'session', None)
+        if session:
+            return self._execute_all(session.connection(), batch)
+
+        with self._execution_engine.begin() as connection:
+            return self._execute_all(connection, batch)
+
+    def _execute_all(self, connection: Connection, batch: PreparedBatch
+                     ) -> any:
+        result: Optional[Any] = None
+        for prepared in batch.queries:
+            if isinstance(prepared, PreparedCopy):
+                result = self._copy(connection, prepared)
+                continue
+
+            query: sqlalchemy.sql.text = prepared.statement()
+            self._logger.info("Execute query : %s", query.text)
+            result = connection.execute(query, prepared.bind_params())
+        return result
+
+    def _copy(self, connection: Connection, prepared: PreparedCopy
+              ) -> CopyResult:
+        statement: str = prepared.statement()
+        self._logger.info("Execute query : %s", statement)
+
+        # "COPY ... FROM STDIN" is available only with DBAPI cursor.
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(statement, prepared.buffer())
+            return CopyResult(cursor.rowcount)
+        finally:
+            cursor.close()
+
+
+def _with_compiled_cache(engine: Engine) -> Engine:
+    # sqlalchemy >= 1.4 caches compiled statements in engine by default.
+    # In sqlalchemy < 1.4, compiled statements are cached only when
+    # the execution option 'compiled_cache' is specified.
+    # Because cached `TextClause` objects are used as the cache key,
+    # the compiled forms are reused in each execution.
+    if _SQLALCHEMY_VERSION >= (1, 4) \
+            or "compiled_cache" in engine.get_execution_options():
+        return engine
+
+    return engine.execution_options(
+        compiled_cache=sqlalchemy.util.LRUCache(STATEMENT_CACHE_SIZE))
+
+
+_SQLALCHEMY_VERSION: Tuple[int, ...] = tuple(
+    int(number) for number in re.findall(r"\d+", sqlalchemy.__version__)[:2]
+)
 
 
 _PATTERN_TABLE_NAME = re.compile(r"\A[a-zA-Z_][a-zA-Z0-9_]*\Z")
@@ -370,14 +752,108 @@ def table(name: str, *,
         setattr(cls, "__twinsqla_table_name", name)
         setattr(cls, "__twinsqla_primary_keys", primary_keys)
         setattr(cls, "__twinsqla_auto_keys", auto_keys)
+        setattr(cls, "__twinsqla_table_plan", TablePlan())
         return cls
 
     return _table
 
 
+# Attribute of dao instances with the bound TWinSQLA object.
+_DAO_BINDING: str = "__twinsqla_bound_sqla"
+
+# Bound TWinSQLA objects of dao instances which cannot have the attribute
+# (with `__slots__`), keyed by `id()` and removed when the dao is collected.
+_dao_bindings: Dict[int, TWinSQLA] = {}
+
+
+def dao(cls):
+    """
+    Class decorator to bind TWinSQLA object to dao instances.
+
+    Without this decorator, function decorators such as `@twinsqla.select`
+    search TWinSQLA object in the dao instance in every calling.
+    With this decorator, TWinSQLA object is searched only once
+    when each dao instance is constructed, and stored in the dao instance.
+    (Even dao instances unhashable or compared as equal, such as
+    dataclasses, have each binding.)
+
+    The TWinSQLA object is searched by attributes named 'sqla' or 'twinsqla'
+    at first, and by all attributes of the instance at second.
+    If not found in constructing, it is searched again at the first call.
+    Notice that reassigning another TWinSQLA object to the dao instance
+    after the binding is not reflected.
+
+    For example:
+        @twinsqla.dao
+        class StaffDao:
+            def __init__(self, sqla: TWinSQLA):
+                self.sqla: TWinSQLA = sqla
+
+            @twinsqla.select(...)
+            def fetch(self, more_than_id: int) -> List[Staff]:
+                pass
+
+    Returns:
+        type: decorated class
+    """
+
+    original_init: Callable = cls.__init__
+
+    @functools.wraps(original_init)
+    def __init__(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        _bind_dao(self)
+
+    cls.__init__ = __init__
+    setattr(cls, "__twinsqla_dao", True)
+    return cls
+
+
+def _bind_dao(dao_obj: Any) -> Optional[TWinSQLA]:
+    sqla_obj: Optional[TWinSQLA] = _find_instance_in_owner(
+        TWinSQLA, ["sqla", "twinsqla"], dao_obj)
+    if sqla_obj is None:
+        return None
+
+    try:
+        # `object.__setattr__` is available for frozen dataclasses.
+        object.__setattr__(dao_obj, _DAO_BINDING, sqla_obj)
+    except AttributeError:
+        _bind_dao_by_id(dao_obj, sqla_obj)
+    return sqla_obj
+
+
+def _bind_dao_by_id(dao_obj: Any, sqla_obj: TWinSQLA) -> None:
+    key: int = id(dao_obj)
+    try:
+        weakref.finalize(dao_obj, _dao_bindings.pop, key, None)
+    except TypeError:
+        # not weak-referenceable instance cannot be cached.
+        return
+    _dao_bindings[key] = sqla_obj
+
+
+def _is_dao(owner: Optional[Any]) -> bool:
+    return owner is not None and getattr(owner, "__twinsqla_dao", False)
+
+
+def _bound_twinsqla(owner: Optional[Any]) -> Optional[TWinSQLA]:
+    if not _is_dao(owner):
+        return None
+
+    sqla_obj: Optional[TWinSQLA] = getattr(owner, _DAO_BINDING, None) \
+        or _dao_bindings.get(id(owner))
+    return sqla_obj if sqla_obj is not None else _bind_dao(owner)
+
+
 def select(query: Optional[str] = None, *, sql_path: Optional[str] = None,
            result_type: Type[Any] = Tuple[OrderedDict, ...],
-           iteratable: bool = False):
+           iteratable: bool = False,
+           template_parser: Optional[str] = None,
+           stream: bool = False,
+           fetch_size: Optional[int] = None,
+           prefetch: int = 0,
+           paginate: Optional[keyset] = None):
     """
     Function decorator of select operation.
     Only one argument `query` or `sql_path` must be specified.
@@ -409,27 +885,61 @@ def select(query: Optional[str] = None, *, sql_path: Optional[str] = None,
         iteratable (bool, optional):
             When you want to fetching iterataly result, then True specified
             and returned ResultIterator object. Defaults to False.
+        template_parser (Optional[str], optional):
+            parser of two-way sql, 'grammar' or 'scanner'.
+            If None, the parser specified in TWinSQLA is used.
+            Defaults to None.
+        stream (bool, optional):
+            If True, the query is executed with server side cursor
+            (sqlalchemy's `stream_results` option), and the rows are
+            not loaded into client memory all at once. Defaults to False.
+        fetch_size (Optional[int], optional):
+            count of rows fetched at once by ResultIterator.
+            If None, ResultIterator fetches 1000 rows at once with
+            `stream=True` or `prefetch`, or one row at once without them.
+            Defaults to None.
+        prefetch (int, optional):
+            count of batches fetched and converted ahead by
+            a background thread of ResultIterator.
+            If 0, no batches are read ahead. Defaults to 0.
+        paginate (Optional[keyset], optional):
+            If specified, the query is executed for each page by
+            keyset pagination, and the results of all pages are
+            returned continuously. Defaults to None.
 
     Returns:
         Callable: Function decorator
     """
 
-    return _do_select(query, sql_path, result_type, iteratable)
+    return _do_select(query, sql_path, result_type, iteratable,
+                      template_parser=template_parser,
+                      stream=stream, fetch_size=fetch_size,
+                      prefetch=prefetch, paginate=paginate)
 
 
 def _do_select(query: Optional[str], sql_path: Optional[str],
                result_type: Type[Any], iteratable: bool,
-               sqla: Optional[TWinSQLA] = None):
+               template_parser: Optional[str] = None,
+               sqla: Optional[TWinSQLA] = None,
+               stream: bool = False,
+               fetch_size: Optional[int] = None,
+               prefetch: int = 0,
+               paginate: Optional[keyset] = None):
 
     return QueryType.SELECT.query_decorator(
         sqla=sqla, query=query, sql_path=sql_path,
-        result_type=result_type, iteratable=iteratable
+        result_type=result_type, iteratable=iteratable,
+        template_parser=template_parser,
+        stream=stream, fetch_size=fetch_size, prefetch=prefetch,
+        paginate=paginate
     )
 
 
 def insert(query: Optional[str] = None, *, sql_path: Optional[str] = None,
            table_name: Optional[str] = None, result_type: Type[Any] = None,
-           iteratable: bool = False):
+           iteratable: bool = False,
+           template_parser: Optional[str] = None,
+           bulk: Union[bool, int, str] = False):
     """
     Function decorator of insert operation.
     In constructing insert query by yourself, you need to specify either
@@ -454,28 +964,49 @@ def insert(query: Optional[str] = None, *, sql_path: Optional[str] = None,
             In almost cases, this argument need not to specified.
             The only useful case is in using "INSERT RETURNING" query.
             Defaults to False.
+        template_parser (Optional[str], optional):
+            parser of two-way sql, 'grammar' or 'scanner'.
+            If None, the parser specified in TWinSQLA is used.
+            Defaults to None.
+        bulk (Union[bool, int, str], optional):
+            If True, entities are inserted by multi-row
+            "INSERT ... VALUES (...), (...)" statements in one transaction.
+            The count of rows in each statement is limited by the count of
+            bind parameters of the database.
+            If int, it is the max count of rows in each statement.
+            If "copy", entities are inserted by "COPY ... FROM STDIN"
+            in PostgreSQL with psycopg2, and by multi-row insert
+            statements in other databases.
+            Available only in constructing query by this decorator.
+            Defaults to False.
 
     Returns:
         Callable: Function decorator for insert query
     """
 
-    return _do_insert(query, sql_path, table_name, result_type, iteratable)
+    return _do_insert(query, sql_path, table_name, result_type, iteratable,
+                      template_parser=template_parser, bulk=bulk)
 
 
 def _do_insert(query: Optional[str], sql_path: Optional[str],
                table_name: Optional[str], result_type: Type[Any],
-               iteratable: bool, sqla: Optional[TWinSQLA] = None):
+               iteratable: bool, template_parser: Optional[str] = None,
+               bulk: Union[bool, int, str] = False,
+               sqla: Optional[TWinSQLA] = None):
 
     return QueryType.INSERT.query_decorator(
         sqla=sqla, query=query, sql_path=sql_path, table_name=table_name,
-        result_type=result_type, iteratable=iteratable
+        result_type=result_type, iteratable=iteratable,
+        template_parser=template_parser, bulk=bulk
     )
 
 
 def update(query: Optional[str] = None, *, sql_path: Optional[str] = None,
            table_name: Optional[str] = None,
            condition_columns: Optional[Union[str, Tuple[str, ...]]] = None,
-           result_type: Type[Any] = None, iteratable: bool = False):
+           result_type: Type[Any] = None, iteratable: bool = False,
+           template_parser: Optional[str] = None,
+           bulk: Union[bool, int] = False):
     """
     Function decorator of update operation.
     In constructing update query by yourself, you need to specify either
@@ -509,19 +1040,33 @@ def update(query: Optional[str] = None, *, sql_path: Optional[str] = None,
             In almost cases, this argument need not to specified.
             The only useful case is in using "UPDATE RETURNING" query.
             Defaults to False.
+        template_parser (Optional[str], optional):
+            parser of two-way sql, 'grammar' or 'scanner'.
+            If None, the parser specified in TWinSQLA is used.
+            Defaults to None.
+        bulk (Union[bool, int], optional):
+            If True, entities are updated by statements with multiple rows
+            in one transaction, "UPDATE ... FROM (VALUES ...)" in PostgreSQL
+            and "UPDATE ... SET col = CASE ... END" in other databases.
+            If int, it is the max count of rows in each statement.
+            Available only in constructing query by this decorator.
+            Defaults to False.
 
     Returns:
         Callable: Function decorator for update query
     """
 
     return _do_update(query, sql_path, table_name, condition_columns,
-                      result_type, iteratable)
+                      result_type, iteratable,
+                      template_parser=template_parser, bulk=bulk)
 
 
 def _do_update(query: Optional[str], sql_path: Optional[str],
                table_name: Optional[str],
                condition_columns: Optional[Union[str, Tuple[str, ...]]],
                result_type: Type[Any], iteratable: bool,
+               template_parser: Optional[str] = None,
+               bulk: Union[bool, int] = False,
                sqla: Optional[TWinSQLA] = None):
 
     target_condition_columns: Tuple[str, ...] = _to_tuple(condition_columns)
@@ -529,14 +1074,16 @@ def _do_update(query: Optional[str], sql_path: Optional[str],
     return QueryType.UPDATE.query_decorator(
         sqla=sqla, query=query, sql_path=sql_path,
         table_name=table_name, condition_columns=target_condition_columns,
-        result_type=result_type, iteratable=iteratable
+        result_type=result_type, iteratable=iteratable,
+        template_parser=template_parser, bulk=bulk
     )
 
 
 def delete(query: Optional[str] = None, *, sql_path: Optional[str] = None,
            table_name: Optional[str] = None,
            condition_columns: Optional[Union[str, Tuple[str, ...]]] = None,
-           result_type: Type[Any] = None, iteratable: bool = False):
+           result_type: Type[Any] = None, iteratable: bool = False,
+           template_parser: Optional[str] = None):
     """
     Function decorator of delete operation.
     In constructing delete query by yourself, you need to specify either
@@ -552,6 +1099,12 @@ def delete(query: Optional[str] = None, *, sql_path: Optional[str] = None,
             by decorating '@twinsqla.table' with `pk` parameter
             or by decorator argument 'condition_columns'.
 
+    Multiple entities are deleted by statements such as
+    "DELETE FROM table WHERE pk IN (...)" in one transaction.
+    Composite keys are matched by "(a, b) IN ((...), ...)",
+    or by "(a = ... AND b = ...) OR ..." in databases without
+    row value constructors.
+
     Args:
         query (Optional[str], optional):
             delete query (available TwoWay SQL). Defaults to None.
@@ -570,19 +1123,25 @@ def delete(query: Optional[str] = None, *, sql_path: Optional[str] = None,
             In almost cases, this argument need not to specified.
             The only useful case is in using "DELETE RETURNING" query.
             Defaults to False.
+        template_parser (Optional[str], optional):
+            parser of two-way sql, 'grammar' or 'scanner'.
+            If None, the parser specified in TWinSQLA is used.
+            Defaults to None.
 
     Returns:
         Callable: Function decorator for delete query
     """
 
     return _do_delete(query, sql_path, table_name, condition_columns,
-                      result_type, iteratable)
+                      result_type, iteratable,
+                      template_parser=template_parser)
 
 
 def _do_delete(query: Optional[str], sql_path: Optional[str],
                table_name: Optional[str],
                condition_columns: Union[str, Tuple[str, ...]],
                result_type: Type[Any], iteratable: bool,
+               template_parser: Optional[str] = None,
                sqla: Optional[TWinSQLA] = None):
 
     target_condition_columns: Tuple[str, ...] = _to_tuple(condition_columns)
@@ -590,13 +1149,96 @@ def _do_delete(query: Optional[str], sql_path: Optional[str],
     return QueryType.DELETE.query_decorator(
         sqla=sqla, query=query, sql_path=sql_path,
         table_name=table_name, condition_columns=target_condition_columns,
-        result_type=result_type, iteratable=iteratable
+        result_type=result_type, iteratable=iteratable,
+        template_parser=template_parser
+    )
+
+
+def upsert(query: Optional[str] = None, *, sql_path: Optional[str] = None,
+           table_name: Optional[str] = None,
+           condition_columns: Optional[Union[str, Tuple[str, ...]]] = None,
+           result_type: Type[Any] = None, iteratable: bool = False,
+           template_parser: Optional[str] = None,
+           bulk: Union[bool, int] = False):
+    """
+    Function decorator of insert-or-update operation.
+    In constructing upsert query by yourself, you need to specify either
+    one of the arguments `query` or `sql_path`.
+
+    In neither `query` nor `sql_path` are specified, this decorator creates
+    upsert query with arguments of decorated method.
+    In this case, you need follows.
+        1. To specify upserted table name
+            by decorating '@twinsqla.table' to entity class.
+            or by decorator argument 'table_name'
+        2. To specifry the column names of the conflict target
+            by decorating '@twinsqla.table' with `pk` parameter
+            or by decorator argument 'condition_columns'.
+
+    The query is "INSERT ... ON CONFLICT (pk) DO UPDATE SET ..."
+    in PostgreSQL and SQLite, and "INSERT ... ON DUPLICATE KEY UPDATE ..." in
+    MySQL. Other databases are not supported.
+
+    Args:
+        query (Optional[str], optional):
+            upsert query (available TwoWay SQL). Defaults to None.
+        sql_path (Optional[str], optional):
+            file path with sql (available TwoWay SQL). Defaults to None.
+        table_name (Optional[str], optional):
+            table name for upserting. Defaults to None.
+        condition_columns (Optional[Union[str, Tuple[str, ...]]], optional):
+            column names of the conflict target. In almost cases,
+            you are recommended to specify primary key names of the table.
+            Defaults to None.
+        result_type (Type[Any], optional):
+            When constructing "RETURNING" query, it is useful to
+            specify return type. Defaults to None.
+        iteratable (bool, optional):
+            In almost cases, this argument need not to specified.
+            The only useful case is in using "RETURNING" query.
+            Defaults to False.
+        template_parser (Optional[str], optional):
+            parser of two-way sql, 'grammar' or 'scanner'.
+            If None, the parser specified in TWinSQLA is used.
+            Defaults to None.
+        bulk (Union[bool, int], optional):
+            If True, entities are upserted by multi-row statements
+            in one transaction. If int, it is the max count of rows
+            in each statement.
+            Available only in constructing query by this decorator.
+            Defaults to False.
+
+    Returns:
+        Callable: Function decorator for upsert query
+    """
+
+    return _do_upsert(query, sql_path, table_name, condition_columns,
+                      result_type, iteratable,
+                      template_parser=template_parser, bulk=bulk)
+
+
+def _do_upsert(query: Optional[str], sql_path: Optional[str],
+               table_name: Optional[str],
+               condition_columns: Optional[Union[str, Tuple[str, ...]]],
+               result_type: Type[Any], iteratable: bool,
+               template_parser: Optional[str] = None,
+               bulk: Union[bool, int] = False,
+               sqla: Optional[TWinSQLA] = None):
+
+    target_condition_columns: Tuple[str, ...] = _to_tuple(condition_columns)
+
+    return QueryType.UPSERT.query_decorator(
+        sqla=sqla, query=query, sql_path=sql_path,
+        table_name=table_name, condition_columns=target_condition_columns,
+        result_type=result_type, iteratable=iteratable,
+        template_parser=template_parser, bulk=bulk
     )
 
 
 def execute(query: Optional[str] = None, *, sql_path: Optional[str] = None,
             result_type: Type[Any] = Tuple[OrderedDict, ...],
-            iteratable: bool = False):
+            iteratable: bool = False,
+            template_parser: Optional[str] = None):
     """
     Function decorator of any operation.
     Only one argument `query` or `sql_path` must be specified.
@@ -614,21 +1256,28 @@ def execute(query: Optional[str] = None, *, sql_path: Optional[str] = None,
         iteratable (bool, optional):
             When you want to fetching iterataly result, then True specified
             and returned ResultIterator object. Defaults to False.
+        template_parser (Optional[str], optional):
+            parser of two-way sql, 'grammar' or 'scanner'.
+            If None, the parser specified in TWinSQLA is used.
+            Defaults to None.
 
     Returns:
         Callable: Function decorator
     """
 
-    return _do_execute(query, sql_path, result_type, iteratable)
+    return _do_execute(query, sql_path, result_type, iteratable,
+                       template_parser=template_parser)
 
 
 def _do_execute(query: Optional[str], sql_path: Optional[str],
                 result_type: Type[Any], iteratable: bool,
+                template_parser: Optional[str] = None,
                 sqla: Optional[TWinSQLA] = None):
 
     return QueryType.EXECUTE.query_decorator(
         sqla=sqla, query=query, sql_path=sql_path,
-        result_type=result_type, iteratable=iteratable
+        result_type=result_type, iteratable=iteratable,
+        template_parser=template_parser
     )
 
 
@@ -653,9 +1302,31 @@ class QueryExecutor():
                         table_name: Optional[str] = None,
                         condition_columns: Tuple[str, ...] = (),
                         result_type: Type[Any] = None,
-                        iteratable: bool = False):
+                        iteratable: bool = False,
+                        template_parser: Optional[str] = None,
+                        bulk: Union[bool, int, str] = False,
+                        stream: bool = False,
+                        fetch_size: Optional[int] = None,
+                        prefetch: int = 0,
+                        paginate: Optional[keyset] = None):
+
+        target_parser: Optional[TemplateParser] = \
+            TemplateParser.of(template_parser) \
+            if template_parser is not None else None
+        template_registry.register(
+            query, sql_path,
+            target_parser.value if target_parser is not None else None,
+            owner=sqla)
 
         def _execute(func: Callable):
+            plan: CallPlan = CallPlan(
+                func, self.bind_builder, query=query, sql_path=sql_path,
+                table_name=table_name, condition_columns=condition_columns,
+                result_type=result_type, iteratable=iteratable,
+                template_parser=target_parser, bulk=bulk,
+                stream=stream, fetch_size=fetch_size, prefetch=prefetch,
+                paginate=paginate
+            )
 
             @functools.wraps(func)
             def wrapper(*args, **kwargs) -> Union[
@@ -663,38 +1334,50 @@ class QueryExecutor():
             ]:
 
                 sqla_obj: TWinSQLA = sqla if sqla \
-                    else _find_twinsqla(func, args, kwargs)
-                bind_params: dict = _merge_arguments_to_dict(
-                    func, args, kwargs, [sqla_obj])
-
-                context: QueryContext = QueryContext(
-                    query=query, sql_path=sql_path, table_name=table_name,
-                    condition_columns=condition_columns,
-                    bind_params=bind_params, triggered_function=func,
-                    function_args=args, function_kwargs=kwargs
-                )
-                prepared: PreparedQuery = self.bind_builder.bind(
-                    builder=sqla_obj._sql_builder, context=context
-                )
-
-                results = sqla_obj._execute_query(prepared)
-
-                if result_type is None:
+                    else _find_twinsqla(plan, args, kwargs)
+                bind_params: dict = plan.bind_arguments(
+                    args, kwargs, sqla_obj)
+
+                dialect: Dialect = sqla_obj._execution_engine.dialect
+                prepared: Union[PreparedQuery, PreparedBatch, PreparedCopy] \
+                    = plan.binder.bind(
+                        builder=sqla_obj._sql_builder,
+                        context=plan.context(
+                            bind_params, args, kwargs,
+                            dialect.name, dialect.driver))
+
+                results = sqla_obj._execute_query(
+                    prepared, stream=plan.stream) \
+                    if plan.paginate is None \
+                    else sqla_obj._execute_pages(
+                        prepared, plan.paginate, dialect.name,
+                        stream=plan.stream)
+
+                return_type: Optional[ResultType[Any]] = \
+                    plan.resolve_result_type(sqla_obj._type_builder)
+                if return_type is None:
                     return None
-                return_type: ResultType[Any] = \
-                    sqla_obj._type_builder.build(result_type)
 
-                return return_type.to_values(results) if iteratable is False \
-                    else ResultIterator[Any](results, return_type)
+                return return_type.to_values(results) \
+                    if plan.iteratable is False \
+                    else ResultIterator[Any](
+                        results, return_type, fetch_size=plan.fetch_size,
+                        prefetch=plan.prefetch)
 
             return wrapper
 
         return _execute
 
 
-def _find_twinsqla(func: Callable, args: tuple, kwargs: dict) -> TWinSQLA:
+def _find_twinsqla(plan: CallPlan, args: tuple, kwargs: dict) -> TWinSQLA:
+    owner: Optional[Any] = plan.owner(args)
+    if _is_dao(owner):
+        # The dao instance is already searched in binding.
+        return _bound_twinsqla(owner) or _find_instance(
+            TWinSQLA, [], plan.function, None, args, kwargs)
+
     return _find_instance(
-        TWinSQLA, ["sqla", "twinsqla"], func, args, kwargs
+        TWinSQLA, ["sqla", "twinsqla"], plan.function, owner, args, kwargs
     )
 
 
@@ -703,6 +1386,7 @@ class QueryType(Enum):
     INSERT = QueryExecutor(InsertBindBuilder())
     UPDATE = QueryExecutor(UpdateBindBuilder())
     DELETE = QueryExecutor(DeleteBindBuilder())
+    UPSERT = QueryExecutor(UpsertBindBuilder())
     EXECUTE = QueryExecutor(ExecuteBindBuilder())
 
     def query_decorator(self, *args, **kwargs):
@@ -723,27 +1407,200 @@ class ResultIterator(Generic[RESULT_TYPE]):
     You can use this attribute if necessary.
 
     This object's iteration is equivalent to `iter(result)` iteration.
+    If `fetch_size` is specified, the rows are fetched by
+    `fetchmany(fetch_size)` and converted for each fetched rows.
+    If `prefetch` is positive, a background thread fetches and converts
+    the next `prefetch` batches while the current batch is processed.
     If you stop iteration before exhausting all rows,
-    you need to call `close()` method.
+    you need to call `close()` method (or use this object in with block).
 
     Args:
         Generic (result_type): type of each object
     """
 
-    def __init__(self, result, result_type: ResultType):
+    def __init__(self, result, result_type: ResultType,
+                 fetch_size: Optional[int] = None, prefetch: int = 0):
         # type of resutls is ...
         #     ResultProxy in sqlalcheny < 1.4
         #     CursorResult in sqlalchemy >= 1.4
         self.result = result
         self._result_iter = iter(result)
         self._result_type: ResultType = result_type
+        self._mapper: Optional[Callable[[Any], RESULT_TYPE]] = \
+            result_type.mapper(result.keys()) if result.returns_rows \
+            else None
+        self._fetch_size: Optional[int] = fetch_size \
+            if fetch_size or prefetch <= 0 else DEFAULT_FETCH_SIZE
+        # Converted objects fetched but not returned yet.
+        self._batch: List[RESULT_TYPE] = []
+        self._position: int = 0
+        self._prefetcher: Optional[Prefetcher] = start_prefetch(
+            result, self._mapper, self._fetch_size or DEFAULT_FETCH_SIZE,
+            prefetch)
+        if self._prefetcher is not None:
+            # The thread is stopped even if this object is not closed.
+            weakref.finalize(self, self._prefetcher.close)
+
+    def __enter__(self) -> "ResultIterator[RESULT_TYPE]":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
     def __iter__(self):
         return self
 
     def __next__(self) -> RESULT_TYPE:
-        next_value = next(self._result_iter)
-        return self._result_type.to_value(next_value)
+        if self._fetch_size is None:
+            next_value = next(self._result_iter)
+            return self._mapper(next_value)
+
+        if self._position >= len(self._batch):
+            self._batch = self._fetch_batch(self._fetch_size)
+            self._position = 0
+            if not self._batch:
+                raise StopIteration()
+
+        value: RESULT_TYPE = self._batch[self._position]
+        self._position += 1
+        return value
+
+    def iter_batches(self, size: Optional[int] = None
+                     ) -> Iterator[List[RESULT_TYPE]]:
+        """
+        Iterate the remaining results as lists of converted objects.
+        Each list contains the rows fetched by one `fetchmany()`.
+
+        Args:
+            size (Optional[int], optional):
+                count of rows in each list. If None, `fetch_size` of
+                the query (or 1000) is used. With `prefetch`, the batches
+                of `fetch_size` are returned regardless of this argument.
+                Defaults to None.
+
+        Yields:
+            List[RESULT_TYPE]: converted objects of fetched rows
+        """
+
+        if self._position < len(self._batch):
+            # Objects already fetched by the iteration of this object.
+            remaining: List[RESULT_TYPE] = self._batch[self._position:]
+            self._batch = []
+            self._position = 0
+            yield remaining
+
+        fetch_size: int = size or self._fetch_size or DEFAULT_FETCH_SIZE
+        batch: List[RESULT_TYPE] = self._fetch_batch(fetch_size)
+        while batch:
+            yield batch
+            batch = self._fetch_batch(fetch_size)
+
+    def _fetch_batch(self, size: int) -> List[RESULT_TYPE]:
+        if self._prefetcher is not None:
+            return self._prefetcher.next_batch()
+
+        rows: list = self.result.fetchmany(size)
+        return list(map(self._mapper, rows)) if rows else []
 
     def close(self) -> None:
+        if self._prefetcher is not None:
+            # The result must not be used by the thread in closing.
+            self._prefetcher.close()
         self.result.close()
+
+    def to_csv(self, destination: Destination, *, header: bool = True,
+               batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+               queue_size: int = DEFAULT_EXPORT_QUEUE_SIZE,
+               **fmtparams) -> int:
+        """
+        Export the remaining rows to CSV without converting to `result_type`.
+
+        Args:
+            destination (Union[str, Path, IO]):
+                file path or text file object (opened with newline='').
+            header (bool, optional):
+                If True, the column names are written at first.
+                Defaults to True.
+            batch_size (int, optional):
+                count of rows fetched at once. Defaults to 10000.
+            queue_size (int, optional):
+                count of batches waiting for writing. Defaults to 4.
+            fmtparams: formatting parameters of `csv.writer()`
+
+        Returns:
+            int: count of exported rows
+        """
+
+        return self._export(CsvSink(self._keys(), header, **fmtparams),
+                            destination, batch_size, queue_size)
+
+    def to_ndjson(self, destination: Destination, *,
+                  batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                  queue_size: int = DEFAULT_EXPORT_QUEUE_SIZE) -> int:
+        """
+        Export the remaining rows to NDJSON (a JSON object per line)
+        without converting to `result_type`.
+
+        Args:
+            destination (Union[str, Path, IO]):
+                file path or text file object.
+            batch_size (int, optional):
+                count of rows fetched at once. Defaults to 10000.
+            queue_size (int, optional):
+                count of batches waiting for writing. Defaults to 4.
+
+        Returns:
+            int: count of exported rows
+        """
+
+        return self._export(JsonLinesSink(self._keys()),
+                            destination, batch_size, queue_size)
+
+    def to_arrow(self, destination: Destination, *,
+                 schema: Optional[Any] = None,
+                 batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                 queue_size: int = DEFAULT_EXPORT_QUEUE_SIZE) -> int:
+        """
+        Export the remaining rows to Arrow IPC stream format.
+        PyArrow needs to be installed. (`pip install twinsqla[arrow]`)
+
+        Args:
+            destination (Union[str, Path, IO]):
+                file path or binary file object.
+            schema (Optional[pyarrow.Schema], optional):
+                schema of record batches. If None, the schema is inferred
+                from the first batches which have values of all columns,
+                and the values of later batches need to be converted to
+                it without loss. Defaults to None.
+            batch_size (int, optional):
+                count of rows fetched at once (rows of each record batch).
+                Defaults to 10000.
+            queue_size (int, optional):
+                count of batches waiting for writing. Defaults to 4.
+
+        Returns:
+            int: count of exported rows
+        """
+
+        return self._export(ArrowSink(self._keys(), schema),
+                            destination, batch_size, queue_size)
+
+    def _keys(self) -> Tuple[str, ...]:
+        return tuple(self.result.keys()) if self.result.returns_rows \
+            else ()
+
+    def _export(self, sink: ExportSink, destination: Destination,
+                batch_size: int, queue_size: int) -> int:
+        if not self.result.returns_rows:
+            raise exceptions.TWinSQLAException(
+                "The query does not return rows to export.")
+        if self._prefetcher is not None:
+            raise exceptions.TWinSQLAException(
+                "Exporting is not available with 'prefetch'.")
+        if self._position < len(self._batch):
+            # The buffered rows are already converted to `result_type`.
+            raise exceptions.TWinSQLAException(
+                "Exporting is not available while rows fetched by"
+                " iteration remain. Export before iterating the results.")
+        return export_result(self.result, sink, destination,
+                             batch_size=batch_size, queue_size=queue_size)